@@ -0,0 +1,90 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config
+from sqlalchemy import pool
+
+from alembic import context
+
+from app.config import settings
+from app.database import Base
+# Import every model so all tables are part of the metadata
+from app.models import user, resume, job_application, linkedin, cover_letter, resume_optimization, task_queue, event, blob, stats, search, archive, job_import
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Model metadata for 'autogenerate' support
+target_metadata = Base.metadata
+
+# FTS5 tables, the shadow tables SQLite creates for each, and the tables
+# numbering their documents
+SEARCH_TABLE_SUFFIXES = ("_fts", "_fts_data", "_fts_idx", "_fts_config", "_fts_docsize", "_fts_content", "_search_docs")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave the full-text search objects, which are created by raw DDL
+    and not part of the models, out of autogenerate."""
+    if type_ == "table" and reflected and name.endswith(SEARCH_TABLE_SUFFIXES):
+        return False
+    if type_ == "column" and reflected and name == "search_vector":
+        return False
+    if type_ == "index" and reflected and name.endswith("_search_vector"):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL and emits the migration
+    SQL to the script output instead of running it.
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,239 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 02:04:43.578173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('hashed_password', sa.String(), nullable=True),
+    sa.Column('first_name', sa.String(), nullable=True),
+    sa.Column('last_name', sa.String(), nullable=True),
+    sa.Column('phone_number', sa.String(), nullable=True),
+    sa.Column('linkedin_url', sa.String(), nullable=True),
+    sa.Column('portfolio_url', sa.String(), nullable=True),
+    sa.Column('github_url', sa.String(), nullable=True),
+    sa.Column('professional_summary', sa.Text(), nullable=True),
+    sa.Column('preferred_job_titles', sa.Text(), nullable=True),
+    sa.Column('preferred_locations', sa.Text(), nullable=True),
+    sa.Column('skill_keywords', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('job_applications',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('job_title', sa.String(), nullable=True),
+    sa.Column('company_name', sa.String(), nullable=True),
+    sa.Column('job_description', sa.Text(), nullable=True),
+    sa.Column('job_url', sa.String(), nullable=True),
+    sa.Column('job_location', sa.String(), nullable=True),
+    sa.Column('salary_range', sa.String(), nullable=True),
+    sa.Column('status', sa.Enum('PLANNING', 'APPLIED', 'IN_REVIEW', 'INTERVIEW_SCHEDULED', 'REJECTED', 'OFFER_RECEIVED', 'ACCEPTED', 'DECLINED', name='applicationstatus'), nullable=True),
+    sa.Column('applied_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('parsed_job_details', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_applications_id'), 'job_applications', ['id'], unique=False)
+    op.create_table('cover_letters',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('job_application_id', sa.String(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('tone', sa.String(), nullable=True),
+    sa.Column('generation_params', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_cover_letters_id'), 'cover_letters', ['id'], unique=False)
+    op.create_table('job_requirements',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('job_application_id', sa.String(), nullable=True),
+    sa.Column('requirement', sa.Text(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_requirements_id'), 'job_requirements', ['id'], unique=False)
+    op.create_table('job_responsibilities',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('job_application_id', sa.String(), nullable=True),
+    sa.Column('responsibility', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_responsibilities_id'), 'job_responsibilities', ['id'], unique=False)
+    op.create_table('linkedin_messages',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('job_application_id', sa.String(), nullable=True),
+    sa.Column('target_name', sa.String(), nullable=True),
+    sa.Column('target_title', sa.String(), nullable=True),
+    sa.Column('target_company', sa.String(), nullable=True),
+    sa.Column('about_section', sa.Text(), nullable=True),
+    sa.Column('message_type', sa.String(), nullable=True),
+    sa.Column('generated_message', sa.Text(), nullable=True),
+    sa.Column('character_count', sa.Integer(), nullable=True),
+    sa.Column('is_sent', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_linkedin_messages_id'), 'linkedin_messages', ['id'], unique=False)
+    op.create_table('resumes',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('file_name', sa.String(), nullable=True),
+    sa.Column('file_path', sa.String(), nullable=True),
+    sa.Column('file_type', sa.String(), nullable=True),
+    sa.Column('parsed_content', sa.JSON(), nullable=True),
+    sa.Column('parsed_status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resumes_id'), 'resumes', ['id'], unique=False)
+    op.create_table('parsed_educations',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('resume_id', sa.String(), nullable=True),
+    sa.Column('institution', sa.String(), nullable=True),
+    sa.Column('degree', sa.String(), nullable=True),
+    sa.Column('field_of_study', sa.String(), nullable=True),
+    sa.Column('start_date', sa.String(), nullable=True),
+    sa.Column('end_date', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parsed_educations_id'), 'parsed_educations', ['id'], unique=False)
+    op.create_table('parsed_experiences',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('resume_id', sa.String(), nullable=True),
+    sa.Column('company', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('start_date', sa.String(), nullable=True),
+    sa.Column('end_date', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parsed_experiences_id'), 'parsed_experiences', ['id'], unique=False)
+    op.create_table('parsed_projects',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('resume_id', sa.String(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.String(), nullable=True),
+    sa.Column('end_date', sa.String(), nullable=True),
+    sa.Column('technologies', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parsed_projects_id'), 'parsed_projects', ['id'], unique=False)
+    op.create_table('parsed_skills',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('resume_id', sa.String(), nullable=True),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parsed_skills_id'), 'parsed_skills', ['id'], unique=False)
+    op.create_table('resume_optimizations',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('job_application_id', sa.String(), nullable=True),
+    sa.Column('resume_id', sa.String(), nullable=True),
+    sa.Column('suggestions', sa.JSON(), nullable=True),
+    sa.Column('match_score', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_application_id'], ['job_applications.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_optimizations_id'), 'resume_optimizations', ['id'], unique=False)
+    op.create_table('skill_matches',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('resume_optimization_id', sa.String(), nullable=True),
+    sa.Column('skill_name', sa.String(), nullable=True),
+    sa.Column('is_present', sa.String(), nullable=True),
+    sa.Column('importance', sa.String(), nullable=True),
+    sa.Column('suggestion', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_optimization_id'], ['resume_optimizations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skill_matches_id'), 'skill_matches', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_skill_matches_id'), table_name='skill_matches')
+    op.drop_table('skill_matches')
+    op.drop_index(op.f('ix_resume_optimizations_id'), table_name='resume_optimizations')
+    op.drop_table('resume_optimizations')
+    op.drop_index(op.f('ix_parsed_skills_id'), table_name='parsed_skills')
+    op.drop_table('parsed_skills')
+    op.drop_index(op.f('ix_parsed_projects_id'), table_name='parsed_projects')
+    op.drop_table('parsed_projects')
+    op.drop_index(op.f('ix_parsed_experiences_id'), table_name='parsed_experiences')
+    op.drop_table('parsed_experiences')
+    op.drop_index(op.f('ix_parsed_educations_id'), table_name='parsed_educations')
+    op.drop_table('parsed_educations')
+    op.drop_index(op.f('ix_resumes_id'), table_name='resumes')
+    op.drop_table('resumes')
+    op.drop_index(op.f('ix_linkedin_messages_id'), table_name='linkedin_messages')
+    op.drop_table('linkedin_messages')
+    op.drop_index(op.f('ix_job_responsibilities_id'), table_name='job_responsibilities')
+    op.drop_table('job_responsibilities')
+    op.drop_index(op.f('ix_job_requirements_id'), table_name='job_requirements')
+    op.drop_table('job_requirements')
+    op.drop_index(op.f('ix_cover_letters_id'), table_name='cover_letters')
+    op.drop_table('cover_letters')
+    op.drop_index(op.f('ix_job_applications_id'), table_name='job_applications')
+    op.drop_table('job_applications')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,48 @@
+"""add task queue
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 11:02:37.418256
+
+Durable queue the background workers claim resume and job description
+parsing from, with a lease per running task.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_queue',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('task_type', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'DEAD', name='taskstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_queue_claim', 'task_queue', ['task_type', 'status', 'run_after'], unique=False)
+    op.create_index(op.f('ix_task_queue_id'), 'task_queue', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_task_queue_id'), table_name='task_queue')
+    op.drop_index('ix_task_queue_claim', table_name='task_queue')
+    op.drop_table('task_queue')
+    sa.Enum(name='taskstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,40 @@
+"""add user events
+
+Revision ID: 0001b
+Revises: 0001a
+Create Date: 2026-10-19 11:04:12.906341
+
+Per-user events the event stream relays to the browser, numbered so a
+reconnecting client can resume after the last event it saw. On SQLite the
+IDs use AUTOINCREMENT, so they are not reused once old events are purged.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001b'
+down_revision: Union[str, None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_user_events_user_id_id', 'user_events', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_events_user_id_id', table_name='user_events')
+    op.drop_table('user_events')
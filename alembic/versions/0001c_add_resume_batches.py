@@ -0,0 +1,56 @@
+"""add resume batches
+
+Revision ID: 0001c
+Revises: 0001b
+Create Date: 2026-10-19 11:06:48.275193
+
+Groups the resumes of a bulk zip upload under the batch they were
+uploaded in.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001c'
+down_revision: Union[str, None] = '0001b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('resume_batches',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=True),
+    sa.Column('file_name', sa.String(), nullable=True),
+    sa.Column('total', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_batches_id'), 'resume_batches', ['id'], unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite adds a nullable column with a reference in place, but not
+        # through ALTER TABLE ... ADD CONSTRAINT
+        op.execute('ALTER TABLE resumes ADD COLUMN batch_id VARCHAR REFERENCES resume_batches (id)')
+    else:
+        op.add_column('resumes', sa.Column('batch_id', sa.String(), sa.ForeignKey('resume_batches.id'), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_resumes_batch_id'), 'resumes', ['batch_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_resumes_batch_id'), table_name='resumes', postgresql_concurrently=True)
+
+    # SQLite cannot drop a column with a reference in place
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('batch_id')
+
+    op.drop_index(op.f('ix_resume_batches_id'), table_name='resume_batches')
+    op.drop_table('resume_batches')
@@ -0,0 +1,196 @@
+"""add stored blobs
+
+Revision ID: 0001d
+Revises: 0001c
+Create Date: 2026-10-19 11:09:23.640718
+
+Moves resume uploads into content-addressed storage: resumes refer to a
+reference-counted blob by the SHA-256 of its content instead of to a file
+path.
+
+The file of each existing resume is copied into the blob store under
+UPLOAD_DIR, with the layout of app.services.storage.LocalStorageBackend,
+before file_path is dropped. A resume whose file is missing is left
+without a file_key. The original files are not removed; downgrading
+copies each blob back to a file of its own in UPLOAD_DIR.
+
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections import Counter
+from typing import Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001d'
+down_revision: Union[str, None] = '0001c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+BATCH_SIZE = 500
+CHUNK_SIZE = 1024 * 1024
+
+UPLOAD_DIR = os.getenv('UPLOAD_DIR', 'uploads')
+BLOB_DIR = os.path.join(UPLOAD_DIR, 'blobs')
+
+resumes = sa.table(
+    'resumes',
+    sa.column('id', sa.String()),
+    sa.column('file_path', sa.String()),
+    sa.column('file_type', sa.String()),
+    sa.column('file_key', sa.String()),
+    sa.column('file_size', sa.Integer()),
+)
+stored_blobs = sa.table(
+    'stored_blobs',
+    sa.column('key', sa.String()),
+    sa.column('size', sa.Integer()),
+    sa.column('ref_count', sa.Integer()),
+)
+
+
+def _blob_path(key: str) -> str:
+    return os.path.join(BLOB_DIR, key[:2], key[2:4], key)
+
+
+def _store_file(path: str) -> Optional[Tuple[str, int]]:
+    """Copy a file into the blob store, returning its key and size, or
+    None if it cannot be read."""
+    tmp_dir = os.path.join(BLOB_DIR, 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        source = open(path, 'rb')
+    except OSError as e:
+        logger.warning(f'Cannot read {path}: {e}')
+        return None
+
+    digest = hashlib.sha256()
+    size = 0
+    with source, tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+        while chunk := source.read(CHUNK_SIZE):
+            digest.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+    key = digest.hexdigest()
+    os.makedirs(os.path.dirname(_blob_path(key)), exist_ok=True)
+    os.replace(tmp.name, _blob_path(key))
+    return key, size
+
+
+def _move_files_to_blobs() -> None:
+    bind = op.get_bind()
+    add_references = stored_blobs.update().where(stored_blobs.c.key == sa.bindparam('blob_key')).values(
+        ref_count=stored_blobs.c.ref_count + sa.bindparam('added')
+    )
+    set_keys = resumes.update().where(resumes.c.id == sa.bindparam('row_id')).values(
+        file_key=sa.bindparam('blob_key'),
+        file_size=sa.bindparam('size')
+    )
+    inserted = set()
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(resumes.c.id, resumes.c.file_path)
+            .where(resumes.c.id > last_id, resumes.c.file_path.isnot(None))
+            .order_by(resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        stored = {row_id: _store_file(file_path) for row_id, file_path in rows}
+        stored = {row_id: blob for row_id, blob in stored.items() if blob is not None}
+
+        # Blob rows first, so the keys are valid references
+        counts = Counter(key for key, _ in stored.values())
+        sizes = dict(stored.values())
+        new_keys = [key for key in counts if key not in inserted]
+        if new_keys:
+            bind.execute(stored_blobs.insert(), [
+                {'key': key, 'size': sizes[key], 'ref_count': counts[key]} for key in new_keys
+            ])
+            inserted.update(new_keys)
+        if len(new_keys) < len(counts):
+            bind.execute(add_references, [
+                {'blob_key': key, 'added': count} for key, count in counts.items() if key not in new_keys
+            ])
+        if stored:
+            bind.execute(set_keys, [
+                {'row_id': row_id, 'blob_key': key, 'size': size} for row_id, (key, size) in stored.items()
+            ])
+        last_id = rows[-1][0]
+
+
+def _restore_files() -> None:
+    bind = op.get_bind()
+    set_paths = resumes.update().where(resumes.c.id == sa.bindparam('row_id')).values(
+        file_path=sa.bindparam('path')
+    )
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(resumes.c.id, resumes.c.file_key, resumes.c.file_type)
+            .where(resumes.c.id > last_id, resumes.c.file_key.isnot(None))
+            .order_by(resumes.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        restored = []
+        for row_id, file_key, file_type in rows:
+            # A file per resume, as resumes sharing a blob were deleted one file at a time
+            path = os.path.join(UPLOAD_DIR, f'{row_id}.{file_type}' if file_type else row_id)
+            try:
+                shutil.copyfile(_blob_path(file_key), path)
+            except OSError as e:
+                logger.warning(f'Cannot restore the file of resume {row_id}: {e}')
+                continue
+            restored.append({'row_id': row_id, 'path': path})
+        if restored:
+            bind.execute(set_paths, restored)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table('stored_blobs',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=True),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite adds a nullable column with a reference in place, but not
+        # through ALTER TABLE ... ADD CONSTRAINT
+        op.execute('ALTER TABLE resumes ADD COLUMN file_key VARCHAR REFERENCES stored_blobs ("key")')
+    else:
+        op.add_column('resumes', sa.Column('file_key', sa.String(), sa.ForeignKey('stored_blobs.key'), nullable=True))
+    op.add_column('resumes', sa.Column('file_size', sa.Integer(), nullable=True))
+    _move_files_to_blobs()
+    op.execute('ALTER TABLE resumes DROP COLUMN file_path')
+
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_resumes_file_key'), 'resumes', ['file_key'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_resumes_file_key'), table_name='resumes', postgresql_concurrently=True)
+
+    op.add_column('resumes', sa.Column('file_path', sa.String(), nullable=True))
+    _restore_files()
+    # SQLite cannot drop a column with a reference in place
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('file_size')
+        batch_op.drop_column('file_key')
+
+    op.drop_table('stored_blobs')
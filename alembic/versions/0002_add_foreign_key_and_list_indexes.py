@@ -0,0 +1,53 @@
+"""add foreign key and list indexes
+
+Revision ID: 0002
+Revises: 0001d
+Create Date: 2026-10-19 02:05:14.012590
+
+Indexes the foreign keys the routers filter on and the (owner, created_at)
+orderings used by the list endpoints. On PostgreSQL the indexes are built
+concurrently so existing tables stay writable during the migration.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_resumes_user_id_created_at', 'resumes', ['user_id', 'created_at']),
+    ('ix_parsed_educations_resume_id', 'parsed_educations', ['resume_id']),
+    ('ix_parsed_experiences_resume_id', 'parsed_experiences', ['resume_id']),
+    ('ix_parsed_skills_resume_id', 'parsed_skills', ['resume_id']),
+    ('ix_parsed_projects_resume_id', 'parsed_projects', ['resume_id']),
+    ('ix_job_applications_user_id_created_at', 'job_applications', ['user_id', 'created_at']),
+    ('ix_job_applications_user_id_status_created_at', 'job_applications', ['user_id', 'status', 'created_at']),
+    ('ix_job_requirements_job_application_id', 'job_requirements', ['job_application_id']),
+    ('ix_job_responsibilities_job_application_id', 'job_responsibilities', ['job_application_id']),
+    ('ix_linkedin_messages_job_application_id_created_at', 'linkedin_messages', ['job_application_id', 'created_at']),
+    ('ix_cover_letters_job_application_id_created_at', 'cover_letters', ['job_application_id', 'created_at']),
+    ('ix_resume_optimizations_job_application_id_created_at', 'resume_optimizations', ['job_application_id', 'created_at']),
+    ('ix_resume_optimizations_resume_id', 'resume_optimizations', ['resume_id']),
+    ('ix_skill_matches_resume_optimization_id', 'skill_matches', ['resume_optimization_id']),
+    ('ix_user_events_created_at', 'user_events', ['created_at']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
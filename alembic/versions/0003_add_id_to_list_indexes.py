@@ -0,0 +1,51 @@
+"""add id to list indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 02:31:08.412377
+
+List endpoints page on (created_at, id). Extending the (owner, created_at)
+indexes with id lets a page be read straight from the index, including
+rows created in the same second.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, leading columns) of each list index
+LIST_INDEXES = [
+    ('resumes', ['user_id']),
+    ('job_applications', ['user_id']),
+    ('job_applications', ['user_id', 'status']),
+    ('linkedin_messages', ['job_application_id']),
+    ('cover_letters', ['job_application_id']),
+    ('resume_optimizations', ['job_application_id']),
+]
+
+
+def _name(table: str, columns: Sequence[str]) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in LIST_INDEXES:
+            keyset_columns = [*columns, 'created_at', 'id']
+            op.create_index(_name(table, keyset_columns), table, keyset_columns, unique=False, postgresql_concurrently=True)
+            op.drop_index(_name(table, [*columns, 'created_at']), table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, columns in reversed(LIST_INDEXES):
+            ordered_columns = [*columns, 'created_at']
+            op.create_index(_name(table, ordered_columns), table, ordered_columns, unique=False, postgresql_concurrently=True)
+            op.drop_index(_name(table, [*ordered_columns, 'id']), table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,125 @@
+"""add user stat counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 04:12:37.905114
+
+Dashboard aggregates are kept as per-user counters that are adjusted in
+the same transaction as the job application or resume optimization they
+count. Existing data is counted here, the way `python -m app.rebuild_stats`
+counts it, so deletes made right after upgrading do not take counters
+below zero.
+
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stored enum names and the values counters are keyed by
+STATUS_VALUES = {
+    'PLANNING': 'planning',
+    'APPLIED': 'applied',
+    'IN_REVIEW': 'in_review',
+    'INTERVIEW_SCHEDULED': 'interview_scheduled',
+    'REJECTED': 'rejected',
+    'OFFER_RECEIVED': 'offer_received',
+    'ACCEPTED': 'accepted',
+    'DECLINED': 'declined',
+}
+
+job_applications = sa.table(
+    'job_applications',
+    sa.column('id', sa.String()),
+    sa.column('user_id', sa.String()),
+    sa.column('status', sa.String()),
+    sa.column('company_name', sa.String()),
+    sa.column('applied_date', sa.DateTime(timezone=True)),
+)
+
+resume_optimizations = sa.table(
+    'resume_optimizations',
+    sa.column('job_application_id', sa.String()),
+    sa.column('match_score', sa.Float()),
+)
+
+user_stat_counters = sa.table(
+    'user_stat_counters',
+    sa.column('user_id', sa.String()),
+    sa.column('dimension', sa.String()),
+    sa.column('key', sa.String()),
+    sa.column('count', sa.Integer()),
+    sa.column('total', sa.Float()),
+)
+
+
+def _count_existing_data() -> None:
+    bind = op.get_bind()
+    totals = defaultdict(lambda: [0, 0.0])
+
+    applications = bind.execution_options(yield_per=1000).execute(
+        sa.select(
+            job_applications.c.user_id,
+            job_applications.c.status,
+            job_applications.c.company_name,
+            job_applications.c.applied_date
+        ).where(job_applications.c.user_id.isnot(None))
+    )
+    for user_id, status, company_name, applied_date in applications:
+        counters = [('total', ''), ('status', STATUS_VALUES[status or 'PLANNING']), ('company', company_name or '')]
+        if applied_date is not None:
+            day = applied_date.date()
+            counters.append(('applied_week', (day - timedelta(days=day.weekday())).isoformat()))
+        for dimension, key in counters:
+            totals[(user_id, dimension, key)][0] += 1
+
+    scores = bind.execute(
+        sa.select(
+            job_applications.c.user_id,
+            sa.func.count(resume_optimizations.c.match_score),
+            sa.func.coalesce(sa.func.sum(resume_optimizations.c.match_score), 0.0)
+        )
+        .select_from(resume_optimizations.join(
+            job_applications, job_applications.c.id == resume_optimizations.c.job_application_id
+        ))
+        .where(job_applications.c.user_id.isnot(None))
+        .group_by(job_applications.c.user_id)
+    )
+    for user_id, scored, score_sum in scores:
+        totals[(user_id, 'match_score', '')][0] += scored
+        totals[(user_id, 'match_score', '')][1] += score_sum
+
+    rows = [
+        {'user_id': user_id, 'dimension': dimension, 'key': key, 'count': count, 'total': total}
+        for (user_id, dimension, key), (count, total) in totals.items()
+        if count
+    ]
+    if rows:
+        bind.execute(user_stat_counters.insert(), rows)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stat_counters',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('dimension', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'dimension', 'key')
+    )
+    _count_existing_data()
+
+
+def downgrade() -> None:
+    op.drop_table('user_stat_counters')
@@ -0,0 +1,93 @@
+"""add full text search
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 05:03:51.276830
+
+Search indexes over job applications, cover letters and LinkedIn messages.
+On SQLite each table gets an FTS5 table reading its content from a view
+that adds the owner's user_id, kept in sync by triggers and filled from
+the existing rows. On
+PostgreSQL each table gets a generated tsvector column with a GIN index.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, indexed columns, column pointing at the owning job application)
+SEARCH_INDEXES = [
+    ('job_applications', ['job_title', 'company_name', 'job_description', 'notes'], None),
+    ('cover_letters', ['content'], 'job_application_id'),
+    ('linkedin_messages', ['generated_message'], 'job_application_id'),
+]
+
+
+def _owner(parent_column, row: str):
+    if parent_column is None:
+        return f'hex({row}.user_id)', ''
+    return 'hex(ja.user_id)', f' FROM job_applications ja WHERE ja.id = {row}.{parent_column}'
+
+
+def _upgrade_sqlite(table: str, columns: Sequence[str], parent_column) -> None:
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    if parent_column is None:
+        join, owner = '', 't'
+    else:
+        join, owner = f' JOIN job_applications ja ON ja.id = t.{parent_column}', 'ja'
+    view_columns = ', '.join(f't.{column}' for column in columns)
+    new_owner, new_from = _owner(parent_column, 'new')
+    old_owner, old_from = _owner(parent_column, 'old')
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    insert = f'INSERT INTO {fts}(rowid, owner, {names}) SELECT new.rowid, {new_owner}, {new_values}{new_from};'
+    delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) SELECT 'delete', old.rowid, {old_owner}, {old_values}{old_from};"
+    op.execute(f'CREATE VIEW {table}_search AS SELECT t.rowid AS doc, hex({owner}.user_id) AS owner, {view_columns} FROM {table} t{join}')
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(owner, {names}, content='{table}_search', content_rowid='doc', "
+        f"detail=column, tokenize='porter unicode61')"
+    )
+    op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END')
+    op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END')
+    op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {parent_column or "user_id"}, {names} ON {table} BEGIN {delete} {insert} END')
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _upgrade_postgresql(table: str, columns: Sequence[str]) -> None:
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    op.execute(
+        f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+        f"GENERATED ALWAYS AS (to_tsvector('english', {document})) STORED"
+    )
+    op.execute(f'CREATE INDEX ix_{table}_search_vector ON {table} USING GIN (search_vector)')
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns, parent_column in SEARCH_INDEXES:
+        if dialect == 'sqlite':
+            _upgrade_sqlite(table, columns, parent_column)
+        elif dialect == 'postgresql':
+            _upgrade_postgresql(table, columns)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns, parent_column in reversed(SEARCH_INDEXES):
+        if dialect == 'sqlite':
+            fts = f'{table}_fts'
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER {fts}_{suffix}')
+            op.execute(f'DROP TABLE {fts}')
+            op.execute(f'DROP VIEW {table}_search')
+        elif dialect == 'postgresql':
+            op.execute(f'DROP INDEX ix_{table}_search_vector')
+            op.execute(f'ALTER TABLE {table} DROP COLUMN search_vector')
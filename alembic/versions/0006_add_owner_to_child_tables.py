@@ -0,0 +1,115 @@
+"""add owner to child tables
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 05:48:22.630417
+
+Copies the owner of the job application onto LinkedIn messages, cover
+letters and resume optimizations, so ownership checks are an indexed
+equality instead of a join. On SQLite the search views and triggers are
+recreated to read the owner from the row itself.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['linkedin_messages', 'cover_letters', 'resume_optimizations']
+
+# (table, indexed columns, column pointing at the job application) of the search indexes
+SEARCH_INDEXES = [
+    ('job_applications', ['job_title', 'company_name', 'job_description', 'notes'], None),
+    ('cover_letters', ['content'], 'job_application_id'),
+    ('linkedin_messages', ['generated_message'], 'job_application_id'),
+]
+
+
+def _drop_search_triggers(table: str) -> None:
+    fts = f'{table}_fts'
+    for suffix in ('ai', 'ad', 'au'):
+        op.execute(f'DROP TRIGGER {fts}_{suffix}')
+    op.execute(f'DROP VIEW {table}_search')
+
+
+def _create_search_triggers(table: str, columns: Sequence[str], owner_join: bool) -> None:
+    """
+    Create the search view and triggers of a table, reading the owner from
+    the job application (as revision 0005 did) or from the row
+    """
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    view_columns = ', '.join(f't.{column}' for column in columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    if owner_join:
+        view = f'SELECT t.rowid AS doc, hex(ja.user_id) AS owner, {view_columns} FROM {table} t JOIN job_applications ja ON ja.id = t.job_application_id'
+        insert = f'INSERT INTO {fts}(rowid, owner, {names}) SELECT new.rowid, hex(ja.user_id), {new_values} FROM job_applications ja WHERE ja.id = new.job_application_id;'
+        delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) SELECT 'delete', old.rowid, hex(ja.user_id), {old_values} FROM job_applications ja WHERE ja.id = old.job_application_id;"
+        update_of = 'job_application_id'
+    else:
+        view = f'SELECT t.rowid AS doc, hex(t.user_id) AS owner, {view_columns} FROM {table} t'
+        insert = f'INSERT INTO {fts}(rowid, owner, {names}) VALUES (new.rowid, hex(new.user_id), {new_values});'
+        delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) VALUES ('delete', old.rowid, hex(old.user_id), {old_values});"
+        update_of = 'user_id'
+    op.execute(f'CREATE VIEW {table}_search AS {view}')
+    op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END')
+    op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END')
+    op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {update_of}, {names} ON {table} BEGIN {delete} {insert} END')
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in TABLES:
+        if dialect == 'sqlite':
+            # SQLite cannot add a constraint with ALTER, but can add a column referencing another table
+            op.execute(f'ALTER TABLE {table} ADD COLUMN user_id VARCHAR REFERENCES users (id)')
+        else:
+            op.add_column(table, sa.Column('user_id', sa.String(), sa.ForeignKey('users.id'), nullable=True))
+        op.execute(
+            f'UPDATE {table} SET user_id = '
+            f'(SELECT job_applications.user_id FROM job_applications WHERE job_applications.id = {table}.job_application_id)'
+        )
+
+    # Backfilled first: the new triggers reindex a row when its user_id changes
+    if dialect == 'sqlite':
+        for table, columns, parent_column in SEARCH_INDEXES:
+            if parent_column is not None:
+                _drop_search_triggers(table)
+                _create_search_triggers(table, columns, owner_join=False)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_user_id_created_at_id', table, ['user_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(f'ix_{table}_user_id_created_at_id', table_name=table, postgresql_concurrently=True)
+
+    if dialect != 'sqlite':
+        for table in reversed(TABLES):
+            op.drop_column(table, 'user_id')
+        return
+
+    # SQLite drops a column referencing another table by copying the table,
+    # which loses its triggers and renumbers its rows
+    searched = [(table, columns) for table, columns, parent_column in SEARCH_INDEXES if parent_column is not None]
+    for table, _ in searched:
+        _drop_search_triggers(table)
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('user_id')
+    for table, columns in searched:
+        _create_search_triggers(table, columns, owner_join=True)
+        op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
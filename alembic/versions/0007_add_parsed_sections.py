@@ -0,0 +1,36 @@
+"""add parsed sections
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 06:31:09.284517
+
+Stores the structured rows of parsed resumes and job descriptions
+serialized on their parent, so detail views read them with the parent in
+one query. Rows parsed before this revision have no serialized copy and
+are read from their tables until they are parsed again.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['resumes', 'job_applications']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('parsed_sections', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    # A plain column, which SQLite drops in place without copying the table
+    for table in reversed(TABLES):
+        op.execute(f'ALTER TABLE {table} DROP COLUMN parsed_sections')
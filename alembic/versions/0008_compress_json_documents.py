@@ -0,0 +1,95 @@
+"""compress json documents
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 07:14:52.613078
+
+Stores the large JSON documents as compressed msgpack in binary columns.
+Each column is copied into a new binary column in batches, then replaces
+the original. The encoding matches app.models.types.pack_document: one
+header byte (0 raw, 1 zlib) followed by the msgpack body.
+
+"""
+import zlib
+from typing import Any, Sequence, Union
+
+from alembic import op
+import msgpack
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ('resumes', 'parsed_content'),
+    ('resumes', 'parsed_sections'),
+    ('job_applications', 'parsed_job_details'),
+    ('job_applications', 'parsed_sections'),
+    ('resume_optimizations', 'suggestions'),
+    ('cover_letters', 'generation_params'),
+]
+
+BATCH_SIZE = 500
+COMPRESS_MIN_SIZE = 256
+
+
+def _pack(value: Any) -> bytes:
+    packed = msgpack.packb(value, use_bin_type=True)
+    if len(packed) < COMPRESS_MIN_SIZE:
+        return b'\x00' + packed
+    return b'\x01' + zlib.compress(packed, 6)
+
+
+def _unpack(data: bytes) -> Any:
+    body = bytes(data[1:])
+    if data[:1] == b'\x01':
+        body = zlib.decompress(body)
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+def _convert(table: str, column: str, old_type, new_type, convert) -> None:
+    """
+    Copy a column into a new column of another type, a batch of rows at a
+    time, and put it in place of the original
+    """
+    bind = op.get_bind()
+    op.add_column(table, sa.Column(f'{column}_new', new_type, nullable=True))
+
+    source = sa.table(table, sa.column('id', sa.String()), sa.column(column, old_type))
+    target = sa.table(table, sa.column('id', sa.String()), sa.column(f'{column}_new', new_type))
+    update = target.update().where(target.c.id == sa.bindparam('row_id')).values(
+        {f'{column}_new': sa.bindparam('value')}
+    )
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(source.c.id, source.c[column])
+            .where(source.c.id > last_id, source.c[column].isnot(None))
+            .order_by(source.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        # JSON null is read as None and left as SQL NULL
+        values = [{'row_id': row_id, 'value': convert(value)} for row_id, value in rows if value is not None]
+        if values:
+            bind.execute(update, values)
+        last_id = rows[-1][0]
+
+    # Plain columns, which SQLite drops and renames in place
+    op.execute(f'ALTER TABLE {table} DROP COLUMN {column}')
+    op.execute(f'ALTER TABLE {table} RENAME COLUMN {column}_new TO {column}')
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        _convert(table, column, sa.JSON(), sa.LargeBinary(), _pack)
+
+
+def downgrade() -> None:
+    for table, column in reversed(COLUMNS):
+        _convert(table, column, sa.LargeBinary(), sa.JSON(), _unpack)
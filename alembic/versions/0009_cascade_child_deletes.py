@@ -0,0 +1,115 @@
+"""cascade child deletes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 08:02:41.557930
+
+Makes the foreign keys of rows owned by a resume, job application or
+resume optimization ON DELETE CASCADE, so deleting the parent is a single
+statement. Child rows left behind by earlier deletes are removed first.
+
+On PostgreSQL each constraint is swapped in one ALTER and validated
+without blocking writes. SQLite cannot alter constraints, so the child
+tables are rebuilt; the search views and triggers of the rebuilt tables
+are recreated and their index rebuilt, as rebuilding renumbers rows.
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table), parents before their children
+FOREIGN_KEYS = [
+    ('resume_optimizations', 'job_application_id', 'job_applications'),
+    ('resume_optimizations', 'resume_id', 'resumes'),
+    ('skill_matches', 'resume_optimization_id', 'resume_optimizations'),
+    ('parsed_educations', 'resume_id', 'resumes'),
+    ('parsed_experiences', 'resume_id', 'resumes'),
+    ('parsed_skills', 'resume_id', 'resumes'),
+    ('parsed_projects', 'resume_id', 'resumes'),
+    ('job_requirements', 'job_application_id', 'job_applications'),
+    ('job_responsibilities', 'job_application_id', 'job_applications'),
+    ('linkedin_messages', 'job_application_id', 'job_applications'),
+    ('cover_letters', 'job_application_id', 'job_applications'),
+]
+
+# Rebuilt tables with a search index, and their indexed columns
+SEARCHED_TABLES = {
+    'linkedin_messages': ['generated_message'],
+    'cover_letters': ['content'],
+}
+
+# Names given to the unnamed constraints SQLite reflects
+NAMING_CONVENTION = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+
+
+def _drop_search_triggers(table: str) -> None:
+    fts = f'{table}_fts'
+    for suffix in ('ai', 'ad', 'au'):
+        op.execute(f'DROP TRIGGER {fts}_{suffix}')
+    op.execute(f'DROP VIEW {table}_search')
+
+
+def _create_search_triggers(table: str, columns: Sequence[str]) -> None:
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    view_columns = ', '.join(f't.{column}' for column in columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    insert = f'INSERT INTO {fts}(rowid, owner, {names}) VALUES (new.rowid, hex(new.user_id), {new_values});'
+    delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) VALUES ('delete', old.rowid, hex(old.user_id), {old_values});"
+    op.execute(f'CREATE VIEW {table}_search AS SELECT t.rowid AS doc, hex(t.user_id) AS owner, {view_columns} FROM {table} t')
+    op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END')
+    op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END')
+    op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF user_id, {names} ON {table} BEGIN {delete} {insert} END')
+
+
+def _replace_foreign_keys(ondelete: Optional[str]) -> None:
+    action = f' ON DELETE {ondelete}' if ondelete else ''
+    if op.get_bind().dialect.name != 'sqlite':
+        for table, column, referent in FOREIGN_KEYS:
+            name = f'{table}_{column}_fkey'
+            op.execute(
+                f'ALTER TABLE {table} DROP CONSTRAINT {name}, ADD CONSTRAINT {name} '
+                f'FOREIGN KEY ({column}) REFERENCES {referent} (id){action} NOT VALID'
+            )
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+        return
+
+    # Views must not refer to a table while it is rebuilt
+    for table in SEARCHED_TABLES:
+        _drop_search_triggers(table)
+    tables = list(dict.fromkeys(table for table, _, _ in FOREIGN_KEYS))
+    for table in tables:
+        with op.batch_alter_table(table, recreate='always', naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referent in FOREIGN_KEYS:
+                if fk_table == table:
+                    name = f'fk_{table}_{column}_{referent}'
+                    batch_op.drop_constraint(name, type_='foreignkey')
+                    batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete=ondelete)
+    for table, columns in SEARCHED_TABLES.items():
+        _create_search_triggers(table, columns)
+        op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    # Rows whose parent was deleted before the cascade existed
+    for table, column, referent in FOREIGN_KEYS:
+        op.execute(
+            f'DELETE FROM {table} WHERE {column} IS NOT NULL '
+            f'AND NOT EXISTS (SELECT 1 FROM {referent} p WHERE p.id = {table}.{column})'
+        )
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(None)
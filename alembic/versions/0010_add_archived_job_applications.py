@@ -0,0 +1,64 @@
+"""add archived job applications
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 08:47:26.318042
+
+Job applications in a terminal status are moved here by
+`python -m app.archive_job_applications` once they are old enough. The
+summary columns are kept as columns and the rest of the application,
+with the rows it owned, as one compressed document.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The type created with job_applications
+APPLICATION_STATUS = postgresql.ENUM(
+    'PLANNING', 'APPLIED', 'IN_REVIEW', 'INTERVIEW_SCHEDULED', 'REJECTED', 'OFFER_RECEIVED', 'ACCEPTED', 'DECLINED',
+    name='applicationstatus', create_type=False
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'archived_job_applications',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('job_title', sa.String(), nullable=True),
+        sa.Column('company_name', sa.String(), nullable=True),
+        sa.Column('job_url', sa.String(), nullable=True),
+        sa.Column('job_location', sa.String(), nullable=True),
+        sa.Column('salary_range', sa.String(), nullable=True),
+        sa.Column('status', APPLICATION_STATUS, nullable=True),
+        sa.Column('applied_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('description_snippet', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('scored_optimizations', sa.Integer(), nullable=False),
+        sa.Column('match_score_total', sa.Float(), nullable=False),
+        sa.Column('document', sa.LargeBinary(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_job_applications_user_id_created_at_id', 'archived_job_applications',
+                    ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_archived_job_applications_user_id_status_created_at_id', 'archived_job_applications',
+                    ['user_id', 'status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_job_applications_user_id_status_created_at_id', table_name='archived_job_applications')
+    op.drop_index('ix_archived_job_applications_user_id_created_at_id', table_name='archived_job_applications')
+    op.drop_table('archived_job_applications')
@@ -0,0 +1,143 @@
+"""add job application imports
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 09:38:15.742609
+
+Tracks the progress of CSV and JSONL imports, and keys job applications
+by their normalized URL and a hash of their description, which imports
+skip duplicates by. Existing applications are keyed in batches; the
+normalization matches app.services.job_imports.
+
+"""
+import hashlib
+from typing import Optional, Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+TRACKING_PARAMETER_PREFIXES = ('utm_',)
+TRACKING_PARAMETERS = {'gclid', 'fbclid', 'msclkid', 'trk', 'trackingid', 'refid'}
+
+# (index name, columns) on job_applications
+KEY_INDEXES = [
+    ('ix_job_applications_user_id_job_url_key', ['user_id', 'job_url_key']),
+    ('ix_job_applications_user_id_description_hash', ['user_id', 'description_hash']),
+]
+
+
+def _normalize_job_url(job_url: Optional[str]) -> Optional[str]:
+    if not job_url or not job_url.strip():
+        return None
+    url = job_url.strip()
+    if '://' not in url:
+        url = 'https://' + url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url.lower()
+
+    host = (parts.hostname or '').removeprefix('www.')
+    if port and port not in (80, 443):
+        host += f':{port}'
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETER_PREFIXES) and name.lower() not in TRACKING_PARAMETERS
+    ))
+    key = host + parts.path.rstrip('/')
+    return f'{key}?{query}' if query else key
+
+
+def _hash_description(job_description: Optional[str]) -> Optional[str]:
+    if not job_description or not job_description.strip():
+        return None
+    return hashlib.sha256(' '.join(job_description.lower().split()).encode()).hexdigest()
+
+
+def _backfill_keys() -> None:
+    bind = op.get_bind()
+    applications = sa.table(
+        'job_applications',
+        sa.column('id', sa.String()),
+        sa.column('job_url', sa.String()),
+        sa.column('job_description', sa.Text()),
+        sa.column('job_url_key', sa.String()),
+        sa.column('description_hash', sa.String()),
+    )
+    update = applications.update().where(applications.c.id == sa.bindparam('row_id')).values(
+        job_url_key=sa.bindparam('url_key'),
+        description_hash=sa.bindparam('hash')
+    )
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(applications.c.id, applications.c.job_url, applications.c.job_description)
+            .where(applications.c.id > last_id)
+            .order_by(applications.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'row_id': row_id, 'url_key': _normalize_job_url(job_url), 'hash': _hash_description(job_description)}
+            for row_id, job_url, job_description in rows
+        ])
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_application_imports',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('file_name', sa.String(), nullable=True),
+        sa.Column('file_format', sa.String(), nullable=True),
+        sa.Column('file_key', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('duplicates', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.LargeBinary(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_application_imports_id'), 'job_application_imports', ['id'], unique=False)
+    op.create_index(op.f('ix_job_application_imports_user_id'), 'job_application_imports', ['user_id'], unique=False)
+
+    op.add_column('job_applications', sa.Column('job_url_key', sa.String(), nullable=True))
+    op.add_column('job_applications', sa.Column('description_hash', sa.String(), nullable=True))
+    _backfill_keys()
+
+    with op.get_context().autocommit_block():
+        for name, columns in KEY_INDEXES:
+            op.create_index(name, 'job_applications', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(KEY_INDEXES):
+            op.drop_index(name, table_name='job_applications', postgresql_concurrently=True)
+
+    # Plain columns, which SQLite drops in place without copying the table
+    op.execute('ALTER TABLE job_applications DROP COLUMN description_hash')
+    op.execute('ALTER TABLE job_applications DROP COLUMN job_url_key')
+
+    op.drop_index(op.f('ix_job_application_imports_user_id'), table_name='job_application_imports')
+    op.drop_index(op.f('ix_job_application_imports_id'), table_name='job_application_imports')
+    op.drop_table('job_application_imports')
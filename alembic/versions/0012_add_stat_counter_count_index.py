@@ -0,0 +1,33 @@
+"""add stat counter count index
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 10:21:04.583117
+
+The dashboard reads only the companies with the most applications, which
+this index serves without reading every company counter of the user.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_stat_counters_user_id_dimension_count', 'user_stat_counters',
+                        ['user_id', 'dimension', 'count'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_stat_counters_user_id_dimension_count', table_name='user_stat_counters',
+                      postgresql_concurrently=True)
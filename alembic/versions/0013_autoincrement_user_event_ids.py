@@ -0,0 +1,43 @@
+"""autoincrement user event ids
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 12:14:52.301847
+
+Without AUTOINCREMENT, SQLite hands out the IDs of purged events again
+once user_events has been emptied, so relays and reconnecting clients
+that have seen a higher ID skip every new event. Tables created without
+it are rebuilt; the sequence continues from the highest ID copied.
+PostgreSQL sequences never reuse IDs, so nothing changes there.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild(autoincrement: bool) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    sql = bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'user_events'")).scalar()
+    if ('AUTOINCREMENT' in sql.upper()) == autoincrement:
+        return
+    with op.batch_alter_table('user_events', recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+
+
+def upgrade() -> None:
+    _rebuild(True)
+
+
+def downgrade() -> None:
+    _rebuild(False)
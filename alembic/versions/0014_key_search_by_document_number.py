@@ -0,0 +1,92 @@
+"""key search by document number
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 12:41:08.517293
+
+The SQLite search indexes referred to rows by their rowid, which a VACUUM
+renumbers in tables without an INTEGER PRIMARY KEY, after which searches
+returned other rows. Each searched table now gets a table numbering its
+rows, whose INTEGER PRIMARY KEY survives a VACUUM, and the FTS5 table is
+keyed by that number. The views, triggers and FTS5 tables are recreated
+and the index rebuilt. Nothing changes on PostgreSQL.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Searched tables and their indexed columns
+SEARCH_INDEXES = [
+    ('job_applications', ['job_title', 'company_name', 'job_description', 'notes']),
+    ('cover_letters', ['content']),
+    ('linkedin_messages', ['generated_message']),
+]
+
+
+def _drop_search_index(table: str) -> None:
+    fts = f'{table}_fts'
+    for suffix in ('ai', 'ad', 'au'):
+        op.execute(f'DROP TRIGGER {fts}_{suffix}')
+    op.execute(f'DROP TABLE {fts}')
+    op.execute(f'DROP VIEW {table}_search')
+
+
+def _create_search_index(table: str, columns: Sequence[str], by_document_number: bool) -> None:
+    """
+    Create the search view, FTS5 table and triggers of a table, keyed by
+    document number or, as before this revision, by rowid, and index the
+    existing rows
+    """
+    fts = f'{table}_fts'
+    docs = f'{table}_search_docs'
+    names = ', '.join(columns)
+    view_columns = ', '.join(f't.{column}' for column in columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    if by_document_number:
+        view = f'SELECT d.doc, hex(t.user_id) AS owner, {view_columns} FROM {table} t JOIN {docs} d ON d.id = t.id'
+        insert = f'INSERT INTO {fts}(rowid, owner, {names}) SELECT doc, hex(new.user_id), {new_values} FROM {docs} WHERE id = new.id;'
+        delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) SELECT 'delete', doc, hex(old.user_id), {old_values} FROM {docs} WHERE id = old.id;"
+        on_insert = f'INSERT INTO {docs}(id) VALUES (new.id); {insert}'
+        on_delete = f'{delete} DELETE FROM {docs} WHERE id = old.id;'
+    else:
+        view = f'SELECT t.rowid AS doc, hex(t.user_id) AS owner, {view_columns} FROM {table} t'
+        insert = f'INSERT INTO {fts}(rowid, owner, {names}) VALUES (new.rowid, hex(new.user_id), {new_values});'
+        delete = f"INSERT INTO {fts}({fts}, rowid, owner, {names}) VALUES ('delete', old.rowid, hex(old.user_id), {old_values});"
+        on_insert, on_delete = insert, delete
+    op.execute(f'CREATE VIEW {table}_search AS {view}')
+    op.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(owner, {names}, content='{table}_search', content_rowid='doc', "
+        f"detail=column, tokenize='porter unicode61')"
+    )
+    op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {on_insert} END')
+    op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {on_delete} END')
+    op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE OF user_id, {names} ON {table} BEGIN {delete} {insert} END')
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES:
+        _drop_search_index(table)
+        op.execute(f'CREATE TABLE {table}_search_docs (doc INTEGER PRIMARY KEY, id VARCHAR NOT NULL UNIQUE)')
+        op.execute(f'INSERT INTO {table}_search_docs(id) SELECT id FROM {table}')
+        _create_search_index(table, columns, by_document_number=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, columns in reversed(SEARCH_INDEXES):
+        _drop_search_index(table)
+        op.execute(f'DROP TABLE {table}_search_docs')
+        _create_search_index(table, columns, by_document_number=False)
@@ -0,0 +1,109 @@
+"""add archived artifacts
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 13:52:37.204861
+
+Archiving a job application deleted its cover letters, LinkedIn messages
+and resume optimizations, which were only kept in its archive document,
+so their endpoints no longer returned them. This indexes them by owner
+and application so they can be listed and looked up again. The index is
+filled from the documents of the applications already archived.
+
+"""
+import zlib
+from datetime import datetime
+from typing import Any, Sequence, Union
+
+from alembic import op
+import msgpack
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keys of the archive document that are indexed
+KINDS = ['cover_letters', 'linkedin_messages', 'resume_optimizations']
+
+BATCH_SIZE = 500
+
+
+def _unpack(data: bytes) -> Any:
+    body = bytes(data[1:])
+    if data[:1] == b'\x01':
+        body = zlib.decompress(body)
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+def _index_archived_documents() -> None:
+    """
+    Index the artifacts kept in the documents of archived applications, a
+    batch of applications at a time
+    """
+    bind = op.get_bind()
+    archived = sa.table(
+        'archived_job_applications',
+        sa.column('id', sa.String()), sa.column('user_id', sa.String()), sa.column('document', sa.LargeBinary())
+    )
+    artifacts = sa.table(
+        'archived_artifacts',
+        sa.column('id', sa.String()), sa.column('kind', sa.String()), sa.column('job_application_id', sa.String()),
+        sa.column('user_id', sa.String()), sa.column('resume_id', sa.String()),
+        sa.column('created_at', sa.DateTime(timezone=True))
+    )
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(archived.c.id, archived.c.user_id, archived.c.document)
+            .where(archived.c.id > last_id)
+            .order_by(archived.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = [
+            {
+                'id': row['id'],
+                'kind': kind,
+                'job_application_id': job_application_id,
+                'user_id': row.get('user_id') or user_id,
+                'resume_id': row.get('resume_id'),
+                'created_at': datetime.fromisoformat(row['created_at']) if row.get('created_at') else None,
+            }
+            for job_application_id, user_id, document in rows
+            for kind in KINDS
+            for row in _unpack(document).get(kind, [])
+        ]
+        if values:
+            bind.execute(artifacts.insert(), values)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'archived_artifacts',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('job_application_id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=True),
+        sa.Column('resume_id', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['job_application_id'], ['archived_job_applications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_artifacts_user_id_kind_created_at_id', 'archived_artifacts',
+                    ['user_id', 'kind', 'created_at', 'id'], unique=False)
+    op.create_index('ix_archived_artifacts_job_application_id_kind_created_at_id', 'archived_artifacts',
+                    ['job_application_id', 'kind', 'created_at', 'id'], unique=False)
+    _index_archived_documents()
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_artifacts_job_application_id_kind_created_at_id', table_name='archived_artifacts')
+    op.drop_index('ix_archived_artifacts_user_id_kind_created_at_id', table_name='archived_artifacts')
+    op.drop_table('archived_artifacts')
@@ -0,0 +1,57 @@
+"""
+Archive the stale job applications of JobCraftAI users
+
+Moves job applications that have been rejected, declined or accepted for
+longer than ARCHIVE_AFTER_DAYS out of the job application tables, a batch
+of ARCHIVE_BATCH_SIZE per transaction. Run it on a schedule, e.g. nightly
+from cron:
+
+    python -m app.archive_job_applications [--older-than-days DAYS] [--user-id USER_ID ...]
+"""
+
+import argparse
+import logging
+from datetime import timedelta
+from typing import List, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+# Import every model so all mappers and tables are registered
+from app.models import user, resume, job_application, linkedin, cover_letter, resume_optimization, task_queue, event, blob, stats, search, archive, job_import
+from app.services.archive import archive_job_applications
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Archive stale JobCraftAI job applications")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=settings.ARCHIVE_AFTER_DAYS,
+        help="Archive applications last updated more than this many days ago (default: ARCHIVE_AFTER_DAYS)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.ARCHIVE_BATCH_SIZE,
+        help="Applications archived per transaction (default: ARCHIVE_BATCH_SIZE)"
+    )
+    parser.add_argument(
+        "--user-id",
+        action="append",
+        dest="user_ids",
+        help="Only archive this user's applications (repeatable, default: all users)"
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        archived = archive_job_applications(db, timedelta(days=args.older_than_days), args.batch_size, args.user_ids)
+    finally:
+        db.close()
+    logger.info("Archived %d job applications", archived)
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,25 @@ class Settings(BaseSettings):
     
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./jobcraftai.db")
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")  # Read replica for GET endpoints
+    REPLICA_STICKY_SECONDS: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))  # Primary reads after a write
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "default")  # default, production
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 256 MB
+    SQLITE_CACHE_SIZE_KIB: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", str(64 * 1024)))  # 64 MB
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", "5"))
     
     # Authentication settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret-key-for-development-only")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    LOGIN_ATTEMPT_WINDOW_SECONDS: float = float(os.getenv("LOGIN_ATTEMPT_WINDOW_SECONDS", "300"))
+    LOGIN_MAX_ATTEMPTS_PER_ACCOUNT: int = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_ACCOUNT", "10"))
+    LOGIN_MAX_ATTEMPTS_PER_IP: int = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "50"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))  # 0 disables the cache
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
     
     # OpenAI settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
@@ -25,7 +39,50 @@ class Settings(BaseSettings):
     # File upload settings
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10 MB
-    
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")  # local, memory
+    MAX_BULK_UPLOAD_SIZE: int = int(os.getenv("MAX_BULK_UPLOAD_SIZE", str(500 * 1024 * 1024)))  # 500 MB
+    MAX_BULK_UPLOAD_FILES: int = int(os.getenv("MAX_BULK_UPLOAD_FILES", "1000"))
+    MAX_BULK_DELETE_IDS: int = int(os.getenv("MAX_BULK_DELETE_IDS", "1000"))
+    MAX_IMPORT_UPLOAD_SIZE: int = int(os.getenv("MAX_IMPORT_UPLOAD_SIZE", str(200 * 1024 * 1024)))  # 200 MB
+
+    # Job application import settings
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))  # Rows inserted per transaction
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))  # Row errors kept per import
+    IMPORT_PARSE_RATE_PER_MINUTE: float = float(os.getenv("IMPORT_PARSE_RATE_PER_MINUTE", "60"))  # Across all imports
+
+    # Archival settings
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))  # Age of terminal applications to archive
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))  # Applications archived per transaction
+
+    # Task queue settings
+    TASK_WORKERS_ENABLED: bool = os.getenv("TASK_WORKERS_ENABLED", "True").lower() == "true"
+    TASK_POLL_INTERVAL: float = float(os.getenv("TASK_POLL_INTERVAL", "1.0"))
+    TASK_LEASE_SECONDS: int = int(os.getenv("TASK_LEASE_SECONDS", "300"))
+    TASK_MAX_ATTEMPTS: int = int(os.getenv("TASK_MAX_ATTEMPTS", "5"))
+    TASK_RETRY_BACKOFF_SECONDS: int = int(os.getenv("TASK_RETRY_BACKOFF_SECONDS", "10"))
+    TASK_RETRY_BACKOFF_MAX_SECONDS: int = int(os.getenv("TASK_RETRY_BACKOFF_MAX_SECONDS", "3600"))
+    PARSE_RESUME_CONCURRENCY: int = int(os.getenv("PARSE_RESUME_CONCURRENCY", "2"))
+    BULK_PARSE_RESUME_CONCURRENCY: int = int(os.getenv("BULK_PARSE_RESUME_CONCURRENCY", "2"))
+    PARSE_JOB_DESCRIPTION_CONCURRENCY: int = int(os.getenv("PARSE_JOB_DESCRIPTION_CONCURRENCY", "4"))
+    SWEEP_BLOBS_CONCURRENCY: int = int(os.getenv("SWEEP_BLOBS_CONCURRENCY", "1"))
+    IMPORT_JOB_APPLICATIONS_CONCURRENCY: int = int(os.getenv("IMPORT_JOB_APPLICATIONS_CONCURRENCY", "1"))
+    IMPORT_PARSE_JOB_DESCRIPTION_CONCURRENCY: int = int(os.getenv("IMPORT_PARSE_JOB_DESCRIPTION_CONCURRENCY", "1"))
+    WORKER_DRAIN_TIMEOUT: float = float(os.getenv("WORKER_DRAIN_TIMEOUT", "120"))
+
+    # Event stream settings
+    EVENT_POLL_INTERVAL: float = float(os.getenv("EVENT_POLL_INTERVAL", "0.5"))
+    EVENT_RETENTION_SECONDS: int = int(os.getenv("EVENT_RETENTION_SECONDS", "3600"))
+    EVENT_HEARTBEAT_SECONDS: float = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+    EVENT_GAP_GRACE_SECONDS: float = float(os.getenv("EVENT_GAP_GRACE_SECONDS", "30"))
+
+    # Dashboard stats settings
+    STATS_WEEKS: int = int(os.getenv("STATS_WEEKS", "52"))
+    STATS_TOP_COMPANIES: int = int(os.getenv("STATS_TOP_COMPANIES", "20"))
+
+    # Pagination settings
+    DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
     class Config:
         env_file = ".env"
         case_sensitive = True
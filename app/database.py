@@ -1,18 +1,123 @@
-from sqlalchemy import create_engine
+import time
+from typing import Dict
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
+IS_SQLITE = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+
+# Production SQLite: WAL, tuned pragmas, pooled readers and a single writer
+SQLITE_PRODUCTION = IS_SQLITE and settings.SQLITE_PROFILE == "production"
+
+def configure_sqlite_connection(dbapi_connection, read_only: bool = False):
+    """
+    Apply the production SQLite pragmas to a new connection
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    # A negative cache size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+def use_sqlite_profile(engine: Engine, read_only: bool = False):
+    """
+    Configure every connection an engine opens with the production SQLite pragmas
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        configure_sqlite_connection(dbapi_connection, read_only)
+
+def enforce_sqlite_foreign_keys(engine: Engine):
+    """
+    Turn on foreign key enforcement, which SQLite leaves off by default, on
+    every connection an engine opens. ON DELETE CASCADE relies on it.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-)
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+# Reads go to a replica when one is configured
+READ_REPLICA = bool(settings.DATABASE_REPLICA_URL)
+
+if IS_SQLITE:
+    enforce_sqlite_foreign_keys(engine)
+
+if SQLITE_PRODUCTION:
+    use_sqlite_profile(engine)
+
+if READ_REPLICA:
+    read_engine = create_engine(settings.DATABASE_REPLICA_URL, pool_pre_ping=True)
+elif SQLITE_PRODUCTION:
+    # Query-only connections for read endpoints; WAL lets them run alongside the writer
+    read_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args=connect_args,
+        pool_size=settings.SQLITE_READ_POOL_SIZE
+    )
+    use_sqlite_profile(read_engine, read_only=True)
+else:
+    read_engine = engine
+
+if SQLITE_PRODUCTION:
+    # The single connection the write queue serializes background writes onto
+    write_engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, pool_size=1, max_overflow=0)
+    enforce_sqlite_foreign_keys(write_engine)
+    use_sqlite_profile(write_engine)
+else:
+    write_engine = engine
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for read-only work; they may lag behind the primary when reading from a replica
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Sessions used by the write queue; results are returned after commit, so keep them loaded
+WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=write_engine)
+
+# asyncio driver used for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def get_async_database_url(database_url: str):
+    """
+    Point a database URL at the asyncio driver of its backend
+    """
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+# Async engine for async def handlers, so their queries do not block the event loop
+async_engine = create_async_engine(get_async_database_url(settings.DATABASE_URL))
+
+if IS_SQLITE:
+    enforce_sqlite_foreign_keys(async_engine.sync_engine)
+
+if SQLITE_PRODUCTION:
+    use_sqlite_profile(async_engine.sync_engine)
+
+# Objects stay loaded after commit; reloading them would need an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -22,4 +127,51 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Number of tracked clients above which expired entries are dropped
+RECENT_WRITERS_PRUNE_SIZE = 10000
+
+class RecentWriters:
+    """
+    Clients that wrote recently. Their reads go to the primary until the
+    replica has had time to catch up, so they see their own writes.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._until: Dict[str, float] = {}
+
+    def mark(self, key: str):
+        now = time.monotonic()
+        if len(self._until) > RECENT_WRITERS_PRUNE_SIZE:
+            self._until = {k: until for k, until in self._until.items() if until > now}
+        self._until[key] = now + self.window_seconds
+
+    def is_recent(self, key: str) -> bool:
+        until = self._until.get(key)
+        return until is not None and until > time.monotonic()
+
+recent_writers = RecentWriters(settings.REPLICA_STICKY_SECONDS)
+
+def get_client_key(request: Request) -> str:
+    """
+    Key identifying the client for read-your-writes: its access token
+    """
+    return request.headers.get("authorization", "")
+
+# Dependency to get a DB session for read-only endpoints
+def get_read_db(request: Request):
+    if READ_REPLICA and recent_writers.is_recent(get_client_key(request)):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,10 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
-from app.database import engine, Base
-from app.routers import auth, users, resumes, job_applications, linkedin, cover_letters, resume_optimizations
+from app.database import engine, Base, SQLITE_PRODUCTION, READ_REPLICA, recent_writers, get_client_key
+from app.routers import auth, users, resumes, job_applications, linkedin, cover_letters, resume_optimizations, events, search
+from app.services.events import event_relay
+from app.services.task_queue import TaskWorkerPool
+from app.services.write_queue import write_queue
+from app.services.task_handlers import TASK_HANDLERS, TASK_FAILURE_HANDLERS, TASK_CONCURRENCY
 
 # Create all tables in the database
 # Comment this out if using Alembic migrations
@@ -27,8 +30,20 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Static files for uploads
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+# Methods that do not write
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+if READ_REPLICA:
+    @app.middleware("http")
+    async def track_recent_writes(request: Request, call_next):
+        """
+        Send a client's reads to the primary for a short time after it writes
+        """
+        response = await call_next(request)
+        key = get_client_key(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and key:
+            recent_writers.mark(key)
+        return response
 
 # Include routers
 app.include_router(auth.router, prefix=settings.API_PREFIX)
@@ -38,6 +53,25 @@ app.include_router(job_applications.router, prefix=settings.API_PREFIX)
 app.include_router(linkedin.router, prefix=settings.API_PREFIX)
 app.include_router(cover_letters.router, prefix=settings.API_PREFIX)
 app.include_router(resume_optimizations.router, prefix=settings.API_PREFIX)
+app.include_router(events.router, prefix=settings.API_PREFIX)
+app.include_router(search.router, prefix=settings.API_PREFIX)
+
+# In-process workers for the durable task queue
+task_worker_pool = TaskWorkerPool(TASK_HANDLERS, TASK_CONCURRENCY, TASK_FAILURE_HANDLERS)
+
+@app.on_event("startup")
+async def start_background_services():
+    if SQLITE_PRODUCTION:
+        await write_queue.start()
+    await event_relay.start()
+    if settings.TASK_WORKERS_ENABLED:
+        await task_worker_pool.start()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await task_worker_pool.stop(timeout=settings.WORKER_DRAIN_TIMEOUT)
+    await event_relay.stop()
+    await write_queue.stop()
 
 @app.get("/")
 async def root():
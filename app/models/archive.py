@@ -0,0 +1,67 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Integer, Float, Index
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.job_application import ApplicationStatus
+from app.models.types import CompressedJSON
+
+class ArchivedJobApplication(Base):
+    """
+    A job application moved out of the job_applications table once it had
+    been in a terminal status for long enough. The columns shown in lists
+    are kept as columns; the rest of the application and every row it owned
+    are kept in one compressed document.
+    """
+    __tablename__ = "archived_job_applications"
+
+    id = Column(String, primary_key=True)  # ID of the job application
+    user_id = Column(String, ForeignKey("users.id"))
+
+    # Summary columns, copied from the job application
+    job_title = Column(String)
+    company_name = Column(String)
+    job_url = Column(String, nullable=True)
+    job_location = Column(String, nullable=True)
+    salary_range = Column(String, nullable=True)
+    status = Column(Enum(ApplicationStatus))
+    applied_date = Column(DateTime(timezone=True), nullable=True)
+    description_snippet = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Match scores of the archived resume optimizations, still counted in the dashboard aggregates
+    scored_optimizations = Column(Integer, nullable=False, default=0)
+    match_score_total = Column(Float, nullable=False, default=0.0)
+
+    # The job application and its requirements, responsibilities, LinkedIn
+    # messages, cover letters and resume optimizations
+    document = deferred(Column(CompressedJSON, nullable=False))
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_archived_job_applications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_archived_job_applications_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+    )
+
+class ArchivedArtifact(Base):
+    """
+    A cover letter, LinkedIn message or resume optimization of an archived
+    job application. The row itself stays in the application's document;
+    this indexes it, so it can still be listed and looked up by ID.
+    """
+    __tablename__ = "archived_artifacts"
+
+    id = Column(String, primary_key=True)  # ID of the cover letter, LinkedIn message or resume optimization
+    kind = Column(String, nullable=False)  # Key of the rows in the document: cover_letters, linkedin_messages or resume_optimizations
+    job_application_id = Column(String, ForeignKey("archived_job_applications.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"))
+    resume_id = Column(String, nullable=True)  # Resume of a resume optimization
+    created_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_archived_artifacts_user_id_kind_created_at_id", "user_id", "kind", "created_at", "id"),
+        Index("ix_archived_artifacts_job_application_id_kind_created_at_id",
+              "job_application_id", "kind", "created_at", "id"),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+class StoredBlob(Base):
+    __tablename__ = "stored_blobs"
+
+    key = Column(String, primary_key=True)  # SHA-256 of the content
+    size = Column(Integer)
+    ref_count = Column(Integer, default=0, nullable=False)  # Number of rows referring to this blob
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
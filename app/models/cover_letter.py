@@ -1,24 +1,35 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, column_property
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.types import CompressedJSON
 
 class CoverLetter(Base):
     __tablename__ = "cover_letters"
 
     id = Column(String, primary_key=True, index=True)
-    job_application_id = Column(String, ForeignKey("job_applications.id"))
+    job_application_id = Column(String, ForeignKey("job_applications.id", ondelete="CASCADE"))
+    # Owner of the job application, copied so ownership checks need no join
+    user_id = Column(String, ForeignKey("users.id"))
     
     # Cover letter details
     content = Column(Text)
     tone = Column(String, nullable=True)  # formal, friendly, enthusiastic, etc.
     
     # Generation parameters
-    generation_params = Column(JSON, nullable=True)  # Stores any additional parameters used for generation
+    generation_params = Column(CompressedJSON, nullable=True)  # Stores any additional parameters used for generation
+
+    # Start of the content for list views, only loaded when asked for
+    content_snippet = column_property(func.substr(content, 1, 200), deferred=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    job_application = relationship("JobApplication", back_populates="cover_letters")
\ No newline at end of file
+    job_application = relationship("JobApplication", back_populates="cover_letters")
+
+    __table_args__ = (
+        Index("ix_cover_letters_job_application_id_created_at_id", "job_application_id", "created_at", "id"),
+        Index("ix_cover_letters_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Index
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+class UserEvent(Base):
+    __tablename__ = "user_events"
+
+    # Monotonic ID, also used as the SSE event ID
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)  # resume.status, job_application.parsed, etc.
+    data = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Used to purge old events
+
+    __table_args__ = (
+        Index("ix_user_events_user_id_id", "user_id", "id"),
+        # IDs must keep growing after old events are purged, which SQLite
+        # only guarantees with AUTOINCREMENT
+        {"sqlite_autoincrement": True},
+    )
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship, column_property, deferred
 from sqlalchemy.sql import func
 import enum
 
 from app.database import Base
+from app.models.types import CompressedJSON
 
 class ApplicationStatus(str, enum.Enum):
     PLANNING = "planning"
@@ -35,22 +36,40 @@ class JobApplication(Base):
     notes = Column(Text, nullable=True)
     
     # Parsed job details (extracted from job description)
-    parsed_job_details = Column(JSON, nullable=True)
+    parsed_job_details = Column(CompressedJSON, nullable=True)
+    # Requirements and responsibilities serialized for the detail view, rewritten whenever they are replaced
+    parsed_sections = deferred(Column(CompressedJSON, nullable=True))
+
+    # Keys imports skip duplicates by: the normalized URL and a hash of the description
+    job_url_key = Column(String, nullable=True)
+    description_hash = Column(String, nullable=True)
+
+    # Start of the description for list views, only loaded when asked for
+    description_snippet = column_property(func.substr(job_description, 1, 200), deferred=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="job_applications")
-    linkedin_messages = relationship("LinkedInMessage", back_populates="job_application", cascade="all, delete-orphan")
-    cover_letters = relationship("CoverLetter", back_populates="job_application", cascade="all, delete-orphan")
-    resume_optimizations = relationship("ResumeOptimization", back_populates="job_application", cascade="all, delete-orphan")
+    linkedin_messages = relationship("LinkedInMessage", back_populates="job_application", cascade="all, delete-orphan", passive_deletes=True)
+    cover_letters = relationship("CoverLetter", back_populates="job_application", cascade="all, delete-orphan", passive_deletes=True)
+    resume_optimizations = relationship("ResumeOptimization", back_populates="job_application", cascade="all, delete-orphan", passive_deletes=True)
+    requirements = relationship("JobRequirement", cascade="all, delete-orphan", passive_deletes=True)
+    responsibilities = relationship("JobResponsibility", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_job_applications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_job_applications_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+        Index("ix_job_applications_user_id_job_url_key", "user_id", "job_url_key"),
+        Index("ix_job_applications_user_id_description_hash", "user_id", "description_hash"),
+    )
 
 class JobRequirement(Base):
     __tablename__ = "job_requirements"
     
     id = Column(String, primary_key=True, index=True)
-    job_application_id = Column(String, ForeignKey("job_applications.id"))
+    job_application_id = Column(String, ForeignKey("job_applications.id", ondelete="CASCADE"), index=True)
     requirement = Column(Text)
     type = Column(String, nullable=True)  # required, preferred, etc.
     
@@ -61,7 +80,7 @@ class JobResponsibility(Base):
     __tablename__ = "job_responsibilities"
     
     id = Column(String, primary_key=True, index=True)
-    job_application_id = Column(String, ForeignKey("job_applications.id"))
+    job_application_id = Column(String, ForeignKey("job_applications.id", ondelete="CASCADE"), index=True)
     responsibility = Column(Text)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.types import CompressedJSON
+
+class JobApplicationImport(Base):
+    """
+    An uploaded CSV or JSONL file of job applications and the progress of
+    importing it. The counters are committed with each batch of rows, so a
+    retried import resumes after the last saved batch.
+    """
+    __tablename__ = "job_application_imports"
+
+    id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("users.id"), index=True)
+    file_name = Column(String)
+    file_format = Column(String)  # csv, jsonl
+    file_key = Column(String)  # Uploaded file, released once the import has finished
+    status = Column(String, default="pending")  # pending, processing, completed, failed
+
+    # Rows read so far, and what became of them
+    processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(CompressedJSON, nullable=True, default=list)  # First IMPORT_MAX_ERRORS rows that failed, with their errors
+    error = Column(Text, nullable=True)  # Why the import as a whole failed
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Boolean
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -9,7 +9,9 @@ class LinkedInMessage(Base):
     __tablename__ = "linkedin_messages"
 
     id = Column(String, primary_key=True, index=True)
-    job_application_id = Column(String, ForeignKey("job_applications.id"))
+    job_application_id = Column(String, ForeignKey("job_applications.id", ondelete="CASCADE"))
+    # Owner of the job application, copied so ownership checks need no join
+    user_id = Column(String, ForeignKey("users.id"))
     
     # Target person details
     target_name = Column(String)
@@ -27,4 +29,9 @@ class LinkedInMessage(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    job_application = relationship("JobApplication", back_populates="linkedin_messages")
\ No newline at end of file
+    job_application = relationship("JobApplication", back_populates="linkedin_messages")
+
+    __table_args__ = (
+        Index("ix_linkedin_messages_job_application_id_created_at_id", "job_application_id", "created_at", "id"),
+        Index("ix_linkedin_messages_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
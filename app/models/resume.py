@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Index
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.types import CompressedJSON
 
 class Resume(Base):
     __tablename__ = "resumes"
@@ -10,25 +11,47 @@ class Resume(Base):
     id = Column(String, primary_key=True, index=True)
     user_id = Column(String, ForeignKey("users.id"))
     file_name = Column(String)
-    file_path = Column(String)
+    file_key = Column(String, ForeignKey("stored_blobs.key"), index=True)  # Storage key of the uploaded file
+    file_size = Column(Integer, nullable=True)
     file_type = Column(String)  # PDF, DOCX, etc.
+    batch_id = Column(String, ForeignKey("resume_batches.id"), nullable=True, index=True)  # Set for bulk uploads
     
     # Parsed resume content
-    parsed_content = Column(JSON, nullable=True)
+    parsed_content = Column(CompressedJSON, nullable=True)
     parsed_status = Column(String, default="pending")  # pending, processing, completed, failed
+    # Structured rows serialized for the parsed content view, rewritten whenever they are replaced
+    parsed_sections = deferred(Column(CompressedJSON, nullable=True))
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="resumes")
-    optimizations = relationship("ResumeOptimization", back_populates="resume", cascade="all, delete-orphan")
+    optimizations = relationship("ResumeOptimization", back_populates="resume", cascade="all, delete-orphan", passive_deletes=True)
+    educations = relationship("ParsedEducation", cascade="all, delete-orphan", passive_deletes=True)
+    experiences = relationship("ParsedExperience", cascade="all, delete-orphan", passive_deletes=True)
+    skills = relationship("ParsedSkill", cascade="all, delete-orphan", passive_deletes=True)
+    projects = relationship("ParsedProject", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_resumes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+class ResumeBatch(Base):
+    __tablename__ = "resume_batches"
+    
+    id = Column(String, primary_key=True, index=True)
+    user_id = Column(String, ForeignKey("users.id"))
+    file_name = Column(String)  # Name of the uploaded archive
+    total = Column(Integer, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class ParsedEducation(Base):
     __tablename__ = "parsed_educations"
     
     id = Column(String, primary_key=True, index=True)
-    resume_id = Column(String, ForeignKey("resumes.id"))
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     institution = Column(String)
     degree = Column(String)
     field_of_study = Column(String, nullable=True)
@@ -43,7 +66,7 @@ class ParsedExperience(Base):
     __tablename__ = "parsed_experiences"
     
     id = Column(String, primary_key=True, index=True)
-    resume_id = Column(String, ForeignKey("resumes.id"))
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     company = Column(String)
     title = Column(String)
     location = Column(String, nullable=True)
@@ -58,7 +81,7 @@ class ParsedSkill(Base):
     __tablename__ = "parsed_skills"
     
     id = Column(String, primary_key=True, index=True)
-    resume_id = Column(String, ForeignKey("resumes.id"))
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     name = Column(String)
     category = Column(String, nullable=True)  # technical, soft, language, etc.
     
@@ -69,7 +92,7 @@ class ParsedProject(Base):
     __tablename__ = "parsed_projects"
     
     id = Column(String, primary_key=True, index=True)
-    resume_id = Column(String, ForeignKey("resumes.id"))
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     name = Column(String)
     description = Column(Text, nullable=True)
     start_date = Column(String, nullable=True)
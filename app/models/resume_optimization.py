@@ -1,18 +1,21 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.types import CompressedJSON
 
 class ResumeOptimization(Base):
     __tablename__ = "resume_optimizations"
 
     id = Column(String, primary_key=True, index=True)
-    job_application_id = Column(String, ForeignKey("job_applications.id"))
-    resume_id = Column(String, ForeignKey("resumes.id"))
+    job_application_id = Column(String, ForeignKey("job_applications.id", ondelete="CASCADE"))
+    # Owner of the job application, copied so ownership checks need no join
+    user_id = Column(String, ForeignKey("users.id"))
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), index=True)
     
     # Optimization details
-    suggestions = Column(JSON)  # List of suggestions for resume improvement
+    suggestions = Column(CompressedJSON)  # List of suggestions for resume improvement
     match_score = Column(Float, nullable=True)  # Overall match score (0-1)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,12 +24,18 @@ class ResumeOptimization(Base):
     # Relationships
     job_application = relationship("JobApplication", back_populates="resume_optimizations")
     resume = relationship("Resume", back_populates="optimizations")
+    skill_matches = relationship("SkillMatch", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_resume_optimizations_job_application_id_created_at_id", "job_application_id", "created_at", "id"),
+        Index("ix_resume_optimizations_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
 class SkillMatch(Base):
     __tablename__ = "skill_matches"
     
     id = Column(String, primary_key=True, index=True)
-    resume_optimization_id = Column(String, ForeignKey("resume_optimizations.id"))
+    resume_optimization_id = Column(String, ForeignKey("resume_optimizations.id", ondelete="CASCADE"), index=True)
     
     skill_name = Column(String)
     is_present = Column(String)  # yes, no, partial
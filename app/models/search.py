@@ -0,0 +1,146 @@
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, text
+
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    Full-text index over the text columns of a table. On SQLite it is an
+    FTS5 table kept in sync by triggers, on PostgreSQL a generated tsvector
+    column with a GIN index.
+    """
+    kind: str
+    table: str
+    columns: Tuple[str, ...]
+    # Column pointing at the job application; None for job applications themselves
+    parent_column: Optional[str] = "job_application_id"
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+    @property
+    def content_view(self) -> str:
+        return f"{self.table}_search"
+
+    @property
+    def doc_table(self) -> str:
+        """
+        Table numbering the indexed rows. Its INTEGER PRIMARY KEY keys the
+        FTS5 table, because a VACUUM can renumber the rowids of the indexed
+        table itself.
+        """
+        return f"{self.table}_search_docs"
+
+    @property
+    def document(self) -> str:
+        """
+        SQL expression of the indexed text of a row aliased as t
+        """
+        return " || ' ' || ".join(f"coalesce(t.{column}, '')" for column in self.columns)
+
+SEARCH_INDEXES = [
+    SearchIndex("job_application", "job_applications", ("job_title", "company_name", "job_description", "notes"), None),
+    SearchIndex("cover_letter", "cover_letters", ("content",)),
+    SearchIndex("linkedin_message", "linkedin_messages", ("generated_message",)),
+]
+
+# Text search configuration used on PostgreSQL
+TS_CONFIG = "english"
+
+def sqlite_search_ddl(index: SearchIndex) -> List[str]:
+    """
+    FTS5 table reading its content from a view of the indexed table, and
+    the triggers keeping it and the document numbers in sync.
+
+    The owner's user_id is indexed along with the text, hex-encoded so it
+    is a single token, and a search only visits the user's documents. Only
+    the column of each match is stored, not its position, which keeps the
+    index of frequent words small.
+    """
+    fts = index.fts_table
+    docs = index.doc_table
+    columns = ", ".join(index.columns)
+    view_columns = ", ".join(f"t.{column}" for column in index.columns)
+    new_values = ", ".join(f"new.{column}" for column in index.columns)
+    old_values = ", ".join(f"old.{column}" for column in index.columns)
+    insert = (
+        f"INSERT INTO {fts}(rowid, owner, {columns}) "
+        f"SELECT doc, hex(new.user_id), {new_values} FROM {docs} WHERE id = new.id;"
+    )
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, owner, {columns}) "
+        f"SELECT 'delete', doc, hex(old.user_id), {old_values} FROM {docs} WHERE id = old.id;"
+    )
+    return [
+        f"CREATE TABLE IF NOT EXISTS {docs} (doc INTEGER PRIMARY KEY, id VARCHAR NOT NULL UNIQUE)",
+        f"CREATE VIEW IF NOT EXISTS {index.content_view} AS "
+        f"SELECT d.doc, hex(t.user_id) AS owner, {view_columns} FROM {index.table} t JOIN {docs} d ON d.id = t.id",
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(owner, {columns}, "
+        f"content='{index.content_view}', content_rowid='doc', detail=column, tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {index.table} "
+        f"BEGIN INSERT INTO {docs}(id) VALUES (new.id); {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {index.table} "
+        f"BEGIN {delete} DELETE FROM {docs} WHERE id = old.id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF user_id, {columns} ON {index.table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+def postgresql_search_ddl(index: SearchIndex) -> List[str]:
+    """
+    Generated tsvector column and its GIN index
+    """
+    document = index.document.replace("t.", "")
+    return [
+        f"ALTER TABLE {index.table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{TS_CONFIG}', {document})) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{index.table}_search_vector ON {index.table} USING GIN (search_vector)",
+    ]
+
+def install_search_indexes(connection, tables: Optional[Set[str]] = None):
+    """
+    Create the missing search indexes, indexing the existing rows. Tables
+    without the columns an index reads, which create_all does not add to
+    existing tables, are left to the Alembic migrations.
+
+    Args:
+        connection: Database connection
+        tables: Names of the tables to index; every indexed table if None
+    """
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+    for index in SEARCH_INDEXES:
+        if tables is not None and index.table not in tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(index.table)}
+        missing = {"user_id", *index.columns} - columns
+        if missing:
+            logger.warning(
+                f"Not installing the {index.kind} search index: {index.table} has no "
+                f"{', '.join(sorted(missing))} column; run `alembic upgrade head`"
+            )
+            continue
+        if dialect == "sqlite":
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": index.fts_table}
+            ).first() is not None
+            for statement in sqlite_search_ddl(index):
+                connection.execute(text(statement))
+            if not exists:
+                connection.execute(text(f"INSERT INTO {index.doc_table}(id) SELECT id FROM {index.table}"))
+                connection.execute(text(f"INSERT INTO {index.fts_table}({index.fts_table}) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            for statement in postgresql_search_ddl(index):
+                connection.execute(text(statement))
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_search_indexes(target, connection, tables=(), **kw):
+    # Only the tables create_all just created: existing ones are migrated by Alembic
+    install_search_indexes(connection, {table.name for table in tables})
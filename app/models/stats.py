@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
+
+from app.database import Base
+
+class UserStatCounter(Base):
+    """
+    One incrementally maintained dashboard aggregate of a user, e.g. the
+    number of job applications with status "applied"
+    """
+    __tablename__ = "user_stat_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    dimension = Column(String, primary_key=True)  # total, status, applied_week, company, match_score
+    key = Column(String, primary_key=True, default="")  # Status, week start date, company name
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)  # Sum of the counted values, for averages
+
+    __table_args__ = (
+        # Top companies by count without reading every company counter
+        Index("ix_user_stat_counters_user_id_dimension_count", "user_id", "dimension", "count"),
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, Enum, Index
+from sqlalchemy.sql import func
+import enum
+
+from app.database import Base
+
+class TaskStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DEAD = "dead"
+
+class QueuedTask(Base):
+    __tablename__ = "task_queue"
+
+    id = Column(String, primary_key=True, index=True)
+    task_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=True)
+
+    # Queue state
+    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime(timezone=True), nullable=False)  # Not visible to workers before this time
+
+    # Lease held by the worker currently running the task
+    locked_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_task_queue_claim", "task_type", "status", "run_after"),
+    )
@@ -0,0 +1,53 @@
+import zlib
+from typing import Any, Optional
+
+import msgpack
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# First byte of a stored document, telling how the rest is encoded
+RAW = b"\x00"
+ZLIB = b"\x01"
+
+# Packed documents shorter than this are stored uncompressed, as
+# compressing them saves next to nothing
+COMPRESS_MIN_SIZE = 256
+COMPRESSION_LEVEL = 6
+
+def pack_document(value: Any) -> bytes:
+    """
+    Encode a JSON-compatible document as msgpack, zlib-compressed unless it is small
+    """
+    packed = msgpack.packb(value, use_bin_type=True)
+    if len(packed) < COMPRESS_MIN_SIZE:
+        return RAW + packed
+    return ZLIB + zlib.compress(packed, COMPRESSION_LEVEL)
+
+def unpack_document(data: bytes) -> Any:
+    """
+    Decode a document encoded by pack_document
+    """
+    header, body = data[:1], data[1:]
+    if header == ZLIB:
+        body = zlib.decompress(body)
+    elif header != RAW:
+        raise ValueError(f"Unknown document encoding {header!r}")
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON-compatible document stored as compressed msgpack in a binary
+    column. Documents are smaller than JSON text and decode faster; they
+    cannot be queried with the database's JSON operators.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return pack_document(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return unpack_document(bytes(value))
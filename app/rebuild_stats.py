@@ -0,0 +1,42 @@
+"""
+Rebuild the dashboard aggregates of JobCraftAI users
+
+The per-user counters behind /job-applications/stats are kept up to date
+as job applications and resume optimizations change. This recomputes them
+from scratch, e.g. after a bulk import or to repair drift:
+
+    python -m app.rebuild_stats [--user-id USER_ID ...]
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from app.database import SessionLocal
+# Import every model so all mappers and tables are registered
+from app.models import user, resume, job_application, linkedin, cover_letter, resume_optimization, task_queue, event, blob, stats, search, archive, job_import
+from app.services.dashboard_stats import rebuild_stats
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rebuild JobCraftAI dashboard aggregates")
+    parser.add_argument(
+        "--user-id",
+        action="append",
+        dest="user_ids",
+        help="Only rebuild this user's aggregates (repeatable, default: all users)"
+    )
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        written = rebuild_stats(db, args.user_ids)
+    finally:
+        db.close()
+    logger.info("Rebuilt dashboard aggregates: %d counters written", written)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.user import Token, UserLogin
 from app.utils.security import (
@@ -12,6 +13,7 @@ from app.utils.security import (
     create_access_token,
     get_current_active_user
 )
+from app.utils.throttle import account_login_limiter, ip_login_limiter
 
 router = APIRouter(
     prefix="/auth",
@@ -19,12 +21,44 @@ router = APIRouter(
     responses={401: {"description": "Unauthorized"}},
 )
 
+def throttle_login(request: Request, email: str):
+    """
+    Reject a login attempt once the account or client IP has made too many,
+    before any password hashing is done
+    """
+    keys = [(account_login_limiter, email.lower())]
+    if request.client is not None:
+        keys.append((ip_login_limiter, request.client.host))
+    for limiter, key in keys:
+        retry_after = limiter.hit(key)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+def clear_login_attempts(request: Request, email: str):
+    """
+    Forget the failed attempts on an account after a successful login. The
+    client IP keeps its failures, so logging in to one account does not
+    lift the limit on guessing others; only this attempt is taken back.
+    """
+    account_login_limiter.reset(email.lower())
+    if request.client is not None:
+        ip_login_limiter.undo(request.client.host)
+
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    throttle_login(request, form_data.username)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,17 +66,19 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    clear_login_attempts(request, user.email)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     User login endpoint, get an access token for future requests
     """
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+    throttle_login(request, user_credentials.email)
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,6 +86,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    clear_login_attempts(request, user.email)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_db
 from app.models.user import User
-from app.models.job_application import JobApplication
-from app.models.resume import Resume
 from app.models.cover_letter import CoverLetter
 from app.schemas.cover_letter import (
     CoverLetterCreate,
     CoverLetterUpdate,
     CoverLetter as CoverLetterSchema,
+    CoverLetterSummary,
     CoverLetterGenerateRequest,
     CoverLetterGenerateResponse,
     ToneType
 )
+from app.schemas.pagination import Page
 from app.utils.security import get_current_active_user, generate_uuid
+from app.utils.pagination import PageParams, merge_pages
+from app.utils.projections import ListProjection
+from app.services.archive import archived_artifact, archived_artifacts_page, archived_artifacts_query
 from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.generation_context import load_generation_context
 
 router = APIRouter(
     prefix="/cover-letters",
@@ -24,61 +29,56 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Columns loaded when listing; the large ones are only loaded on request
+COVER_LETTER_LIST = ListProjection(
+    CoverLetter,
+    summary=["id", "job_application_id", "tone", "content_snippet", "created_at", "updated_at"],
+    optional=["content", "generation_params"]
+)
+
 @router.post("", response_model=CoverLetterSchema, status_code=status.HTTP_201_CREATED)
 async def create_cover_letter(
     cover_letter: CoverLetterCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Create a new cover letter
     """
-    # Check if job application exists and belongs to current user
-    job_application = db.query(JobApplication).filter(
-        JobApplication.id == cover_letter.job_application_id,
-        JobApplication.user_id == current_user.id
-    ).first()
+    # Load the job application, the latest parsed resume and the portfolio URL
+    context = await load_generation_context(db, current_user.id, cover_letter.job_application_id)
     
-    if job_application is None:
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
     
-    # Get the latest resume for the user
-    resume = db.query(Resume).filter(
-        Resume.user_id == current_user.id,
-        Resume.parsed_status == "completed"
-    ).order_by(Resume.created_at.desc()).first()
-    
-    if resume is None:
+    if context.resume_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No parsed resume found. Please upload and parse a resume first."
         )
     
-    # Get resume data
-    resume_data = resume.parsed_content
+    # Return the connection to the pool while the cover letter is generated
+    await db.commit()
     
     # Generate cover letter
-    content = await CoverLetterGenerator.generate_cover_letter(
-        resume_data=resume_data,
-        job_description=job_application.job_description,
-        company_name=job_application.company_name,
-        job_title=job_application.job_title,
-        tone=cover_letter.tone.value if cover_letter.tone else "professional",
-        portfolio_url=current_user.portfolio_url
+    content = await CoverLetterGenerator.generate_for_context(
+        context,
+        tone=cover_letter.tone.value if cover_letter.tone else "professional"
     )
     
     # Create cover letter record
     db_cover_letter = CoverLetter(
         id=generate_uuid(),
         job_application_id=cover_letter.job_application_id,
+        user_id=current_user.id,
         tone=cover_letter.tone,
         content=content,
         generation_params={
-            "resume_id": resume.id,
-            "portfolio_url": current_user.portfolio_url,
+            "resume_id": context.resume_id,
+            "portfolio_url": context.portfolio_url,
             "emphasized_projects": None,
             "emphasized_skills": None,
             "emphasized_experiences": None,
@@ -87,53 +87,62 @@ async def create_cover_letter(
     )
     
     db.add(db_cover_letter)
-    db.commit()
-    db.refresh(db_cover_letter)
+    await db.commit()
+    await db.refresh(db_cover_letter)
     
     return db_cover_letter
 
-@router.get("", response_model=List[CoverLetterSchema])
+@router.get("", response_model=Page[CoverLetterSummary], response_model_exclude_unset=True)
 def get_cover_letters(
     job_application_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include: content, generation_params"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also list the cover letters of archived applications")
 ):
     """
     Get cover letters, optionally filtered by job application
     """
-    query = db.query(CoverLetter).join(
-        JobApplication, 
-        CoverLetter.job_application_id == JobApplication.id
-    ).filter(
-        JobApplication.user_id == current_user.id
+    query = db.query(CoverLetter).filter(
+        CoverLetter.user_id == current_user.id
     )
     
     # Filter by job application if provided
     if job_application_id:
         query = query.filter(CoverLetter.job_application_id == job_application_id)
     
-    # Order by created_at desc
-    query = query.order_by(CoverLetter.created_at.desc())
+    if not include_archived:
+        return COVER_LETTER_LIST.paginate(query, page, fields)
     
-    return query.all()
+    # Fetch a page of live and of archived cover letters from the same cursor and keep the newest
+    requested = COVER_LETTER_LIST.parse_fields(fields)
+    archived = archived_artifacts_query(db, current_user.id, "cover_letters", job_application_id)
+    return merge_pages([
+        COVER_LETTER_LIST.paginate(query, page, fields),
+        archived_artifacts_page(db, archived, page, [*COVER_LETTER_LIST.summary, *requested])
+    ], page)
 
 @router.get("/{cover_letter_id}", response_model=CoverLetterSchema)
 def get_cover_letter(
     cover_letter_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also look up the cover letters of archived applications")
 ):
     """
     Get a specific cover letter by ID
     """
-    cover_letter = db.query(CoverLetter).join(
-        JobApplication, 
-        CoverLetter.job_application_id == JobApplication.id
-    ).filter(
+    cover_letter = db.query(CoverLetter).filter(
         CoverLetter.id == cover_letter_id,
-        JobApplication.user_id == current_user.id
+        CoverLetter.user_id == current_user.id
     ).first()
     
+    if cover_letter is None and include_archived:
+        archived = archived_artifact(db, current_user.id, "cover_letters", cover_letter_id)
+        if archived is not None:
+            return CoverLetterSchema(**archived)
+    
     if cover_letter is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,12 +161,9 @@ def update_cover_letter(
     """
     Update a cover letter
     """
-    cover_letter = db.query(CoverLetter).join(
-        JobApplication, 
-        CoverLetter.job_application_id == JobApplication.id
-    ).filter(
+    cover_letter = db.query(CoverLetter).filter(
         CoverLetter.id == cover_letter_id,
-        JobApplication.user_id == current_user.id
+        CoverLetter.user_id == current_user.id
     ).first()
     
     if cover_letter is None:
@@ -185,12 +191,9 @@ def delete_cover_letter(
     """
     Delete a cover letter
     """
-    cover_letter = db.query(CoverLetter).join(
-        JobApplication, 
-        CoverLetter.job_application_id == JobApplication.id
-    ).filter(
+    cover_letter = db.query(CoverLetter).filter(
         CoverLetter.id == cover_letter_id,
-        JobApplication.user_id == current_user.id
+        CoverLetter.user_id == current_user.id
     ).first()
     
     if cover_letter is None:
@@ -208,52 +211,38 @@ def delete_cover_letter(
 @router.post("/generate", response_model=CoverLetterGenerateResponse)
 async def generate_cover_letter(
     request: CoverLetterGenerateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Generate a cover letter without saving it
     """
-    # Check if job application exists and belongs to current user
-    job_application = db.query(JobApplication).filter(
-        JobApplication.id == request.job_application_id,
-        JobApplication.user_id == current_user.id
-    ).first()
+    # Load the job application, the resume and the portfolio URL
+    context = await load_generation_context(db, current_user.id, request.job_application_id, request.resume_id)
     
-    if job_application is None:
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
     
-    # Check if resume exists and belongs to current user
-    resume = db.query(Resume).filter(
-        Resume.id == request.resume_id,
-        Resume.user_id == current_user.id,
-        Resume.parsed_status == "completed"
-    ).first()
-    
-    if resume is None:
+    if context.resume_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found or not fully parsed"
         )
     
-    # Get resume data
-    resume_data = resume.parsed_content
+    # Return the connection to the pool while the cover letter is generated
+    await db.commit()
     
     # Generate cover letter
-    content = await CoverLetterGenerator.generate_cover_letter(
-        resume_data=resume_data,
-        job_description=job_application.job_description,
-        company_name=job_application.company_name,
-        job_title=job_application.job_title,
+    content = await CoverLetterGenerator.generate_for_context(
+        context,
         tone=request.tone.value if request.tone else "professional",
         emphasized_projects=request.emphasized_projects,
         emphasized_skills=request.emphasized_skills,
         emphasized_experiences=request.emphasized_experiences,
-        personal_note=request.personal_note,
-        portfolio_url=current_user.portfolio_url
+        personal_note=request.personal_note
     )
     
     return {"content": content}
\ No newline at end of file
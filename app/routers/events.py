@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import json
+
+from app.config import settings
+from app.database import AsyncSessionLocal, ReadSessionLocal
+from app.services.events import event_broker, get_events_since
+from app.utils.security import optional_oauth2_scheme, get_user_from_token
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    responses={401: {"description": "Unauthorized"}},
+)
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = None,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    last_event_id: Optional[int] = Header(None)
+):
+    """
+    Stream parse status events for the current user as server-sent events.
+
+    The access token can be passed as a bearer token or, for EventSource
+    clients that cannot set headers, as the `token` query parameter.
+    """
+    # Authenticate with a short-lived session instead of holding one open
+    # for the lifetime of the stream
+    async with AsyncSessionLocal() as db:
+        user = await get_user_from_token(db, header_token or token or "")
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_id = user.id
+
+    async def event_stream():
+        # Subscribe before replaying so no event falls between the two
+        queue = event_broker.subscribe(user_id)
+        try:
+            # Events can be relayed out of ID order, so the replayed ones are
+            # skipped by ID rather than everything up to the last replayed
+            replayed = set()
+            if last_event_id is not None:
+                backlog = await asyncio.to_thread(_load_backlog, user_id, last_event_id)
+                for event in backlog:
+                    yield format_sse(event)
+                    replayed.add(event["id"])
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["id"] in replayed:
+                    continue
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _load_backlog(user_id: str, last_event_id: int):
+    with ReadSessionLocal() as db:
+        return get_events_since(db, user_id, last_event_id)
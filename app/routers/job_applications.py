@@ -1,20 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
+from sqlalchemy.orm import Session, undefer
+from typing import Optional
 from datetime import datetime
+import os
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.models.user import User
-from app.models.job_application import JobApplication, JobRequirement, JobResponsibility, ApplicationStatus
+from app.models.job_application import JobApplication, ApplicationStatus
+from app.models.job_import import JobApplicationImport
 from app.schemas.job_application import (
     JobApplicationCreate, 
     JobApplicationUpdate, 
     JobApplication as JobApplicationSchema,
+    JobApplicationSummary,
     JobApplicationDetail,
+    JobApplicationStats,
     ParsedJobDetails
 )
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult
+from app.schemas.job_import import JobApplicationImport as JobApplicationImportSchema
+from app.schemas.pagination import Page
 from app.utils.security import get_current_active_user, generate_uuid
-from app.services.openai_service import OpenAIService
+from app.utils.pagination import PageParams, merge_pages
+from app.utils.projections import ListProjection
+from app.services.task_queue import TaskQueue
+from app.services.task_handlers import PARSE_JOB_DESCRIPTION, IMPORT_JOB_APPLICATIONS
+from app.services.storage import store_blob
+from app.services.job_imports import IMPORT_FORMATS, set_duplicate_keys
+from app.services import dashboard_stats
+from app.services.parsed_sections import job_application_sections
+from app.services.deletion import delete_job_applications
+from app.services.archive import archived_detail, archived_page, archived_query
 
 router = APIRouter(
     prefix="/job-applications",
@@ -22,62 +39,17 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Background task to parse job description
-async def parse_job_description_task(db: Session, job_application_id: str, job_description: str):
-    """
-    Background task to parse a job description
-    """
-    try:
-        # Get the job application from the database
-        job_application = db.query(JobApplication).filter(JobApplication.id == job_application_id).first()
-        if not job_application:
-            return
-        
-        # Parse the job description
-        parsed_data = await OpenAIService.parse_job_description(job_description)
-        
-        # Save parsed data
-        job_application.parsed_job_details = parsed_data
-        
-        # Extract and store structured data
-        if "required_skills" in parsed_data:
-            for skill in parsed_data["required_skills"]:
-                requirement = JobRequirement(
-                    id=generate_uuid(),
-                    job_application_id=job_application_id,
-                    requirement=skill,
-                    type="required"
-                )
-                db.add(requirement)
-        
-        if "preferred_skills" in parsed_data:
-            for skill in parsed_data["preferred_skills"]:
-                requirement = JobRequirement(
-                    id=generate_uuid(),
-                    job_application_id=job_application_id,
-                    requirement=skill,
-                    type="preferred"
-                )
-                db.add(requirement)
-        
-        if "responsibilities" in parsed_data:
-            for resp in parsed_data["responsibilities"]:
-                responsibility = JobResponsibility(
-                    id=generate_uuid(),
-                    job_application_id=job_application_id,
-                    responsibility=resp
-                )
-                db.add(responsibility)
-        
-        db.commit()
-    except Exception as e:
-        # Just log the error and continue
-        print(f"Error parsing job description: {str(e)}")
+# Columns loaded when listing; the large ones are only loaded on request
+JOB_APPLICATION_LIST = ListProjection(
+    JobApplication,
+    summary=["id", "user_id", "job_title", "company_name", "job_url", "job_location", "salary_range",
+             "status", "applied_date", "description_snippet", "created_at", "updated_at"],
+    optional=["job_description", "notes", "parsed_job_details"]
+)
 
 @router.post("", response_model=JobApplicationSchema, status_code=status.HTTP_201_CREATED)
 async def create_job_application(
     job_application: JobApplicationCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -96,28 +68,29 @@ async def create_job_application(
         salary_range=job_application.salary_range,
         status=ApplicationStatus.PLANNING
     )
+    set_duplicate_keys(db_job_application)
     db.add(db_job_application)
+    dashboard_stats.record_application_created(db, db_job_application)
+    
+    # Queue the job description for parsing in the same transaction
+    TaskQueue.enqueue(db, PARSE_JOB_DESCRIPTION, {"job_application_id": db_job_application.id})
+    
     db.commit()
     db.refresh(db_job_application)
     
-    # Start background task to parse job description
-    background_tasks.add_task(
-        parse_job_description_task, 
-        db, 
-        db_job_application.id, 
-        job_application.job_description
-    )
-    
     return db_job_application
 
-@router.get("", response_model=List[JobApplicationSchema])
+@router.get("", response_model=Page[JobApplicationSummary], response_model_exclude_unset=True)
 def get_job_applications(
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include: job_description, notes, parsed_job_details"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
-    status: ApplicationStatus = None
+    status: ApplicationStatus = None,
+    include_archived: bool = Query(False, description="Also list archived applications")
 ):
     """
-    Get all job applications for the current user
+    Get the current user's job applications, newest first, one page at a time
     """
     query = db.query(JobApplication).filter(JobApplication.user_id == current_user.id)
     
@@ -125,52 +98,126 @@ def get_job_applications(
     if status:
         query = query.filter(JobApplication.status == status)
     
-    # Order by created_at desc
-    query = query.order_by(JobApplication.created_at.desc())
+    if not include_archived:
+        return JOB_APPLICATION_LIST.paginate(query, page, fields)
+    
+    # Fetch a page of each table from the same cursor and keep the newest
+    requested = JOB_APPLICATION_LIST.parse_fields(fields)
+    return merge_pages([
+        JOB_APPLICATION_LIST.paginate(query, page, fields),
+        archived_page(archived_query(db, current_user.id, status), page, requested)
+    ], page)
+
+@router.get("/stats", response_model=JobApplicationStats)
+def get_job_application_stats(
+    weeks: int = Query(settings.STATS_WEEKS, ge=1, le=520, description="Weeks of applied_by_week to include"),
+    companies: int = Query(settings.STATS_TOP_COMPANIES, ge=1, le=settings.MAX_PAGE_SIZE,
+                           description="Number of companies with the most applications to include"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get dashboard aggregates of the current user's job applications
+    """
+    return dashboard_stats.get_stats(db, current_user.id, weeks, companies)
+
+@router.post("/imports", response_model=JobApplicationImportSchema, status_code=status.HTTP_202_ACCEPTED)
+def create_job_application_import(
+    file: UploadFile,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Upload a CSV or JSONL file of job applications to import in the background.
+    Rows duplicating an existing application by URL or description are skipped.
+    """
+    file_format = IMPORT_FORMATS.get(os.path.splitext(file.filename or "")[1].lower())
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Imports must be one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    
+    # The file is stored as it streams in; rows are read by the import task
+    file_key, _ = store_blob(db, file.file, settings.MAX_IMPORT_UPLOAD_SIZE)
+    job_import = JobApplicationImport(
+        id=generate_uuid(),
+        user_id=current_user.id,
+        file_name=file.filename,
+        file_format=file_format,
+        file_key=file_key,
+        status="pending"
+    )
+    db.add(job_import)
+    TaskQueue.enqueue(db, IMPORT_JOB_APPLICATIONS, {"import_id": job_import.id})
+    db.commit()
+    db.refresh(job_import)
     
-    return query.all()
+    return job_import
+
+@router.get("/imports/{import_id}", response_model=JobApplicationImportSchema)
+def get_job_application_import(
+    import_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the progress of an import
+    """
+    job_import = db.query(JobApplicationImport).filter(
+        JobApplicationImport.id == import_id,
+        JobApplicationImport.user_id == current_user.id
+    ).first()
+    if job_import is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    return job_import
 
 @router.get("/{job_application_id}", response_model=JobApplicationDetail)
 def get_job_application(
     job_application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also look up archived applications")
 ):
     """
     Get a specific job application by ID
     """
-    job_application = db.query(JobApplication).filter(
+    job_application = db.query(JobApplication).options(undefer(JobApplication.parsed_sections)).filter(
         JobApplication.id == job_application_id,
         JobApplication.user_id == current_user.id
     ).first()
     
+    if job_application is None and include_archived:
+        archived = archived_detail(db, current_user.id, job_application_id)
+        if archived is not None:
+            return archived
+    
     if job_application is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
     
-    # Get requirements and responsibilities
-    requirements = db.query(JobRequirement).filter(
-        JobRequirement.job_application_id == job_application_id
-    ).all()
-    
-    responsibilities = db.query(JobResponsibility).filter(
-        JobResponsibility.job_application_id == job_application_id
-    ).all()
+    # Requirements and responsibilities, serialized when they were saved;
+    # an unparsed description has none, and applications parsed before
+    # that was stored load them from their tables
+    sections = job_application.parsed_sections
+    if sections is None:
+        if job_application.parsed_job_details is None:
+            sections = {"requirements": [], "responsibilities": []}
+        else:
+            sections = job_application_sections(db, job_application)
     
     # Build response
-    result = JobApplicationDetail.from_orm(job_application)
-    result.requirements = requirements
-    result.responsibilities = responsibilities
-    
-    return result
+    return JobApplicationDetail(**JobApplicationSchema.from_orm(job_application).dict(), **sections)
 
 @router.put("/{job_application_id}", response_model=JobApplicationSchema)
 def update_job_application(
     job_application_id: str,
     job_application_update: JobApplicationUpdate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -193,26 +240,27 @@ def update_job_application(
     if job_application_update.job_description and job_application_update.job_description != db_job_application.job_description:
         reparse_needed = True
     
+    counters_before = dashboard_stats.application_counters(db_job_application)
+    
     # Update job application fields
     for key, value in job_application_update.dict(exclude_unset=True).items():
         if value is not None:
             setattr(db_job_application, key, value)
     
+    set_duplicate_keys(db_job_application)
+    
     # If status is being updated to "applied", set applied_date
     if job_application_update.status == ApplicationStatus.APPLIED and db_job_application.applied_date is None:
         db_job_application.applied_date = datetime.now()
     
-    db.commit()
-    db.refresh(db_job_application)
+    dashboard_stats.record_application_updated(db, db_job_application, counters_before)
     
     # If job description was updated, reparse it
     if reparse_needed:
-        background_tasks.add_task(
-            parse_job_description_task, 
-            db, 
-            db_job_application.id, 
-            db_job_application.job_description
-        )
+        TaskQueue.enqueue(db, PARSE_JOB_DESCRIPTION, {"job_application_id": db_job_application.id})
+    
+    db.commit()
+    db.refresh(db_job_application)
     
     return db_job_application
 
@@ -225,27 +273,40 @@ def delete_job_application(
     """
     Delete a job application
     """
-    db_job_application = db.query(JobApplication).filter(
-        JobApplication.id == job_application_id,
-        JobApplication.user_id == current_user.id
-    ).first()
-    
-    if db_job_application is None:
+    # Children are deleted by the database
+    if not delete_job_applications(db, current_user.id, [job_application_id]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
-    
-    # Delete job application
-    db.delete(db_job_application)
     db.commit()
     
     return None
 
+@router.post("/bulk-delete", response_model=BulkDeleteResult)
+def bulk_delete_job_applications(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Delete many job applications in one request. IDs that are not found are skipped.
+    """
+    if len(request.ids) > settings.MAX_BULK_DELETE_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot delete more than {settings.MAX_BULK_DELETE_IDS} job applications at once"
+        )
+    
+    deleted = delete_job_applications(db, current_user.id, request.ids)
+    db.commit()
+    
+    return {"deleted": deleted}
+
 @router.get("/{job_application_id}/parsed", response_model=ParsedJobDetails)
 def get_parsed_job_details(
     job_application_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
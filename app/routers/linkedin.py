@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_db
 from app.models.user import User
 from app.models.job_application import JobApplication
 from app.models.linkedin import LinkedInMessage
@@ -14,7 +15,10 @@ from app.schemas.linkedin import (
     LinkedInMessageGenerateResponse,
     MessageType
 )
+from app.schemas.pagination import Page
 from app.utils.security import get_current_active_user, generate_uuid
+from app.utils.pagination import PageParams, merge_pages, paginate
+from app.services.archive import archived_artifact, archived_artifacts_page, archived_artifacts_query
 from app.services.linkedin_generator import LinkedInGenerator
 
 router = APIRouter(
@@ -26,17 +30,17 @@ router = APIRouter(
 @router.post("", response_model=LinkedInMessageSchema, status_code=status.HTTP_201_CREATED)
 async def create_linkedin_message(
     linkedin_message: LinkedInMessageCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Create a new LinkedIn message
     """
     # Check if job application exists and belongs to current user
-    job_application = db.query(JobApplication).filter(
+    job_application = await db.scalar(select(JobApplication).where(
         JobApplication.id == linkedin_message.job_application_id,
         JobApplication.user_id == current_user.id
-    ).first()
+    ))
     
     if job_application is None:
         raise HTTPException(
@@ -44,6 +48,9 @@ async def create_linkedin_message(
             detail="Job application not found"
         )
     
+    # Return the connection to the pool while the message is generated
+    await db.commit()
+    
     # Generate message
     if linkedin_message.message_type == MessageType.CONNECTION_REQUEST:
         message_result = await LinkedInGenerator.generate_connection_request(
@@ -67,6 +74,7 @@ async def create_linkedin_message(
     db_linkedin_message = LinkedInMessage(
         id=generate_uuid(),
         job_application_id=linkedin_message.job_application_id,
+        user_id=current_user.id,
         target_name=linkedin_message.target_name,
         target_title=linkedin_message.target_title,
         target_company=linkedin_message.target_company,
@@ -78,53 +86,62 @@ async def create_linkedin_message(
     )
     
     db.add(db_linkedin_message)
-    db.commit()
-    db.refresh(db_linkedin_message)
+    await db.commit()
+    await db.refresh(db_linkedin_message)
     
     return db_linkedin_message
 
-@router.get("", response_model=List[LinkedInMessageSchema])
+@router.get("", response_model=Page[LinkedInMessageSchema])
 def get_linkedin_messages(
     job_application_id: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also list the messages of archived applications")
 ):
     """
     Get LinkedIn messages, optionally filtered by job application
     """
-    query = db.query(LinkedInMessage).join(
-        JobApplication, 
-        LinkedInMessage.job_application_id == JobApplication.id
-    ).filter(
-        JobApplication.user_id == current_user.id
+    query = db.query(LinkedInMessage).filter(
+        LinkedInMessage.user_id == current_user.id
     )
     
     # Filter by job application if provided
     if job_application_id:
         query = query.filter(LinkedInMessage.job_application_id == job_application_id)
     
-    # Order by created_at desc
-    query = query.order_by(LinkedInMessage.created_at.desc())
+    if not include_archived:
+        return paginate(query, LinkedInMessage, page)
     
-    return query.all()
+    # Fetch a page of live and of archived messages from the same cursor and keep the newest
+    live = paginate(query, LinkedInMessage, page)
+    live["items"] = [LinkedInMessageSchema.from_orm(message).dict() for message in live["items"]]
+    archived = archived_artifacts_query(db, current_user.id, "linkedin_messages", job_application_id)
+    return merge_pages([
+        live,
+        archived_artifacts_page(db, archived, page, [column.key for column in LinkedInMessage.__table__.columns])
+    ], page)
 
 @router.get("/{linkedin_message_id}", response_model=LinkedInMessageSchema)
 def get_linkedin_message(
     linkedin_message_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also look up the messages of archived applications")
 ):
     """
     Get a specific LinkedIn message by ID
     """
-    linkedin_message = db.query(LinkedInMessage).join(
-        JobApplication, 
-        LinkedInMessage.job_application_id == JobApplication.id
-    ).filter(
+    linkedin_message = db.query(LinkedInMessage).filter(
         LinkedInMessage.id == linkedin_message_id,
-        JobApplication.user_id == current_user.id
+        LinkedInMessage.user_id == current_user.id
     ).first()
     
+    if linkedin_message is None and include_archived:
+        archived = archived_artifact(db, current_user.id, "linkedin_messages", linkedin_message_id)
+        if archived is not None:
+            return LinkedInMessageSchema(**archived)
+    
     if linkedin_message is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -143,12 +160,9 @@ def update_linkedin_message(
     """
     Update a LinkedIn message
     """
-    linkedin_message = db.query(LinkedInMessage).join(
-        JobApplication, 
-        LinkedInMessage.job_application_id == JobApplication.id
-    ).filter(
+    linkedin_message = db.query(LinkedInMessage).filter(
         LinkedInMessage.id == linkedin_message_id,
-        JobApplication.user_id == current_user.id
+        LinkedInMessage.user_id == current_user.id
     ).first()
     
     if linkedin_message is None:
@@ -176,12 +190,9 @@ def delete_linkedin_message(
     """
     Delete a LinkedIn message
     """
-    linkedin_message = db.query(LinkedInMessage).join(
-        JobApplication, 
-        LinkedInMessage.job_application_id == JobApplication.id
-    ).filter(
+    linkedin_message = db.query(LinkedInMessage).filter(
         LinkedInMessage.id == linkedin_message_id,
-        JobApplication.user_id == current_user.id
+        LinkedInMessage.user_id == current_user.id
     ).first()
     
     if linkedin_message is None:
@@ -199,7 +210,6 @@ def delete_linkedin_message(
 @router.post("/generate", response_model=LinkedInMessageGenerateResponse)
 async def generate_linkedin_message(
     request: LinkedInMessageGenerateRequest,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -235,12 +245,9 @@ def mark_linkedin_message_as_sent(
     """
     Mark a LinkedIn message as sent
     """
-    linkedin_message = db.query(LinkedInMessage).join(
-        JobApplication, 
-        LinkedInMessage.job_application_id == JobApplication.id
-    ).filter(
+    linkedin_message = db.query(LinkedInMessage).filter(
         LinkedInMessage.id == linkedin_message_id,
-        JobApplication.user_id == current_user.id
+        LinkedInMessage.user_id == current_user.id
     ).first()
     
     if linkedin_message is None:
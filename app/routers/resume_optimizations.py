@@ -1,24 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
 
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_db
 from app.models.user import User
-from app.models.job_application import JobApplication
-from app.models.resume import Resume
 from app.models.resume_optimization import ResumeOptimization, SkillMatch
 from app.schemas.resume_optimization import (
     ResumeOptimizationCreate,
     ResumeOptimizationUpdate,
     ResumeOptimization as ResumeOptimizationSchema,
+    ResumeOptimizationSummary,
     ResumeOptimizationDetail,
     ResumeOptimizationRequest,
     ResumeOptimizationResponse,
     Suggestion,
     SkillMatch as SkillMatchSchema
 )
+from app.schemas.pagination import Page
 from app.utils.security import get_current_active_user, generate_uuid
+from app.utils.pagination import PageParams, merge_pages
+from app.utils.projections import ListProjection
+from app.services.archive import archived_artifact, archived_artifacts_page, archived_artifacts_query
 from app.services.resume_optimizer import ResumeOptimizer
+from app.services.generation_context import load_generation_context
+from app.services import dashboard_stats
 
 router = APIRouter(
     prefix="/resume-optimizations",
@@ -26,60 +32,56 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Columns loaded when listing; the large ones are only loaded on request
+RESUME_OPTIMIZATION_LIST = ListProjection(
+    ResumeOptimization,
+    summary=["id", "job_application_id", "resume_id", "match_score", "created_at", "updated_at"],
+    optional=["suggestions"]
+)
+
 @router.post("", response_model=ResumeOptimizationSchema, status_code=status.HTTP_201_CREATED)
 async def create_resume_optimization(
     optimization: ResumeOptimizationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Create a new resume optimization
     """
-    # Check if job application exists and belongs to current user
-    job_application = db.query(JobApplication).filter(
-        JobApplication.id == optimization.job_application_id,
-        JobApplication.user_id == current_user.id
-    ).first()
+    # Load the job application and the resume in one query
+    context = await load_generation_context(db, current_user.id, optimization.job_application_id, optimization.resume_id)
     
-    if job_application is None:
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
     
-    # Check if resume exists and belongs to current user
-    resume = db.query(Resume).filter(
-        Resume.id == optimization.resume_id,
-        Resume.user_id == current_user.id,
-        Resume.parsed_status == "completed"
-    ).first()
-    
-    if resume is None:
+    if context.resume_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found or not fully parsed"
         )
     
+    # Return the connection to the pool while the suggestions are generated
+    await db.commit()
+    
     # Generate optimization suggestions
-    optimization_result = await ResumeOptimizer.optimize_resume(
-        resume_data=resume.parsed_content,
-        job_description=job_application.job_description
-    )
+    optimization_result = await ResumeOptimizer.optimize_for_context(context)
     
     # Create resume optimization record
     db_optimization = ResumeOptimization(
         id=generate_uuid(),
         job_application_id=optimization.job_application_id,
+        user_id=current_user.id,
         resume_id=optimization.resume_id,
         suggestions=optimization_result["suggestions"],
         match_score=optimization_result.get("match_score")
     )
     
     db.add(db_optimization)
-    db.commit()
-    db.refresh(db_optimization)
     
-    # Add skill matches if available
+    # Add skill matches if available, in the same transaction
     if "skill_matches" in optimization_result:
         for match in optimization_result["skill_matches"]:
             skill_match = SkillMatch(
@@ -91,30 +93,29 @@ async def create_resume_optimization(
                 suggestion=match.get("suggestion")
             )
             db.add(skill_match)
-        
-        db.commit()
+    
+    await db.run_sync(dashboard_stats.record_match_score, current_user.id, db_optimization.match_score)
+    
+    await db.commit()
+    await db.refresh(db_optimization)
     
     return db_optimization
 
-@router.get("", response_model=List[ResumeOptimizationSchema])
+@router.get("", response_model=Page[ResumeOptimizationSummary], response_model_exclude_unset=True)
 def get_resume_optimizations(
     job_application_id: Optional[str] = None,
     resume_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include: suggestions"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also list the resume optimizations of archived applications")
 ):
     """
     Get resume optimizations, optionally filtered by job application or resume
     """
-    query = db.query(ResumeOptimization).join(
-        JobApplication, 
-        ResumeOptimization.job_application_id == JobApplication.id
-    ).join(
-        Resume,
-        ResumeOptimization.resume_id == Resume.id
-    ).filter(
-        JobApplication.user_id == current_user.id,
-        Resume.user_id == current_user.id
+    query = db.query(ResumeOptimization).filter(
+        ResumeOptimization.user_id == current_user.id
     )
     
     # Filter by job application if provided
@@ -125,48 +126,45 @@ def get_resume_optimizations(
     if resume_id:
         query = query.filter(ResumeOptimization.resume_id == resume_id)
     
-    # Order by created_at desc
-    query = query.order_by(ResumeOptimization.created_at.desc())
+    if not include_archived:
+        return RESUME_OPTIMIZATION_LIST.paginate(query, page, fields)
     
-    return query.all()
+    # Fetch a page of live and of archived optimizations from the same cursor and keep the newest
+    requested = RESUME_OPTIMIZATION_LIST.parse_fields(fields)
+    archived = archived_artifacts_query(db, current_user.id, "resume_optimizations", job_application_id, resume_id)
+    return merge_pages([
+        RESUME_OPTIMIZATION_LIST.paginate(query, page, fields),
+        archived_artifacts_page(db, archived, page, [*RESUME_OPTIMIZATION_LIST.summary, *requested])
+    ], page)
 
 @router.get("/{optimization_id}", response_model=ResumeOptimizationDetail)
 def get_resume_optimization(
     optimization_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    include_archived: bool = Query(False, description="Also look up the resume optimizations of archived applications")
 ):
     """
     Get a specific resume optimization by ID
     """
-    optimization = db.query(ResumeOptimization).join(
-        JobApplication, 
-        ResumeOptimization.job_application_id == JobApplication.id
-    ).join(
-        Resume,
-        ResumeOptimization.resume_id == Resume.id
-    ).filter(
+    # Skill matches are loaded with a second query on their indexed foreign key
+    optimization = db.query(ResumeOptimization).options(selectinload(ResumeOptimization.skill_matches)).filter(
         ResumeOptimization.id == optimization_id,
-        JobApplication.user_id == current_user.id,
-        Resume.user_id == current_user.id
+        ResumeOptimization.user_id == current_user.id
     ).first()
     
+    if optimization is None and include_archived:
+        archived = archived_artifact(db, current_user.id, "resume_optimizations", optimization_id)
+        if archived is not None:
+            return ResumeOptimizationDetail(**archived)
+    
     if optimization is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume optimization not found"
         )
     
-    # Get skill matches
-    skill_matches = db.query(SkillMatch).filter(
-        SkillMatch.resume_optimization_id == optimization_id
-    ).all()
-    
-    # Build response
-    result = ResumeOptimizationDetail.from_orm(optimization)
-    result.skill_matches = skill_matches
-    
-    return result
+    return ResumeOptimizationDetail.from_orm(optimization)
 
 @router.delete("/{optimization_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_resume_optimization(
@@ -177,16 +175,9 @@ def delete_resume_optimization(
     """
     Delete a resume optimization
     """
-    optimization = db.query(ResumeOptimization).join(
-        JobApplication, 
-        ResumeOptimization.job_application_id == JobApplication.id
-    ).join(
-        Resume,
-        ResumeOptimization.resume_id == Resume.id
-    ).filter(
+    optimization = db.query(ResumeOptimization).filter(
         ResumeOptimization.id == optimization_id,
-        JobApplication.user_id == current_user.id,
-        Resume.user_id == current_user.id
+        ResumeOptimization.user_id == current_user.id
     ).first()
     
     if optimization is None:
@@ -196,6 +187,7 @@ def delete_resume_optimization(
         )
     
     # Delete resume optimization
+    dashboard_stats.record_match_score(db, current_user.id, optimization.match_score, -1)
     db.delete(optimization)
     db.commit()
     
@@ -204,41 +196,31 @@ def delete_resume_optimization(
 @router.post("/optimize", response_model=ResumeOptimizationResponse)
 async def optimize_resume(
     request: ResumeOptimizationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Generate resume optimization suggestions without saving them
     """
-    # Check if job application exists and belongs to current user
-    job_application = db.query(JobApplication).filter(
-        JobApplication.id == request.job_application_id,
-        JobApplication.user_id == current_user.id
-    ).first()
+    # Load the job application and the resume in one query
+    context = await load_generation_context(db, current_user.id, request.job_application_id, request.resume_id)
     
-    if job_application is None:
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job application not found"
         )
     
-    # Check if resume exists and belongs to current user
-    resume = db.query(Resume).filter(
-        Resume.id == request.resume_id,
-        Resume.user_id == current_user.id,
-        Resume.parsed_status == "completed"
-    ).first()
-    
-    if resume is None:
+    if context.resume_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found or not fully parsed"
         )
     
+    # Return the connection to the pool while the suggestions are generated
+    await db.commit()
+    
     # Generate optimization suggestions
-    optimization_result = await ResumeOptimizer.optimize_resume(
-        resume_data=resume.parsed_content,
-        job_description=job_application.job_description
-    )
+    optimization_result = await ResumeOptimizer.optimize_for_context(context)
     
     return optimization_result
\ No newline at end of file
@@ -1,16 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer
+from typing import Optional
 import json
 import os
+import tempfile
+import zipfile
 
-from app.database import get_db
+from app.config import settings
+
+from app.database import get_db, get_read_db
 from app.models.user import User
-from app.models.resume import Resume, ParsedEducation, ParsedExperience, ParsedSkill, ParsedProject
-from app.schemas.resume import Resume as ResumeSchema, ResumeUpdate, ParsedResumeContent
+from app.models.resume import Resume, ResumeBatch
+from app.schemas.resume import (
+    Resume as ResumeSchema,
+    ResumeSummary,
+    ResumeUpdate,
+    ParsedResumeContent,
+    ResumeBatch as ResumeBatchSchema,
+    ResumeBatchUpload,
+    RejectedFile
+)
+from app.schemas.bulk import BulkDeleteRequest, BulkDeleteResult
+from app.schemas.pagination import Page
 from app.utils.security import get_current_active_user, generate_uuid
-from app.utils.file_handlers import save_upload_file, remove_file
-from app.services.resume_parser import ResumeParser
+from app.utils.pagination import PageParams
+from app.utils.projections import ListProjection
+from app.utils.file_handlers import ALLOWED_EXTENSIONS, validate_upload_file, detect_file_type, copy_file
+from app.utils.file_responses import BlobResponse
+from app.services.storage import storage, store_blob, abandon_blobs
+from app.services.task_queue import TaskQueue
+from app.services.task_handlers import PARSE_RESUME, PARSE_RESUME_BULK, SWEEP_BLOBS
+from app.services.parsed_sections import resume_sections
+from app.services.deletion import delete_resumes
 
 router = APIRouter(
     prefix="/resumes",
@@ -18,97 +40,16 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Background task to parse resume
-async def parse_resume_task(db: Session, resume_id: str, file_path: str):
-    """
-    Background task to parse a resume
-    """
-    try:
-        # Get the resume from the database
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
-        if not resume:
-            return
-        
-        # Update resume status to processing
-        resume.parsed_status = "processing"
-        db.commit()
-        
-        # Parse the resume
-        parsed_data = await ResumeParser.parse_file(file_path)
-        
-        # Save parsed data
-        resume.parsed_content = parsed_data
-        resume.parsed_status = "completed"
-        
-        # Extract and store structured data
-        if "education" in parsed_data:
-            for edu in parsed_data["education"]:
-                parsed_education = ParsedEducation(
-                    id=generate_uuid(),
-                    resume_id=resume_id,
-                    institution=edu.get("institution", ""),
-                    degree=edu.get("degree", ""),
-                    field_of_study=edu.get("field_of_study"),
-                    start_date=edu.get("start_date"),
-                    end_date=edu.get("end_date"),
-                    description=edu.get("description")
-                )
-                db.add(parsed_education)
-        
-        if "experience" in parsed_data:
-            for exp in parsed_data["experience"]:
-                parsed_experience = ParsedExperience(
-                    id=generate_uuid(),
-                    resume_id=resume_id,
-                    company=exp.get("company", ""),
-                    title=exp.get("title", ""),
-                    location=exp.get("location"),
-                    start_date=exp.get("start_date"),
-                    end_date=exp.get("end_date"),
-                    description=exp.get("description")
-                )
-                db.add(parsed_experience)
-        
-        if "skills" in parsed_data:
-            for skill in parsed_data["skills"]:
-                parsed_skill = ParsedSkill(
-                    id=generate_uuid(),
-                    resume_id=resume_id,
-                    name=skill.get("name", ""),
-                    category=skill.get("category")
-                )
-                db.add(parsed_skill)
-        
-        if "projects" in parsed_data:
-            for project in parsed_data["projects"]:
-                technologies = project.get("technologies", [])
-                if technologies:
-                    technologies_str = ",".join(technologies)
-                else:
-                    technologies_str = None
-                
-                parsed_project = ParsedProject(
-                    id=generate_uuid(),
-                    resume_id=resume_id,
-                    name=project.get("name", ""),
-                    description=project.get("description"),
-                    start_date=project.get("start_date"),
-                    end_date=project.get("end_date"),
-                    technologies=technologies_str
-                )
-                db.add(parsed_project)
-        
-        db.commit()
-    except Exception as e:
-        # Update resume status to failed
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
-        if resume:
-            resume.parsed_status = "failed"
-            db.commit()
+# Columns loaded when listing; the large ones are only loaded on request
+RESUME_LIST = ListProjection(
+    Resume,
+    summary=["id", "user_id", "file_name", "file_key", "file_size", "file_type", "parsed_status",
+             "created_at", "updated_at"],
+    optional=["parsed_content"]
+)
 
 @router.post("", response_model=ResumeSchema, status_code=status.HTTP_201_CREATED)
-async def create_resume(
-    background_tasks: BackgroundTasks,
+def create_resume(
     file: UploadFile,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -116,48 +57,206 @@ async def create_resume(
     """
     Upload a new resume
     """
+    file_key = None
     try:
-        # Save uploaded file
-        file_path, file_type = save_upload_file(file, directory="resumes")
+        # Validate and store uploaded file
+        file_type = validate_upload_file(file)
+        file_key, file_size = store_blob(db, file.file)
         
         # Create resume record
         resume = Resume(
             id=generate_uuid(),
             user_id=current_user.id,
             file_name=file.filename,
-            file_path=file_path,
+            file_key=file_key,
+            file_size=file_size,
             file_type=file_type,
             parsed_status="pending"
         )
         db.add(resume)
-        db.commit()
-        db.refresh(resume)
         
-        # Start background task to parse resume
-        background_tasks.add_task(parse_resume_task, db, resume.id, file_path)
+        # Queue the resume for parsing in the same transaction
+        TaskQueue.enqueue(db, PARSE_RESUME, {"resume_id": resume.id})
         
-        return resume
+        db.commit()
     except Exception as e:
+        db.rollback()
+        # The file was written before the transaction failed
+        if file_key is not None:
+            abandon_blobs(db, [file_key])
+            TaskQueue.enqueue(db, SWEEP_BLOBS, {"keys": [file_key]})
+            db.commit()
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error uploading resume: {str(e)}"
         )
+    
+    db.refresh(resume)
+    return resume
 
-@router.get("", response_model=List[ResumeSchema])
-def get_user_resumes(
+def get_batch_progress(db: Session, batch: ResumeBatch) -> dict:
+    """
+    Aggregate the parse status of every resume in a batch
+    """
+    counts = dict(
+        db.query(Resume.parsed_status, func.count(Resume.id))
+        .filter(Resume.batch_id == batch.id)
+        .group_by(Resume.parsed_status)
+        .all()
+    )
+    return {
+        "id": batch.id,
+        "file_name": batch.file_name,
+        "total": batch.total,
+        "pending": counts.get("pending", 0),
+        "processing": counts.get("processing", 0),
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "created_at": batch.created_at
+    }
+
+@router.post("/bulk", response_model=ResumeBatchUpload, status_code=status.HTTP_201_CREATED)
+def create_resume_batch(
+    file: UploadFile,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get all resumes for the current user
+    Upload a zip archive of resumes and queue every parseable file for parsing
+    """
+    if os.path.splitext(file.filename or "")[1].lower() != ".zip":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk uploads must be a .zip archive"
+        )
+    
+    batch = ResumeBatch(id=generate_uuid(), user_id=current_user.id, file_name=file.filename)
+    resumes = []
+    rejected = []
+    
+    # Stream the archive to a temporary file and read entries one at a time,
+    # so neither the archive nor its contents are held in memory
+    with tempfile.TemporaryFile(dir=settings.UPLOAD_DIR) as archive_file:
+        copy_file(file.file, archive_file, settings.MAX_BULK_UPLOAD_SIZE)
+        archive_file.seek(0)
+        
+        try:
+            archive = zipfile.ZipFile(archive_file)
+        except zipfile.BadZipFile:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not a valid zip archive"
+            )
+        
+        with archive:
+            entries = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and not os.path.basename(info.filename).startswith(".")
+                and not info.filename.startswith("__MACOSX/")
+            ]
+            if len(entries) > settings.MAX_BULK_UPLOAD_FILES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Archive contains more than {settings.MAX_BULK_UPLOAD_FILES} files"
+                )
+            
+            try:
+                for info in entries:
+                    file_name = os.path.basename(info.filename)
+                    try:
+                        with archive.open(info) as entry:
+                            file_type = detect_file_type(file_name, entry)
+                            file_key, file_size = store_blob(db, entry)
+                    except HTTPException as e:
+                        rejected.append(RejectedFile(file_name=info.filename, error=str(e.detail)))
+                        continue
+                    except Exception as e:
+                        rejected.append(RejectedFile(file_name=info.filename, error=f"Could not read file: {str(e)}"))
+                        continue
+                    
+                    resumes.append(Resume(
+                        id=generate_uuid(),
+                        user_id=current_user.id,
+                        batch_id=batch.id,
+                        file_name=file_name,
+                        file_key=file_key,
+                        file_size=file_size,
+                        file_type=file_type,
+                        parsed_status="pending"
+                    ))
+                
+                if not resumes:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="No parseable resumes found in the archive"
+                    )
+                
+                # Insert the batch, its resumes and their parse tasks in one transaction
+                batch.total = len(resumes)
+                db.add(batch)
+                # Nothing maps resumes to their batch, so insert the batch before the rows referencing it
+                db.flush()
+                db.add_all(resumes)
+                for resume in resumes:
+                    TaskQueue.enqueue(db, PARSE_RESUME_BULK, {"resume_id": resume.id})
+                db.commit()
+            except Exception:
+                db.rollback()
+                # The files were written before the transaction failed
+                file_keys = [resume.file_key for resume in resumes]
+                if file_keys:
+                    abandon_blobs(db, file_keys)
+                    TaskQueue.enqueue(db, SWEEP_BLOBS, {"keys": sorted(set(file_keys))})
+                    db.commit()
+                raise
+    
+    db.refresh(batch)
+    return {
+        **get_batch_progress(db, batch),
+        "resume_ids": [resume.id for resume in resumes],
+        "rejected": rejected
+    }
+
+@router.get("/batches/{batch_id}", response_model=ResumeBatchSchema)
+def get_resume_batch(
+    batch_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the parsing progress of a bulk upload
+    """
+    batch = db.query(ResumeBatch).filter(
+        ResumeBatch.id == batch_id,
+        ResumeBatch.user_id == current_user.id
+    ).first()
+    if batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume batch not found"
+        )
+    return get_batch_progress(db, batch)
+
+@router.get("", response_model=Page[ResumeSummary], response_model_exclude_unset=True)
+def get_user_resumes(
+    page: PageParams = Depends(),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include: parsed_content"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the current user's resumes, newest first, one page at a time
     """
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
-    return resumes
+    query = db.query(Resume).filter(Resume.user_id == current_user.id)
+    return RESUME_LIST.paginate(query, page, fields)
 
 @router.get("/{resume_id}", response_model=ResumeSchema)
 def get_resume(
     resume_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -171,16 +270,62 @@ def get_resume(
         )
     return resume
 
+@router.get(
+    "/{resume_id}/file",
+    response_class=BlobResponse,
+    responses={
+        200: {"description": "The uploaded file"},
+        206: {"description": "Part of the uploaded file"},
+        304: {"description": "Not modified"},
+        416: {"description": "Range not satisfiable"},
+    }
+)
+def download_resume_file(
+    resume_id: str,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Download the original file of a resume.
+
+    Supports If-None-Match (the ETag is the content hash of the file) and
+    single byte ranges, so PDF viewers can fetch pages incrementally.
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+    if resume is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    if resume.file_key is None or not storage.exists(resume.file_key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume file not found"
+        )
+
+    return BlobResponse(
+        storage,
+        resume.file_key,
+        resume.file_size,
+        request.headers,
+        media_type=ALLOWED_EXTENSIONS.get(resume.file_type, "application/octet-stream"),
+        filename=resume.file_name
+    )
+
 @router.get("/{resume_id}/parsed", response_model=ParsedResumeContent)
 def get_parsed_resume_content(
     resume_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get parsed content of a specific resume
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
+    resume = db.query(Resume).options(undefer(Resume.parsed_sections)).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
     if resume is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -197,18 +342,15 @@ def get_parsed_resume_content(
     # Get parsed data
     parsed_content = resume.parsed_content
     
-    # Get structured data
-    educations = db.query(ParsedEducation).filter(ParsedEducation.resume_id == resume_id).all()
-    experiences = db.query(ParsedExperience).filter(ParsedExperience.resume_id == resume_id).all()
-    skills = db.query(ParsedSkill).filter(ParsedSkill.resume_id == resume_id).all()
-    projects = db.query(ParsedProject).filter(ParsedProject.resume_id == resume_id).all()
+    # Structured data, serialized when it was saved; resumes parsed before
+    # that was stored load it from the structured tables
+    sections = resume.parsed_sections
+    if sections is None:
+        sections = resume_sections(db, resume)
     
     # Build response
     return {
-        "educations": educations,
-        "experiences": experiences,
-        "skills": skills,
-        "projects": projects,
+        **sections,
         "contact_info": parsed_content.get("contact_info", {}),
         "summary": parsed_content.get("summary")
     }
@@ -222,19 +364,32 @@ def delete_resume(
     """
     Delete a resume
     """
-    resume = db.query(Resume).filter(Resume.id == resume_id, Resume.user_id == current_user.id).first()
-    if resume is None:
+    # Parsed rows are deleted by the database and the file by the blob sweep task
+    if not delete_resumes(db, current_user.id, [resume_id]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found"
         )
+    db.commit()
     
-    # Delete file
-    if resume.file_path and os.path.exists(resume.file_path):
-        remove_file(resume.file_path)
+    return None
+
+@router.post("/bulk-delete", response_model=BulkDeleteResult)
+def bulk_delete_resumes(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Delete many resumes in one request. IDs that are not found are skipped.
+    """
+    if len(request.ids) > settings.MAX_BULK_DELETE_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot delete more than {settings.MAX_BULK_DELETE_IDS} resumes at once"
+        )
     
-    # Delete resume record
-    db.delete(resume)
+    deleted = delete_resumes(db, current_user.id, request.ids)
     db.commit()
     
-    return None
\ No newline at end of file
+    return {"deleted": deleted}
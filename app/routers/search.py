@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.database import get_read_db
+from app.models.user import User
+from app.schemas.pagination import Page
+from app.schemas.search import SearchKind, SearchResult
+from app.utils.security import get_current_active_user
+from app.utils.pagination import PageParams
+from app.services import search as search_service
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+)
+
+@router.get("", response_model=Page[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for; all must match"),
+    kind: Optional[List[SearchKind]] = Query(None, description="Only search these kinds of documents"),
+    page: PageParams = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Search the current user's job applications, cover letters and LinkedIn
+    messages, best match first
+    """
+    kinds = [k.value for k in kind] if kind else None
+    return search_service.search(db, current_user.id, q, page, kinds)
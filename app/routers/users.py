@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.database import get_db
+from app.database import get_read_db, get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, User as UserSchema
-from app.utils.security import get_current_active_user, get_password_hash, generate_uuid
+from app.utils.security import get_current_active_user, hash_password, generate_uuid
+from app.utils.user_cache import user_cache
 
 router = APIRouter(
     prefix="/users",
@@ -14,12 +17,12 @@ router = APIRouter(
 )
 
 @router.post("", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user
     """
     # Check if email already exists
-    db_user_email = db.query(User).filter(User.email == user.email).first()
+    db_user_email = await db.scalar(select(User).where(User.email == user.email))
     if db_user_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,7 +30,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username already exists
-    db_user_username = db.query(User).filter(User.username == user.username).first()
+    db_user_username = await db.scalar(select(User).where(User.username == user.username))
     if db_user_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,7 +38,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(
         id=generate_uuid(),
         email=user.email,
@@ -45,8 +48,8 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         last_name=user.last_name,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.get("/me", response_model=UserSchema)
@@ -57,9 +60,9 @@ def read_user_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -67,7 +70,7 @@ def update_user_me(
     """
     # Check if email is being changed and already exists
     if user_update.email and user_update.email != current_user.email:
-        db_user = db.query(User).filter(User.email == user_update.email).first()
+        db_user = await db.scalar(select(User).where(User.email == user_update.email))
         if db_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,30 +79,37 @@ def update_user_me(
     
     # Check if username is being changed and already exists
     if user_update.username and user_update.username != current_user.username:
-        db_user = db.query(User).filter(User.username == user_update.username).first()
+        db_user = await db.scalar(select(User).where(User.username == user_update.username))
         if db_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken",
             )
     
+    # The current user may be a cached snapshot; update the row through this session
+    username = current_user.username
+    current_user = await db.get(User, current_user.id)
+    
     # Update user fields
     for key, value in user_update.dict(exclude_unset=True).items():
         if key == "password":
-            setattr(current_user, "hashed_password", get_password_hash(value))
+            setattr(current_user, "hashed_password", await hash_password(value))
         elif key in ["preferred_job_titles", "preferred_locations", "skill_keywords"] and value is not None:
             setattr(current_user, key, ",".join(value))
         else:
             setattr(current_user, key, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    
+    # Drop cached snapshots so the change applies to the next request
+    user_cache.invalidate(username)
     return current_user
 
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import List
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[str]
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[str]  # IDs that were deleted; IDs not found are left out
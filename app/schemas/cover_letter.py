@@ -35,6 +35,18 @@ class CoverLetter(CoverLetterBase):
         orm_mode = True
         from_attributes = True
 
+class CoverLetterSummary(BaseModel):
+    id: str
+    job_application_id: str
+    tone: Optional[ToneType] = None
+    content_snippet: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Only included when requested with `fields`
+    content: Optional[str] = None
+    generation_params: Optional[Dict[str, Any]] = None
+
 # Cover letter generation request schema
 class CoverLetterGenerateRequest(BaseModel):
     job_application_id: str
@@ -86,9 +86,38 @@ class JobApplication(JobApplicationBase):
         orm_mode = True
         from_attributes = True
 
+class JobApplicationSummary(BaseModel):
+    id: str
+    user_id: str
+    job_title: str
+    company_name: str
+    job_url: Optional[str] = None
+    job_location: Optional[str] = None
+    salary_range: Optional[str] = None
+    status: ApplicationStatus
+    applied_date: Optional[datetime] = None
+    description_snippet: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None  # Only set on archived applications
+
+    # Only included when requested with `fields`
+    job_description: Optional[str] = None
+    notes: Optional[str] = None
+    parsed_job_details: Optional[Dict[str, Any]] = None
+
 class JobApplicationDetail(JobApplication):
     requirements: List[Requirement] = []
     responsibilities: List[Responsibility] = []
+    archived_at: Optional[datetime] = None
+
+class JobApplicationStats(BaseModel):
+    total: int = 0
+    by_status: Dict[str, int] = {}
+    applied_by_week: Dict[str, int] = {}  # Keyed by the ISO date of the week's Monday
+    by_company: Dict[str, int] = {}
+    scored_optimizations: int = 0
+    average_match_score: Optional[float] = None
 
 # Parsed job details schema
 class ParsedJobDetails(BaseModel):
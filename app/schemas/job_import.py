@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+from app.schemas.job_application import JobApplicationCreate, ApplicationStatus
+
+class JobApplicationImportRow(JobApplicationCreate):
+    """
+    One row of an imported file
+    """
+    status: Optional[ApplicationStatus] = None
+    applied_date: Optional[datetime] = None
+    notes: Optional[str] = None
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based number of the data row, not counting a CSV header
+    error: str
+
+class JobApplicationImport(BaseModel):
+    id: str
+    file_name: str
+    file_format: str
+    status: str
+    processed: int = 0
+    created: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
@@ -102,7 +102,8 @@ class ResumeUpdate(BaseModel):
 class Resume(ResumeBase):
     id: str
     user_id: str
-    file_path: str
+    file_key: Optional[str] = None  # None if the file was missing when uploads moved to blob storage
+    file_size: Optional[int] = None
     parsed_status: str
     parsed_content: Optional[Dict[str, Any]] = None
     created_at: datetime
@@ -112,6 +113,37 @@ class Resume(ResumeBase):
         orm_mode = True
         from_attributes = True
 
+class ResumeSummary(ResumeBase):
+    id: str
+    user_id: str
+    file_key: Optional[str] = None
+    file_size: Optional[int] = None
+    parsed_status: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Only included when requested with `fields`
+    parsed_content: Optional[Dict[str, Any]] = None
+
+# Bulk upload schemas
+class RejectedFile(BaseModel):
+    file_name: str
+    error: str
+
+class ResumeBatch(BaseModel):
+    id: str
+    file_name: str
+    total: int
+    pending: int = 0
+    processing: int = 0
+    completed: int = 0
+    failed: int = 0
+    created_at: datetime
+
+class ResumeBatchUpload(ResumeBatch):
+    resume_ids: List[str] = []
+    rejected: List[RejectedFile] = []
+
 class ParsedResumeContent(BaseModel):
     educations: Optional[List[Education]] = []
     experiences: Optional[List[Experience]] = []
@@ -62,6 +62,15 @@ class ResumeOptimization(ResumeOptimizationBase):
         orm_mode = True
         from_attributes = True
 
+class ResumeOptimizationSummary(ResumeOptimizationBase):
+    id: str
+    match_score: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    # Only included when requested with `fields`
+    suggestions: Optional[List[Suggestion]] = None
+
 class ResumeOptimizationDetail(ResumeOptimization):
     skill_matches: List[SkillMatch] = []
 
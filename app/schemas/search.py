@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from enum import Enum
+
+class SearchKind(str, Enum):
+    JOB_APPLICATION = "job_application"
+    COVER_LETTER = "cover_letter"
+    LINKEDIN_MESSAGE = "linkedin_message"
+
+class SearchResult(BaseModel):
+    kind: SearchKind
+    id: str
+    job_application_id: str
+    score: float  # Higher is a better match
+    snippet: Optional[str] = None  # HTML-escaped text around the match, matches wrapped in <mark>
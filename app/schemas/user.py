@@ -62,4 +62,5 @@ class Token(BaseModel):
 
 # Token data schema
 class TokenData(BaseModel):
-    username: Optional[str] = None
\ No newline at end of file
+    username: Optional[str] = None
+    token_id: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,281 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, insert, literal, null, select
+from sqlalchemy.orm import Query, Session, load_only, selectinload, undefer
+
+from app.models.archive import ArchivedArtifact, ArchivedJobApplication
+from app.models.cover_letter import CoverLetter
+from app.models.job_application import ApplicationStatus, JobApplication
+from app.models.linkedin import LinkedInMessage
+from app.models.resume_optimization import ResumeOptimization
+from app.schemas.job_application import JobApplicationDetail
+from app.utils.pagination import PageParams, paginate
+
+# Statuses an application does not leave, and can be archived in
+ARCHIVED_STATUSES = [ApplicationStatus.REJECTED, ApplicationStatus.DECLINED, ApplicationStatus.ACCEPTED]
+
+# Columns of an archived application loaded when listing
+ARCHIVED_SUMMARY = ["id", "user_id", "job_title", "company_name", "job_url", "job_location", "salary_range",
+                    "status", "applied_date", "description_snippet", "created_at", "updated_at", "archived_at"]
+
+# Columns of a job application not kept in its archive document: derived
+# from the rows archived with it
+UNARCHIVED_COLUMNS = {"parsed_sections"}
+
+# Rows generated for a job application that can still be listed once it is
+# archived, by their key in the archive document
+ARCHIVED_ARTIFACTS = {
+    "cover_letters": CoverLetter,
+    "linkedin_messages": LinkedInMessage,
+    "resume_optimizations": ResumeOptimization,
+}
+
+# Listed columns computed by the database rather than stored in the document
+DERIVED_COLUMNS = {
+    "content_snippet": lambda row: row["content"][:200] if row.get("content") is not None else None,
+}
+
+def row_document(row: Any, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Every column of a row, JSON-encoded
+    """
+    return jsonable_encoder({
+        column.key: getattr(row, column.key)
+        for column in row.__table__.columns
+        if column.key not in exclude
+    })
+
+def archive_document(job_application: JobApplication) -> Dict[str, Any]:
+    """
+    A job application and every row it owns, as stored in its archive row
+    """
+    return {
+        "job_application": row_document(job_application, UNARCHIVED_COLUMNS),
+        "requirements": [row_document(row) for row in job_application.requirements],
+        "responsibilities": [row_document(row) for row in job_application.responsibilities],
+        "linkedin_messages": [row_document(row) for row in job_application.linkedin_messages],
+        "cover_letters": [row_document(row) for row in job_application.cover_letters],
+        "resume_optimizations": [
+            {**row_document(row), "skill_matches": [row_document(match) for match in row.skill_matches]}
+            for row in job_application.resume_optimizations
+        ],
+    }
+
+def archive_row(job_application: JobApplication) -> Dict[str, Any]:
+    scores = [row.match_score for row in job_application.resume_optimizations if row.match_score is not None]
+    description = job_application.job_description
+    return {
+        "id": job_application.id,
+        "user_id": job_application.user_id,
+        "job_title": job_application.job_title,
+        "company_name": job_application.company_name,
+        "job_url": job_application.job_url,
+        "job_location": job_application.job_location,
+        "salary_range": job_application.salary_range,
+        "status": job_application.status,
+        "applied_date": job_application.applied_date,
+        "description_snippet": description[:200] if description is not None else None,
+        "created_at": job_application.created_at,
+        "updated_at": job_application.updated_at,
+        "scored_optimizations": len(scores),
+        "match_score_total": float(sum(scores)),
+        "document": archive_document(job_application),
+    }
+
+def archive_job_applications(
+    db: Session,
+    older_than: timedelta,
+    batch_size: int,
+    user_ids: Optional[Sequence[str]] = None
+) -> int:
+    """
+    Move job applications that have been in a terminal status for longer
+    than older_than into the archive, one committed batch at a time. Their
+    rows are deleted from the job application tables, and from the search
+    index, through ON DELETE CASCADE. The dashboard aggregates still count
+    them, so they are left as they are.
+
+    Args:
+        db: Database session
+        older_than: Time since an application was last updated after which it is archived
+        batch_size: Number of applications archived per transaction
+        user_ids: Users whose applications are archived; every user if None
+
+    Returns:
+        Number of archived job applications
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    candidates = db.query(JobApplication).options(
+        selectinload(JobApplication.requirements),
+        selectinload(JobApplication.responsibilities),
+        selectinload(JobApplication.linkedin_messages),
+        selectinload(JobApplication.cover_letters),
+        selectinload(JobApplication.resume_optimizations).selectinload(ResumeOptimization.skill_matches),
+    ).filter(
+        JobApplication.status.in_(ARCHIVED_STATUSES),
+        func.coalesce(JobApplication.updated_at, JobApplication.created_at) < cutoff
+    )
+    if user_ids is not None:
+        candidates = candidates.filter(JobApplication.user_id.in_(user_ids))
+
+    archived = 0
+    while True:
+        # Archived applications are deleted, so each batch starts over
+        batch = candidates.order_by(JobApplication.id).limit(batch_size).all()
+        if not batch:
+            break
+        ids = [job_application.id for job_application in batch]
+        db.execute(insert(ArchivedJobApplication), [archive_row(job_application) for job_application in batch])
+        # Copy created_at as stored rather than as bound from Python, which
+        # SQLite formats differently, so archived and live applications page together
+        db.query(ArchivedJobApplication).filter(ArchivedJobApplication.id.in_(ids)).update(
+            {ArchivedJobApplication.created_at: select(JobApplication.created_at).where(
+                JobApplication.id == ArchivedJobApplication.id
+            ).scalar_subquery()},
+            synchronize_session=False
+        )
+        for kind, model in ARCHIVED_ARTIFACTS.items():
+            db.execute(insert(ArchivedArtifact).from_select(
+                ["id", "kind", "job_application_id", "user_id", "resume_id", "created_at"],
+                select(
+                    model.id, literal(kind), model.job_application_id, model.user_id,
+                    getattr(model, "resume_id", null()), model.created_at
+                ).where(model.job_application_id.in_(ids))
+            ))
+        db.query(JobApplication).filter(JobApplication.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+        archived += len(batch)
+        if len(batch) < batch_size:
+            break
+    return archived
+
+def archived_query(db: Session, user_id: str, status: Optional[ApplicationStatus] = None) -> Query:
+    query = db.query(ArchivedJobApplication).filter(ArchivedJobApplication.user_id == user_id)
+    if status:
+        query = query.filter(ArchivedJobApplication.status == status)
+    return query
+
+def archived_page(query: Query, params: PageParams, fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Get one page of archived job applications, serialized like the job
+    application list. Documents are only decoded when fields are requested
+    from them.
+
+    Args:
+        query: Filtered query of the archived applications to list
+        params: Cursor and page size
+        fields: Parsed optional fields to include
+
+    Returns:
+        Page with the serialized items and the cursor of the next page
+    """
+    columns = [getattr(ArchivedJobApplication, name) for name in ARCHIVED_SUMMARY]
+    query = query.options(load_only(*columns))
+    if fields:
+        query = query.options(undefer(ArchivedJobApplication.document))
+
+    result = paginate(query, ArchivedJobApplication, params)
+    items: List[Dict[str, Any]] = []
+    for archived in result["items"]:
+        item = {name: getattr(archived, name) for name in ARCHIVED_SUMMARY}
+        if fields:
+            job_application = archived.document["job_application"]
+            item.update({name: job_application.get(name) for name in fields})
+        items.append(item)
+    result["items"] = items
+    return result
+
+def archived_detail(db: Session, user_id: str, job_application_id: str) -> Optional[JobApplicationDetail]:
+    """
+    Rehydrate an archived job application as the detail endpoint returns it
+
+    Returns:
+        The job application with its requirements and responsibilities, or None if it is not archived
+    """
+    archived = db.query(ArchivedJobApplication).options(undefer(ArchivedJobApplication.document)).filter(
+        ArchivedJobApplication.id == job_application_id,
+        ArchivedJobApplication.user_id == user_id
+    ).first()
+    if archived is None:
+        return None
+
+    document = archived.document
+    return JobApplicationDetail(
+        **document["job_application"],
+        requirements=document["requirements"],
+        responsibilities=document["responsibilities"],
+        archived_at=archived.archived_at
+    )
+
+def archived_artifacts_query(
+    db: Session,
+    user_id: str,
+    kind: str,
+    job_application_id: Optional[str] = None,
+    resume_id: Optional[str] = None
+) -> Query:
+    query = db.query(ArchivedArtifact).filter(ArchivedArtifact.user_id == user_id, ArchivedArtifact.kind == kind)
+    if job_application_id:
+        query = query.filter(ArchivedArtifact.job_application_id == job_application_id)
+    if resume_id:
+        query = query.filter(ArchivedArtifact.resume_id == resume_id)
+    return query
+
+def archived_artifact_rows(db: Session, artifacts: Sequence[ArchivedArtifact]) -> List[Dict[str, Any]]:
+    """
+    Read archived artifacts from the documents of their applications, each
+    decoded once. created_at is taken from the index, so the rows sort
+    with the live ones.
+    """
+    job_application_ids = {artifact.job_application_id for artifact in artifacts}
+    documents = dict(db.query(ArchivedJobApplication.id, ArchivedJobApplication.document).filter(
+        ArchivedJobApplication.id.in_(job_application_ids)
+    ).all()) if job_application_ids else {}
+
+    rows = []
+    for artifact in artifacts:
+        row = next(row for row in documents[artifact.job_application_id][artifact.kind] if row["id"] == artifact.id)
+        rows.append({**row, "created_at": artifact.created_at})
+    return rows
+
+def archived_artifacts_page(db: Session, query: Query, params: PageParams, columns: Sequence[str]) -> Dict[str, Any]:
+    """
+    Get one page of the cover letters, LinkedIn messages or resume
+    optimizations of archived job applications, serialized like their list.
+    Only the documents of the applications on the page are decoded.
+
+    Args:
+        db: Database session
+        query: Filtered query of the archived artifacts to list
+        params: Cursor and page size
+        columns: Columns to include in each item
+
+    Returns:
+        Page with the serialized items and the cursor of the next page
+    """
+    result = paginate(query, ArchivedArtifact, params)
+    result["items"] = [
+        {name: DERIVED_COLUMNS[name](row) if name in DERIVED_COLUMNS else row.get(name) for name in columns}
+        for row in archived_artifact_rows(db, result["items"])
+    ]
+    return result
+
+def archived_artifact(db: Session, user_id: str, kind: str, artifact_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Rehydrate a cover letter, LinkedIn message or resume optimization of an
+    archived job application
+
+    Returns:
+        The row as it was archived, or None if it is not archived
+    """
+    artifact = db.query(ArchivedArtifact).filter(
+        ArchivedArtifact.id == artifact_id,
+        ArchivedArtifact.user_id == user_id,
+        ArchivedArtifact.kind == kind
+    ).first()
+    if artifact is None:
+        return None
+    return archived_artifact_rows(db, [artifact])[0]
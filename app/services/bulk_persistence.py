@@ -0,0 +1,148 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.resume import ParsedEducation, ParsedExperience, ParsedSkill, ParsedProject
+from app.models.job_application import JobRequirement, JobResponsibility
+from app.utils.security import generate_uuid
+
+RowsByModel = Dict[Any, List[Dict[str, Any]]]
+
+def build_resume_rows(resume_id: str, parsed_data: Dict[str, Any]) -> RowsByModel:
+    """
+    Build the rows of the structured resume tables from parsed resume data
+
+    Args:
+        resume_id: ID of the parsed resume
+        parsed_data: Data returned by ResumeParser
+
+    Returns:
+        Rows to insert, keyed by model
+    """
+    rows = {
+        ParsedEducation: [
+            {
+                "id": generate_uuid(),
+                "resume_id": resume_id,
+                "institution": edu.get("institution", ""),
+                "degree": edu.get("degree", ""),
+                "field_of_study": edu.get("field_of_study"),
+                "start_date": edu.get("start_date"),
+                "end_date": edu.get("end_date"),
+                "description": edu.get("description")
+            }
+            for edu in parsed_data.get("education") or []
+        ],
+        ParsedExperience: [
+            {
+                "id": generate_uuid(),
+                "resume_id": resume_id,
+                "company": exp.get("company", ""),
+                "title": exp.get("title", ""),
+                "location": exp.get("location"),
+                "start_date": exp.get("start_date"),
+                "end_date": exp.get("end_date"),
+                "description": exp.get("description")
+            }
+            for exp in parsed_data.get("experience") or []
+        ],
+        ParsedSkill: [
+            {
+                "id": generate_uuid(),
+                "resume_id": resume_id,
+                "name": skill.get("name", ""),
+                "category": skill.get("category")
+            }
+            for skill in parsed_data.get("skills") or []
+        ],
+        ParsedProject: [
+            {
+                "id": generate_uuid(),
+                "resume_id": resume_id,
+                "name": project.get("name", ""),
+                "description": project.get("description"),
+                "start_date": project.get("start_date"),
+                "end_date": project.get("end_date"),
+                "technologies": ",".join(project.get("technologies") or []) or None
+            }
+            for project in parsed_data.get("projects") or []
+        ],
+    }
+    return rows
+
+def build_job_rows(job_application_id: str, parsed_data: Dict[str, Any]) -> RowsByModel:
+    """
+    Build the requirement and responsibility rows from a parsed job description
+
+    Args:
+        job_application_id: ID of the job application
+        parsed_data: Data returned by OpenAIService.parse_job_description
+
+    Returns:
+        Rows to insert, keyed by model
+    """
+    requirements = [
+        {
+            "id": generate_uuid(),
+            "job_application_id": job_application_id,
+            "requirement": skill,
+            "type": requirement_type
+        }
+        for key, requirement_type in (("required_skills", "required"), ("preferred_skills", "preferred"))
+        for skill in parsed_data.get(key) or []
+    ]
+    responsibilities = [
+        {
+            "id": generate_uuid(),
+            "job_application_id": job_application_id,
+            "responsibility": responsibility
+        }
+        for responsibility in parsed_data.get("responsibilities") or []
+    ]
+    return {JobRequirement: requirements, JobResponsibility: responsibilities}
+
+def bulk_insert(db: Session, rows_by_model: RowsByModel) -> None:
+    """
+    Insert rows with one multi-row statement per table, bypassing the ORM
+    unit of work. The inserts are not committed.
+
+    Args:
+        db: Database session
+        rows_by_model: Rows to insert, keyed by model. All rows of a model
+            must have the same keys.
+    """
+    for model, rows in rows_by_model.items():
+        if rows:
+            db.execute(insert(model.__table__), rows)
+
+def replace_rows(db: Session, foreign_key, rows_by_model: RowsByModel, parent_id: str) -> RowsByModel:
+    """
+    Delete the existing child rows of a parent and bulk insert new ones,
+    so re-parsing or retrying a task leaves a single set of rows.
+
+    Args:
+        db: Database session
+        foreign_key: Name of the column that references the parent
+        rows_by_model: Rows to insert, keyed by model
+        parent_id: ID of the parent row
+
+    Returns:
+        The inserted rows
+    """
+    for model in rows_by_model:
+        db.query(model).filter(getattr(model, foreign_key) == parent_id).delete(synchronize_session=False)
+    bulk_insert(db, rows_by_model)
+    return rows_by_model
+
+def replace_resume_rows(db: Session, resume_id: str, parsed_data: Dict[str, Any]) -> RowsByModel:
+    """
+    Replace the structured rows of a resume with freshly parsed data
+    """
+    return replace_rows(db, "resume_id", build_resume_rows(resume_id, parsed_data), resume_id)
+
+def replace_job_rows(db: Session, job_application_id: str, parsed_data: Dict[str, Any]) -> RowsByModel:
+    """
+    Replace the requirement and responsibility rows of a job application
+    """
+    return replace_rows(db, "job_application_id", build_job_rows(job_application_id, parsed_data), job_application_id)
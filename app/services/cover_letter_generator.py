@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, List
 from app.services.openai_service import OpenAIService
+from app.services.generation_context import GenerationContext
 
 class CoverLetterGenerator:
     """
@@ -48,4 +49,40 @@ class CoverLetterGenerator:
             emphasized_experiences=emphasized_experiences,
             personal_note=personal_note,
             portfolio_url=portfolio_url
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    async def generate_for_context(
+        context: GenerationContext,
+        tone: str = "professional",
+        emphasized_projects: Optional[List[str]] = None,
+        emphasized_skills: Optional[List[str]] = None,
+        emphasized_experiences: Optional[List[str]] = None,
+        personal_note: Optional[str] = None
+    ) -> str:
+        """
+        Generate a cover letter from a loaded generation context
+        
+        Args:
+            context: Job application, resume and portfolio URL
+            tone: Tone of the cover letter (formal, friendly, enthusiastic, etc.)
+            emphasized_projects: List of projects to emphasize
+            emphasized_skills: List of skills to emphasize
+            emphasized_experiences: List of experiences to emphasize
+            personal_note: Additional context from the user
+            
+        Returns:
+            Generated cover letter text
+        """
+        return await CoverLetterGenerator.generate_cover_letter(
+            resume_data=context.resume_data,
+            job_description=context.job_description,
+            company_name=context.company_name,
+            job_title=context.job_title,
+            tone=tone,
+            emphasized_projects=emphasized_projects,
+            emphasized_skills=emphasized_skills,
+            emphasized_experiences=emphasized_experiences,
+            personal_note=personal_note,
+            portfolio_url=context.portfolio_url
+        )
@@ -0,0 +1,274 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedJobApplication
+from app.models.job_application import ApplicationStatus, JobApplication
+from app.models.resume_optimization import ResumeOptimization
+from app.models.stats import UserStatCounter
+
+# Counter dimensions
+TOTAL = "total"
+STATUS = "status"
+APPLIED_WEEK = "applied_week"
+COMPANY = "company"
+MATCH_SCORE = "match_score"
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+CounterKey = Tuple[str, str]
+CounterChanges = Dict[CounterKey, Tuple[int, float]]
+
+def week_start(applied_date: datetime) -> str:
+    """
+    ISO date of the Monday starting the week of a date
+    """
+    day = applied_date.date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def application_counters(job_application: Any) -> List[CounterKey]:
+    """
+    Counters a job application is counted in. Accepts a JobApplication or
+    any row with its status, company_name and applied_date.
+    """
+    status = ApplicationStatus(job_application.status or ApplicationStatus.PLANNING)
+    counters = [(TOTAL, ""), (STATUS, status.value), (COMPANY, job_application.company_name or "")]
+    if job_application.applied_date is not None:
+        counters.append((APPLIED_WEEK, week_start(job_application.applied_date)))
+    return counters
+
+def adjust_counters(db: Session, user_id: str, changes: CounterChanges):
+    """
+    Add to a user's counters, creating missing ones, in one statement.
+    The change is not committed, so it is applied together with the
+    caller's own changes.
+    """
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "key": key, "count": count, "total": total}
+        for (dimension, key), (count, total) in changes.items()
+        if count or total
+    ]
+    if not rows:
+        return
+
+    stmt = UPSERT_INSERTS[db.get_bind().dialect.name](UserStatCounter)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserStatCounter.user_id, UserStatCounter.dimension, UserStatCounter.key],
+        set_={
+            "count": UserStatCounter.count + stmt.excluded.count,
+            "total": UserStatCounter.total + stmt.excluded.total
+        }
+    )
+    db.execute(stmt, rows)
+
+def record_application_created(db: Session, job_application: JobApplication):
+    """
+    Count a new job application
+    """
+    adjust_counters(db, job_application.user_id, {key: (1, 0.0) for key in application_counters(job_application)})
+
+def record_applications_created(db: Session, user_id: str, job_applications: List[JobApplication]):
+    """
+    Count many new job applications of a user in one statement
+    """
+    changes = defaultdict(lambda: (0, 0.0))
+    for job_application in job_applications:
+        for key in application_counters(job_application):
+            changes[key] = (changes[key][0] + 1, 0.0)
+    adjust_counters(db, user_id, changes)
+
+def record_application_updated(db: Session, job_application: JobApplication, before: List[CounterKey]):
+    """
+    Move an updated job application between counters
+
+    Args:
+        db: Database session
+        job_application: The updated job application
+        before: application_counters() of the job application before the update
+    """
+    changes = defaultdict(lambda: (0, 0.0))
+    for key in before:
+        changes[key] = (changes[key][0] - 1, 0.0)
+    for key in application_counters(job_application):
+        changes[key] = (changes[key][0] + 1, 0.0)
+    adjust_counters(db, job_application.user_id, changes)
+
+def match_scores(db: Session, *criteria) -> Tuple[int, float]:
+    """
+    Number and sum of the match scores of the resume optimizations matching criteria
+    """
+    scored, score_sum = db.query(
+        func.count(ResumeOptimization.match_score),
+        func.coalesce(func.sum(ResumeOptimization.match_score), 0.0)
+    ).filter(*criteria).one()
+    return scored, score_sum
+
+def application_removals(job_applications: List[Any]) -> CounterChanges:
+    """
+    Counter changes uncounting job applications
+    """
+    changes = defaultdict(lambda: (0, 0.0))
+    for job_application in job_applications:
+        for key in application_counters(job_application):
+            changes[key] = (changes[key][0] - 1, 0.0)
+    return changes
+
+def record_applications_deleted(db: Session, user_id: str, job_applications: List[Any]):
+    """
+    Uncount job applications that are being deleted, together with the
+    match scores of their resume optimizations. Accepts JobApplication
+    objects or rows with their id and the columns application_counters reads.
+    """
+    changes = application_removals(job_applications)
+    scored, score_sum = match_scores(
+        db, ResumeOptimization.job_application_id.in_([job_application.id for job_application in job_applications])
+    )
+    changes[(MATCH_SCORE, "")] = (-scored, -score_sum)
+    adjust_counters(db, user_id, changes)
+
+def record_archived_applications_deleted(db: Session, user_id: str, archived: List[Any]):
+    """
+    Uncount archived job applications that are being deleted, together with
+    the match scores stored with them. Accepts ArchivedJobApplication objects
+    or rows with the columns application_counters reads and their scores.
+    """
+    changes = application_removals(archived)
+    changes[(MATCH_SCORE, "")] = (
+        -sum(row.scored_optimizations for row in archived),
+        -sum(row.match_score_total for row in archived)
+    )
+    adjust_counters(db, user_id, changes)
+
+def record_resumes_deleted(db: Session, user_id: str, resume_ids: List[str]):
+    """
+    Uncount the match scores of the resume optimizations of resumes that
+    are being deleted
+    """
+    scored, score_sum = match_scores(db, ResumeOptimization.resume_id.in_(resume_ids))
+    adjust_counters(db, user_id, {(MATCH_SCORE, ""): (-scored, -score_sum)})
+
+def record_match_score(db: Session, user_id: str, match_score: Optional[float], sign: int = 1):
+    """
+    Count (sign=1) or uncount (sign=-1) the match score of a resume optimization
+    """
+    if match_score is None:
+        return
+    adjust_counters(db, user_id, {(MATCH_SCORE, ""): (sign, sign * match_score)})
+
+def get_stats(db: Session, user_id: str, weeks: int, companies: int) -> Dict[str, Any]:
+    """
+    Read a user's dashboard aggregates from their counters. Only the most
+    recent weeks and the companies with the most applications are read,
+    so the cost does not grow with the user's history.
+
+    Args:
+        db: Database session
+        user_id: ID of the user
+        weeks: Number of weeks of applied_by_week, counting the current one
+        companies: Number of companies in by_company
+
+    Returns:
+        The aggregates, shaped like JobApplicationStats
+    """
+    stats = {
+        "total": 0,
+        "by_status": {},
+        "applied_by_week": {},
+        "by_company": {},
+        "scored_optimizations": 0,
+        "average_match_score": None
+    }
+    user_counters = db.query(UserStatCounter).filter(UserStatCounter.user_id == user_id)
+
+    for counter in user_counters.filter(
+        UserStatCounter.dimension.in_([TOTAL, STATUS, MATCH_SCORE]),
+        UserStatCounter.count != 0
+    ):
+        if counter.dimension == TOTAL:
+            stats["total"] = counter.count
+        elif counter.dimension == STATUS:
+            stats["by_status"][counter.key] = counter.count
+        elif counter.dimension == MATCH_SCORE:
+            stats["scored_optimizations"] = counter.count
+            stats["average_match_score"] = counter.total / counter.count
+
+    first_week = week_start(datetime.now(timezone.utc) - timedelta(weeks=weeks - 1))
+    for counter in user_counters.filter(
+        UserStatCounter.dimension == APPLIED_WEEK,
+        UserStatCounter.key >= first_week,
+        UserStatCounter.count != 0
+    ).order_by(UserStatCounter.key):
+        stats["applied_by_week"][counter.key] = counter.count
+
+    for counter in user_counters.filter(
+        UserStatCounter.dimension == COMPANY,
+        UserStatCounter.count > 0
+    ).order_by(UserStatCounter.count.desc()).limit(companies):
+        stats["by_company"][counter.key] = counter.count
+    return stats
+
+def rebuild_stats(db: Session, user_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute counters from the job applications and resume optimizations,
+    archived ones included
+
+    Args:
+        db: Database session
+        user_ids: Users to rebuild; every user if None
+
+    Returns:
+        Number of counters written
+    """
+    user_ids = list(user_ids) if user_ids is not None else None
+
+    counters = db.query(UserStatCounter)
+    applications = db.query(
+        JobApplication.user_id, JobApplication.status, JobApplication.company_name, JobApplication.applied_date
+    )
+    scores = db.query(
+        ResumeOptimization.user_id,
+        func.count(ResumeOptimization.match_score),
+        func.coalesce(func.sum(ResumeOptimization.match_score), 0.0)
+    ).group_by(ResumeOptimization.user_id)
+    archived = db.query(
+        ArchivedJobApplication.user_id, ArchivedJobApplication.status, ArchivedJobApplication.company_name,
+        ArchivedJobApplication.applied_date, ArchivedJobApplication.scored_optimizations,
+        ArchivedJobApplication.match_score_total
+    )
+    if user_ids is not None:
+        counters = counters.filter(UserStatCounter.user_id.in_(user_ids))
+        applications = applications.filter(JobApplication.user_id.in_(user_ids))
+        scores = scores.filter(ResumeOptimization.user_id.in_(user_ids))
+        archived = archived.filter(ArchivedJobApplication.user_id.in_(user_ids))
+
+    totals: Dict[Tuple[str, str, str], List] = defaultdict(lambda: [0, 0.0])
+    for application in applications.yield_per(1000):
+        for dimension, key in application_counters(application):
+            totals[(application.user_id, dimension, key)][0] += 1
+    for user_id, scored, score_sum in scores:
+        totals[(user_id, MATCH_SCORE, "")][0] += scored
+        totals[(user_id, MATCH_SCORE, "")][1] += score_sum
+    for application in archived.yield_per(1000):
+        for dimension, key in application_counters(application):
+            totals[(application.user_id, dimension, key)][0] += 1
+        totals[(application.user_id, MATCH_SCORE, "")][0] += application.scored_optimizations
+        totals[(application.user_id, MATCH_SCORE, "")][1] += application.match_score_total
+
+    counters.delete(synchronize_session=False)
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "key": key, "count": count, "total": total}
+        for (user_id, dimension, key), (count, total) in totals.items()
+        if count
+    ]
+    if rows:
+        db.execute(insert(UserStatCounter), rows)
+    db.commit()
+    return len(rows)
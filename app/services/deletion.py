@@ -0,0 +1,87 @@
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedJobApplication
+from app.models.job_application import JobApplication
+from app.models.resume import Resume
+from app.services import dashboard_stats
+from app.services.storage import release_blobs
+from app.services.task_queue import TaskQueue
+from app.services.task_handlers import SWEEP_BLOBS
+
+def delete_job_applications(db: Session, user_id: str, job_application_ids: List[str]) -> List[str]:
+    """
+    Delete a user's job applications with a single statement. Their
+    requirements, responsibilities, LinkedIn messages, cover letters and
+    resume optimizations are deleted by the database through ON DELETE
+    CASCADE. Archived job applications with these IDs are deleted too, with
+    their archived artifacts. The deletion is not committed.
+
+    Args:
+        db: Database session
+        user_id: ID of the owner
+        job_application_ids: IDs to delete; unknown IDs and those of other users are skipped
+
+    Returns:
+        IDs of the deleted job applications
+    """
+    job_applications = db.query(
+        JobApplication.id, JobApplication.status, JobApplication.company_name, JobApplication.applied_date
+    ).filter(
+        JobApplication.user_id == user_id,
+        JobApplication.id.in_(job_application_ids)
+    ).all()
+    archived = db.query(
+        ArchivedJobApplication.id, ArchivedJobApplication.status, ArchivedJobApplication.company_name,
+        ArchivedJobApplication.applied_date, ArchivedJobApplication.scored_optimizations,
+        ArchivedJobApplication.match_score_total
+    ).filter(
+        ArchivedJobApplication.user_id == user_id,
+        ArchivedJobApplication.id.in_(job_application_ids)
+    ).all()
+
+    deleted_ids = []
+    if job_applications:
+        ids = [job_application.id for job_application in job_applications]
+        dashboard_stats.record_applications_deleted(db, user_id, job_applications)
+        db.query(JobApplication).filter(JobApplication.id.in_(ids)).delete(synchronize_session=False)
+        deleted_ids.extend(ids)
+    if archived:
+        ids = [row.id for row in archived]
+        dashboard_stats.record_archived_applications_deleted(db, user_id, archived)
+        db.query(ArchivedJobApplication).filter(ArchivedJobApplication.id.in_(ids)).delete(synchronize_session=False)
+        deleted_ids.extend(ids)
+    return deleted_ids
+
+def delete_resumes(db: Session, user_id: str, resume_ids: List[str]) -> List[str]:
+    """
+    Delete a user's resumes with a single statement. Their parsed rows and
+    resume optimizations are deleted by the database through ON DELETE
+    CASCADE. Their files are released and left to the blob sweep task,
+    queued in the same transaction. The deletion is not committed.
+
+    Args:
+        db: Database session
+        user_id: ID of the owner
+        resume_ids: IDs to delete; unknown IDs and those of other users are skipped
+
+    Returns:
+        IDs of the deleted resumes
+    """
+    resumes = db.query(Resume.id, Resume.file_key).filter(
+        Resume.user_id == user_id,
+        Resume.id.in_(resume_ids)
+    ).all()
+    if not resumes:
+        return []
+
+    deleted_ids = [resume.id for resume in resumes]
+    dashboard_stats.record_resumes_deleted(db, user_id, deleted_ids)
+    db.query(Resume).filter(Resume.id.in_(deleted_ids)).delete(synchronize_session=False)
+
+    file_keys = [resume.file_key for resume in resumes if resume.file_key is not None]
+    if file_keys:
+        release_blobs(db, file_keys)
+        TaskQueue.enqueue(db, SWEEP_BLOBS, {"keys": sorted(set(file_keys))})
+    return deleted_ids
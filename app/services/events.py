@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.models.event import UserEvent
+from app.services.write_queue import write_queue
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before new ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Maximum number of events fetched per relay poll
+RELAY_BATCH_SIZE = 500
+
+# Maximum number of missing event IDs the relay waits for at once
+MAX_RELAY_GAPS = 1000
+
+def record_event(db: Session, user_id: str, event_type: str, data: Dict[str, Any]) -> UserEvent:
+    """
+    Record an event for a user. The event is not committed, so it is
+    published together with the change it describes.
+
+    Args:
+        db: Database session
+        user_id: ID of the user the event belongs to
+        event_type: Event name, e.g. "resume.status"
+        data: JSON-serialisable event data
+
+    Returns:
+        The recorded event
+    """
+    event = UserEvent(user_id=user_id, event_type=event_type, data=data)
+    db.add(event)
+    return event
+
+def serialize_event(event: UserEvent) -> Dict[str, Any]:
+    return {"id": event.id, "event": event.event_type, "data": event.data}
+
+def get_events_since(db: Session, user_id: str, last_event_id: int) -> List[Dict[str, Any]]:
+    """
+    Get the events recorded for a user after a given event ID
+    """
+    events = db.query(UserEvent).filter(
+        UserEvent.user_id == user_id,
+        UserEvent.id > last_event_id
+    ).order_by(UserEvent.id).limit(RELAY_BATCH_SIZE).all()
+    return [serialize_event(event) for event in events]
+
+class EventBroker:
+    """
+    In-process publish/subscribe of events, fanned out per user
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_id: str, event: Dict[str, Any]):
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer; it can catch up with Last-Event-ID on reconnect
+                logger.warning(f"Dropping event {event['id']} for a slow subscriber")
+
+event_broker = EventBroker()
+
+class EventRelay:
+    """
+    Moves events recorded in the database (by API or worker processes)
+    into the in-process broker with a single polling query per process.
+
+    On PostgreSQL, event IDs are taken from a sequence when the row is
+    inserted, so a transaction can commit an event after one with a higher
+    ID has been relayed. IDs skipped below the highest relayed one are
+    polled for again until EVENT_GAP_GRACE_SECONDS have passed, after which
+    they are assumed rolled back. An event committed later than that is
+    only delivered by a replay; on SQLite, where writes are serialized,
+    events commit in ID order.
+    """
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self._task: Optional[asyncio.Task] = None
+        self._last_id = 0
+        # Missing IDs below _last_id, with the time they were first missed
+        self._gaps: Dict[int, float] = {}
+
+    async def start(self):
+        self._last_id = await asyncio.to_thread(self._get_max_id)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        last_purge = datetime.now(timezone.utc)
+        while True:
+            events = []
+            try:
+                events = await asyncio.to_thread(self._fetch, self._last_id, list(self._gaps))
+                self._track(events)
+                for event in events:
+                    self.broker.publish(event.user_id, serialize_event(event))
+
+                now = datetime.now(timezone.utc)
+                if now - last_purge > timedelta(seconds=settings.EVENT_RETENTION_SECONDS / 10):
+                    await write_queue.run(self._purge, now - timedelta(seconds=settings.EVENT_RETENTION_SECONDS))
+                    last_purge = now
+            except Exception as e:
+                logger.error(f"Error relaying events: {str(e)}")
+
+            # Keep draining without sleeping while a backlog remains
+            if len(events) < RELAY_BATCH_SIZE:
+                await asyncio.sleep(settings.EVENT_POLL_INTERVAL)
+
+    @staticmethod
+    def _get_max_id() -> int:
+        with ReadSessionLocal() as db:
+            return db.query(func.max(UserEvent.id)).scalar() or 0
+
+    def _track(self, events: List[UserEvent]):
+        """
+        Advance past fetched events, recording the IDs skipped over and
+        forgetting those missing for longer than the grace period
+        """
+        now = time.monotonic()
+        for event in events:
+            if event.id <= self._last_id:
+                self._gaps.pop(event.id, None)
+                continue
+            missing = range(self._last_id + 1, event.id)
+            if len(self._gaps) + len(missing) > MAX_RELAY_GAPS:
+                logger.warning(f"Not waiting for {len(missing)} missing events before event {event.id}")
+            else:
+                self._gaps.update((event_id, now) for event_id in missing)
+            self._last_id = event.id
+
+        expired = now - settings.EVENT_GAP_GRACE_SECONDS
+        self._gaps = {event_id: seen for event_id, seen in self._gaps.items() if seen > expired}
+
+    @staticmethod
+    def _fetch(last_id: int, gaps: List[int]) -> List[UserEvent]:
+        condition = UserEvent.id > last_id
+        if gaps:
+            condition = or_(condition, UserEvent.id.in_(gaps))
+        with ReadSessionLocal() as db:
+            return db.query(UserEvent).filter(condition).order_by(UserEvent.id).limit(RELAY_BATCH_SIZE).all()
+
+    @staticmethod
+    def _purge(db: Session, before: datetime):
+        db.query(UserEvent).filter(UserEvent.created_at < before).delete(synchronize_session=False)
+        db.commit()
+
+event_relay = EventRelay(event_broker)
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job_application import JobApplication
+from app.models.resume import Resume
+from app.models.user import User
+
+@dataclass(frozen=True)
+class GenerationContext:
+    """
+    Everything a generation endpoint needs from the database: the job
+    application, the resume to tailor and the owner's portfolio URL
+    """
+    job_application_id: str
+    job_title: str
+    company_name: str
+    job_description: Optional[str]
+    portfolio_url: Optional[str]
+    resume_id: Optional[str] = None
+    resume_data: Optional[Dict[str, Any]] = None
+
+async def load_generation_context(
+    db: AsyncSession,
+    user_id: str,
+    job_application_id: str,
+    resume_id: Optional[str] = None
+) -> Optional[GenerationContext]:
+    """
+    Load a job application owned by a user together with a parsed resume
+    and the user's portfolio URL in a single query
+
+    Args:
+        db: Database session
+        user_id: ID of the user who must own the job application and resume
+        job_application_id: ID of the job application
+        resume_id: ID of the resume to use; the user's latest parsed resume if None
+
+    Returns:
+        The context, or None if the job application was not found. The
+        resume fields are None if no matching parsed resume was found.
+    """
+    if resume_id is not None:
+        resume_match = Resume.id == resume_id
+    else:
+        # Served by the (user_id, created_at, id) index
+        resume_match = Resume.id == select(Resume.id).where(
+            Resume.user_id == user_id,
+            Resume.parsed_status == "completed"
+        ).order_by(Resume.created_at.desc(), Resume.id.desc()).limit(1).scalar_subquery()
+
+    row = (await db.execute(
+        select(
+            JobApplication.job_title,
+            JobApplication.company_name,
+            JobApplication.job_description,
+            User.portfolio_url,
+            Resume.id.label("resume_id"),
+            Resume.parsed_content
+        )
+        .select_from(JobApplication)
+        .join(User, User.id == JobApplication.user_id)
+        .outerjoin(Resume, and_(
+            resume_match,
+            Resume.user_id == JobApplication.user_id,
+            Resume.parsed_status == "completed"
+        ))
+        .where(JobApplication.id == job_application_id, JobApplication.user_id == user_id)
+    )).first()
+
+    if row is None:
+        return None
+
+    return GenerationContext(
+        job_application_id=job_application_id,
+        job_title=row.job_title,
+        company_name=row.company_name,
+        job_description=row.job_description,
+        portfolio_url=row.portfolio_url,
+        resume_id=row.resume_id,
+        resume_data=row.parsed_content
+    )
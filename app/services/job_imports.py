@@ -0,0 +1,134 @@
+import csv
+import hashlib
+import io
+import json
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from pydantic import ValidationError
+
+from app.models.job_application import JobApplication
+from app.schemas.job_import import JobApplicationImportRow
+
+# Accepted import files, by extension
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Query parameters that only record where a link was followed from
+TRACKING_PARAMETER_PREFIXES = ("utm_",)
+TRACKING_PARAMETERS = {"gclid", "fbclid", "msclkid", "trk", "trackingid", "refid"}
+
+# A row of an import: its 1-based number and the parsed row, or why it could not be parsed
+ImportEntry = Tuple[int, Union[JobApplicationImportRow, str]]
+
+def normalize_job_url(job_url: Optional[str]) -> Optional[str]:
+    """
+    Key two links to the same posting share: host and path without scheme,
+    "www.", trailing slash, fragment or tracking parameters, and the
+    remaining query parameters sorted
+    """
+    if not job_url or not job_url.strip():
+        return None
+    url = job_url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url.lower()
+
+    host = (parts.hostname or "").removeprefix("www.")
+    if port and port not in (80, 443):
+        host += f":{port}"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETER_PREFIXES) and name.lower() not in TRACKING_PARAMETERS
+    ))
+    key = host + parts.path.rstrip("/")
+    return f"{key}?{query}" if query else key
+
+def hash_description(job_description: Optional[str]) -> Optional[str]:
+    """
+    SHA-256 of a job description ignoring case and whitespace
+    """
+    if not job_description or not job_description.strip():
+        return None
+    return hashlib.sha256(" ".join(job_description.lower().split()).encode()).hexdigest()
+
+def set_duplicate_keys(job_application: JobApplication):
+    """
+    Set the keys imports find duplicates of a job application by
+    """
+    job_application.job_url_key = normalize_job_url(job_application.job_url)
+    job_application.description_hash = hash_description(job_application.job_description)
+
+def parse_row(record: Dict[str, Any]) -> Union[JobApplicationImportRow, str]:
+    """
+    Validate a row, returning the error message if it is invalid
+    """
+    try:
+        return JobApplicationImportRow(**record)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+
+def _csv_records(text: io.TextIOBase) -> Iterator[Union[Dict[str, Any], str]]:
+    reader = csv.DictReader(text)
+    # Accept headers such as "Job Title" for job_title
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower().replace(" ", "_") for name in reader.fieldnames]
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield f"Malformed CSV: {str(e)}"
+            continue
+        # Empty cells are missing values; cells past the header are dropped
+        yield {
+            name: (value.strip() or None) if isinstance(value, str) else value
+            for name, value in record.items()
+            if name
+        }
+
+def _jsonl_records(text: io.TextIOBase) -> Iterator[Union[Dict[str, Any], str]]:
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield f"Malformed JSON: {str(e)}"
+            continue
+        if not isinstance(record, dict):
+            yield "Row is not a JSON object"
+            continue
+        yield record
+
+def read_import_rows(file: BinaryIO, file_format: str) -> Iterator[ImportEntry]:
+    """
+    Read and validate the rows of an import file one at a time, so the file
+    is never held in memory
+
+    Args:
+        file: Binary file object of the upload
+        file_format: csv or jsonl
+
+    Returns:
+        Iterator of the numbered rows
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+    records = _csv_records(text) if file_format == "csv" else _jsonl_records(text)
+    for number, record in enumerate(records, start=1):
+        yield number, record if isinstance(record, str) else parse_row(record)
+
+def read_import_batches(file: BinaryIO, file_format: str, batch_size: int, skip: int = 0) -> Iterator[List[ImportEntry]]:
+    """
+    Read the rows of an import file in batches, after the first skip rows
+    """
+    rows = islice(read_import_rows(file, file_format), skip, None)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
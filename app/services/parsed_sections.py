@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import cast, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.job_application import JobApplication, JobRequirement, JobResponsibility
+from app.models.resume import Resume, ParsedEducation, ParsedExperience, ParsedSkill, ParsedProject
+from app.schemas.job_application import Requirement, Responsibility
+from app.schemas.resume import Education, Experience, Skill, Project
+from app.services.bulk_persistence import RowsByModel
+
+def split_technologies(technologies: Optional[str]) -> Optional[List[str]]:
+    """
+    Technologies of a parsed project, which are stored comma-separated
+    """
+    if not technologies:
+        return None
+    return [technology for technology in technologies.split(",") if technology]
+
+def project_schema(project: ParsedProject) -> Project:
+    return Project(
+        id=project.id,
+        resume_id=project.resume_id,
+        name=project.name,
+        description=project.description,
+        start_date=project.start_date,
+        end_date=project.end_date,
+        technologies=split_technologies(project.technologies),
+        created_at=project.created_at,
+        updated_at=project.updated_at
+    )
+
+# Structured rows of a parent, by the name they are serialized under
+RESUME_SECTIONS = {
+    "educations": ParsedEducation,
+    "experiences": ParsedExperience,
+    "skills": ParsedSkill,
+    "projects": ParsedProject,
+}
+JOB_APPLICATION_SECTIONS = {
+    "requirements": JobRequirement,
+    "responsibilities": JobResponsibility,
+}
+
+# Response schema of each structured row
+SECTION_SCHEMAS = {
+    ParsedEducation: Education,
+    ParsedExperience: Experience,
+    ParsedSkill: Skill,
+    ParsedProject: Project,
+    JobRequirement: Requirement,
+    JobResponsibility: Responsibility,
+}
+
+def serialize_sections(sections: Dict[str, Any], rows_by_model: RowsByModel) -> Dict[str, Any]:
+    """
+    Serialize structured rows, given as column dicts, as the detail
+    endpoints return them
+    """
+    serialized = {}
+    for name, model in sections.items():
+        schema = SECTION_SCHEMAS[model]
+        rows = rows_by_model.get(model, [])
+        if model is ParsedProject:
+            rows = [{**row, "technologies": split_technologies(row["technologies"])} for row in rows]
+        serialized[name] = [schema(**row) for row in rows]
+    return jsonable_encoder(serialized)
+
+def load_section_rows(db: Session, foreign_key: str, parent_id: str, models: List[Any]) -> RowsByModel:
+    """
+    Read the rows a parent owns in several tables with one UNION ALL
+    statement, padding the columns a table does not have with NULL
+
+    Args:
+        db: Database session
+        foreign_key: Name of the column that references the parent
+        parent_id: ID of the parent row
+        models: Models of the tables to read
+
+    Returns:
+        Column dicts of the rows, keyed by model
+    """
+    column_types: Dict[str, Any] = {}
+    for model in models:
+        for column in model.__table__.columns:
+            column_types.setdefault(column.name, column.type)
+
+    selects = []
+    for index, model in enumerate(models):
+        table = model.__table__
+        selects.append(select(
+            literal(index).label("section"),
+            *[
+                table.c[name] if name in table.c else cast(null(), column_type).label(name)
+                for name, column_type in column_types.items()
+            ]
+        ).where(table.c[foreign_key] == parent_id))
+
+    rows_by_model: RowsByModel = {model: [] for model in models}
+    for row in db.execute(union_all(*selects)).mappings():
+        model = models[row["section"]]
+        rows_by_model[model].append({name: row[name] for name in model.__table__.columns.keys()})
+    return rows_by_model
+
+def resume_sections(db: Session, resume: Resume) -> Dict[str, Any]:
+    """
+    Structured rows of a parsed resume, serialized as the parsed content
+    endpoint returns them, read from their tables in one statement
+    """
+    rows = load_section_rows(db, "resume_id", resume.id, list(RESUME_SECTIONS.values()))
+    return serialize_sections(RESUME_SECTIONS, rows)
+
+def job_application_sections(db: Session, job_application: JobApplication) -> Dict[str, Any]:
+    """
+    Requirements and responsibilities of a job application, serialized as
+    the detail endpoint returns them, read from their tables in one statement
+    """
+    rows = load_section_rows(db, "job_application_id", job_application.id, list(JOB_APPLICATION_SECTIONS.values()))
+    return serialize_sections(JOB_APPLICATION_SECTIONS, rows)
+
+def store_resume_sections(db: Session, resume: Resume):
+    """
+    Store the serialized structured rows of a resume, read back from the
+    rows that just replaced them so they are encoded exactly as the
+    fallback reads them, and reading the parsed content takes a single
+    query. The change is not committed.
+    """
+    resume.parsed_sections = resume_sections(db, resume)
+
+def store_job_application_sections(db: Session, job_application: JobApplication):
+    """
+    Store the serialized requirements and responsibilities of a job
+    application, read back from the rows that just replaced them. The
+    change is not committed.
+    """
+    job_application.parsed_sections = job_application_sections(db, job_application)
@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from app.services.openai_service import OpenAIService
+from app.services.generation_context import GenerationContext
 
 class ResumeOptimizer:
     """
@@ -24,4 +25,20 @@ class ResumeOptimizer:
         return await OpenAIService.generate_resume_optimization(
             resume_data=resume_data,
             job_description=job_description
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    async def optimize_for_context(context: GenerationContext) -> Dict[str, Any]:
+        """
+        Generate optimization suggestions from a loaded generation context
+        
+        Args:
+            context: Job application and resume
+            
+        Returns:
+            Dictionary with optimization suggestions, match score, and skill matches
+        """
+        return await ResumeOptimizer.optimize_resume(
+            resume_data=context.resume_data,
+            job_description=context.job_description
+        )
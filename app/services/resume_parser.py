@@ -1,11 +1,16 @@
+import asyncio
 import os
 import PyPDF2
 import docx
-from typing import Dict, Any
-import io
+from typing import BinaryIO, Dict, Any
 
 from app.services.openai_service import OpenAIService
 
+class UnreadableResumeError(ValueError):
+    """
+    The text of a resume file cannot be extracted, however often it is retried
+    """
+
 class ResumeParser:
     """
     Service for parsing resume files into structured data
@@ -22,21 +27,24 @@ class ResumeParser:
         Returns:
             Structured resume data
         """
-        # Extract text from the file
-        file_extension = os.path.splitext(file_path)[1].lower()
+        file_type = os.path.splitext(file_path)[1].lower().lstrip('.')
+        with open(file_path, 'rb') as file:
+            return await ResumeParser.parse_stream(file, file_type)
+    
+    @staticmethod
+    async def parse_stream(file: BinaryIO, file_type: str) -> Dict[str, Any]:
+        """
+        Parse a resume from a binary stream into structured data
         
-        if file_extension == '.pdf':
-            resume_text = ResumeParser._extract_text_from_pdf(file_path)
-        elif file_extension == '.docx':
-            resume_text = ResumeParser._extract_text_from_docx(file_path)
-        elif file_extension == '.doc':
-            # Handling .doc files might require external libraries
-            # For now, we'll return an error
-            raise ValueError("DOC format is not supported. Please convert to PDF or DOCX.")
-        elif file_extension == '.txt':
-            resume_text = ResumeParser._extract_text_from_txt(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
+        Args:
+            file: Binary file object with the resume contents
+            file_type: File type (pdf, docx, txt)
+            
+        Returns:
+            Structured resume data
+        """
+        # Extraction is CPU-bound, so it runs off the event loop
+        resume_text = await asyncio.to_thread(ResumeParser.extract_text, file, file_type)
         
         # Use OpenAI to parse the resume text
         parsed_data = await OpenAIService.parse_resume(resume_text)
@@ -44,68 +52,91 @@ class ResumeParser:
         return parsed_data
     
     @staticmethod
-    def _extract_text_from_pdf(file_path: str) -> str:
+    def extract_text(file: BinaryIO, file_type: str) -> str:
+        """
+        Extract the text of a resume
+        
+        Args:
+            file: Binary file object with the resume contents
+            file_type: File type (pdf, docx, txt)
+            
+        Returns:
+            Extracted text
+
+        Raises:
+            UnreadableResumeError: If the file is corrupt or of an unsupported type
+        """
+        if file_type == 'pdf':
+            resume_text = ResumeParser._extract_text_from_pdf(file)
+        elif file_type == 'docx':
+            resume_text = ResumeParser._extract_text_from_docx(file)
+        elif file_type == 'txt':
+            resume_text = ResumeParser._extract_text_from_txt(file)
+        else:
+            raise UnreadableResumeError(f"Unsupported file format: {file_type}")
+        
+        return resume_text
+    
+    @staticmethod
+    def _extract_text_from_pdf(file: BinaryIO) -> str:
         """
         Extract text from a PDF file
         
         Args:
-            file_path: Path to the PDF file
+            file: Binary PDF file object
             
         Returns:
             Extracted text
         """
         text = ""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                text += page.extract_text() + "\n"
         except Exception as e:
-            raise ValueError(f"Error extracting text from PDF: {str(e)}")
+            raise UnreadableResumeError(f"Error extracting text from PDF: {str(e)}")
         
         return text
     
     @staticmethod
-    def _extract_text_from_docx(file_path: str) -> str:
+    def _extract_text_from_docx(file: BinaryIO) -> str:
         """
         Extract text from a DOCX file
         
         Args:
-            file_path: Path to the DOCX file
+            file: Binary DOCX file object
             
         Returns:
             Extracted text
         """
         text = ""
         try:
-            doc = docx.Document(file_path)
+            doc = docx.Document(file)
             for para in doc.paragraphs:
                 text += para.text + "\n"
         except Exception as e:
-            raise ValueError(f"Error extracting text from DOCX: {str(e)}")
+            raise UnreadableResumeError(f"Error extracting text from DOCX: {str(e)}")
         
         return text
     
     @staticmethod
-    def _extract_text_from_txt(file_path: str) -> str:
+    def _extract_text_from_txt(file: BinaryIO) -> str:
         """
         Extract text from a TXT file
         
         Args:
-            file_path: Path to the TXT file
+            file: Binary TXT file object
             
         Returns:
             Extracted text
         """
-        text = ""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-        except UnicodeDecodeError:
-            # Try different encoding if UTF-8 fails
-            with open(file_path, 'r', encoding='latin-1') as file:
-                text = file.read()
+            content = file.read()
         except Exception as e:
-            raise ValueError(f"Error extracting text from TXT: {str(e)}")
+            raise UnreadableResumeError(f"Error extracting text from TXT: {str(e)}")
         
-        return text
\ No newline at end of file
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            # Try different encoding if UTF-8 fails
+            return content.decode('latin-1')
\ No newline at end of file
@@ -0,0 +1,175 @@
+import html
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.models.search import SEARCH_INDEXES, TS_CONFIG, SearchIndex
+from app.utils.pagination import PageParams, decode_keyset, encode_keyset, invalid_cursor
+
+# Words of a snippet around the best match
+SNIPPET_WORDS = 16
+
+# Private-use characters marking matches in snippets, so the snippet text
+# can be escaped before the markers are turned into <mark> tags
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+# Words left out of searches, as PostgreSQL's english configuration does.
+# They appear in nearly every document, so they would not narrow a search
+# down, and ranking by them means reading their whole index entry.
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can did do does doing down during each few for from further had has have having he her here
+hers herself him himself his how i if in into is it its itself just me more most my myself no nor not now
+of off on once only or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under until up very was we
+were what when where which while who whom why will with you your yours yourself yourselves
+""".split())
+
+SEARCH_INDEXES_BY_KIND = {index.kind: index for index in SEARCH_INDEXES}
+
+def search_terms(query: str) -> List[str]:
+    """
+    Words of a search query, split like the index tokenizer splits text,
+    without stopwords. Every word must match; operators of the underlying
+    query syntax are ignored.
+    """
+    return [word for word in re.findall(r"[^\W_]+", query) if word.lower() not in STOPWORDS]
+
+def _job_application_id(index: SearchIndex) -> str:
+    return f"t.{index.parent_column or 'id'}"
+
+def _sqlite_hits(index: SearchIndex) -> str:
+    fts = index.fts_table
+    # The owner column only filters, it does not count towards the rank
+    weights = ", ".join(["0.0"] + ["1.0"] * len(index.columns))
+    # CROSS JOIN keeps SQLite from starting at the user's rows and running
+    # the full-text query once for each of them
+    return (
+        f"SELECT '{index.kind}' AS kind, t.id AS id, {_job_application_id(index)} AS job_application_id, "
+        f"{fts}.rowid AS doc, bm25({fts}, {weights}) AS rank "
+        f"FROM {fts} CROSS JOIN {index.doc_table} d ON d.doc = {fts}.rowid CROSS JOIN {index.table} t ON t.id = d.id "
+        f"WHERE {fts} MATCH :owner_match AND t.user_id = :user_id"
+    )
+
+def _postgresql_hits(index: SearchIndex) -> str:
+    return (
+        f"SELECT '{index.kind}' AS kind, t.id AS id, {_job_application_id(index)} AS job_application_id, t.id AS doc, "
+        f"-ts_rank_cd(t.search_vector, plainto_tsquery('{TS_CONFIG}', :match)) AS rank "
+        f"FROM {index.table} t "
+        f"WHERE t.search_vector @@ plainto_tsquery('{TS_CONFIG}', :match) AND t.user_id = :user_id"
+    )
+
+def _sqlite_snippets(index: SearchIndex) -> str:
+    fts = index.fts_table
+    return (
+        f"SELECT t.id, snippet({fts}, -1, '{MARK_START}', '{MARK_END}', '…', {SNIPPET_WORDS}) "
+        f"FROM {fts} CROSS JOIN {index.doc_table} d ON d.doc = {fts}.rowid CROSS JOIN {index.table} t ON t.id = d.id "
+        f"WHERE {fts} MATCH :match AND {fts}.rowid IN :docs AND t.user_id = :user_id"
+    )
+
+def _postgresql_snippets(index: SearchIndex) -> str:
+    options = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+    return (
+        f"SELECT t.id, ts_headline('{TS_CONFIG}', {index.document}, plainto_tsquery('{TS_CONFIG}', :match), '{options}') "
+        f"FROM {index.table} t WHERE t.id IN :docs AND t.user_id = :user_id"
+    )
+
+SEARCH_SQL = {
+    "sqlite": (_sqlite_hits, _sqlite_snippets),
+    "postgresql": (_postgresql_hits, _postgresql_snippets),
+}
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """
+    HTML-escape a snippet and wrap its matches in <mark> tags
+    """
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+def search(
+    db: Session,
+    user_id: str,
+    query: str,
+    page: PageParams,
+    kinds: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Search a user's job applications, cover letters and LinkedIn messages,
+    best match first.
+
+    Matches are ranked and paged first, using keyset pagination on
+    (rank, kind, id); snippets are only built for the rows of the page.
+
+    Args:
+        db: Database session
+        user_id: ID of the user whose documents are searched
+        query: Search query; every word must match
+        page: Cursor and page size
+        kinds: Kinds of documents to search; all if None
+
+    Returns:
+        Page of results with highlighted snippets
+    """
+    terms = search_terms(query)
+    indexes = [SEARCH_INDEXES_BY_KIND[kind] for kind in kinds] if kinds else SEARCH_INDEXES
+    if not terms or not indexes:
+        return {"items": [], "next_cursor": None}
+
+    dialect = db.get_bind().dialect.name
+    hits_sql, snippets_sql = SEARCH_SQL[dialect]
+    if dialect == "sqlite":
+        # Quoted so words are never read as FTS5 operators
+        match = "- {owner} : (" + " ".join(f'"{term}"' for term in terms) + ")"
+    else:
+        match = " ".join(terms)
+    owner_match = f'owner : "{user_id.encode().hex().upper()}" AND {match}'
+    params = {"match": match, "owner_match": owner_match, "user_id": user_id, "limit": page.limit + 1}
+
+    seek = ""
+    if page.cursor:
+        try:
+            rank, kind, id = decode_keyset(page.cursor)
+            params.update(after_rank=float(rank), after_kind=str(kind), after_id=str(id))
+        except (ValueError, TypeError):
+            raise invalid_cursor()
+        seek = (
+            "WHERE rank > :after_rank OR (rank = :after_rank AND "
+            "(kind > :after_kind OR (kind = :after_kind AND id > :after_id)))"
+        )
+
+    hits = " UNION ALL ".join(hits_sql(index) for index in indexes)
+    rows = db.execute(
+        text(f"SELECT kind, id, job_application_id, doc, rank FROM ({hits}) hits {seek} ORDER BY rank, kind, id LIMIT :limit"),
+        params
+    ).all()
+    items = rows[:page.limit]
+
+    snippets = {}
+    for index in indexes:
+        docs = [row.doc for row in items if row.kind == index.kind]
+        if docs:
+            statement = text(snippets_sql(index)).bindparams(bindparam("docs", expanding=True))
+            snippets.update(db.execute(statement, {"match": match, "docs": docs, "user_id": user_id}).all())
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        last = items[-1]
+        next_cursor = encode_keyset([last.rank, last.kind, last.id])
+
+    return {
+        "items": [
+            {
+                "kind": row.kind,
+                "id": row.id,
+                "job_application_id": row.job_application_id,
+                "score": -row.rank,
+                "snippet": highlight(snippets.get(row.id))
+            }
+            for row in items
+        ],
+        "next_cursor": next_cursor
+    }
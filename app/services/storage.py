@@ -0,0 +1,275 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.blob import StoredBlob
+from app.utils.file_handlers import copy_file
+
+@dataclass
+class StagedBlob:
+    """
+    Content read into a backend but not yet saved under its key
+    """
+    key: str
+    size: int
+    location: Any  # Where the backend holds the content until it is saved
+
+class StorageBackend(ABC):
+    """
+    Interface for blob storage addressed by content hash keys
+    """
+
+    @abstractmethod
+    def stage(self, file: BinaryIO, max_size: int) -> StagedBlob:
+        """
+        Read the contents of a file object and compute their key, without
+        saving them under it yet
+
+        Args:
+            file: File object to read from
+            max_size: Maximum number of bytes allowed
+
+        Returns:
+            The staged content, to be saved or discarded
+        """
+
+    @abstractmethod
+    def save(self, staged: StagedBlob) -> None:
+        """
+        Save staged content under its key, replacing any stored copy
+        """
+
+    @abstractmethod
+    def discard(self, staged: StagedBlob) -> None:
+        """
+        Drop staged content without saving it
+        """
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """
+        Open a stored blob for reading
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Delete a stored blob if it exists
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """
+        Check whether a blob is stored
+        """
+
+    def local_path(self, key: str) -> Optional[str]:
+        """
+        Path of the blob on the local filesystem, if the backend has one
+        """
+        return None
+
+class _HashingWriter:
+    """
+    Writes through to a file while computing the SHA-256 of the data
+    """
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        return self.file.write(data)
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores blobs on the local filesystem, sharded into hash-prefixed
+    subdirectories (ab/cd/abcd...) so no directory grows too large
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def stage(self, file: BinaryIO, max_size: int) -> StagedBlob:
+        # Write to a temporary file first, since the key is only known once
+        # all of the content has been hashed
+        with tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False) as tmp:
+            try:
+                writer = _HashingWriter(tmp)
+                size = copy_file(file, writer, max_size)
+            except Exception:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+        return StagedBlob(writer.hash.hexdigest(), size, tmp.name)
+
+    def save(self, staged: StagedBlob) -> None:
+        path = self.local_path(staged.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(staged.location, path)
+
+    def discard(self, staged: StagedBlob) -> None:
+        try:
+            os.remove(staged.location)
+        except FileNotFoundError:
+            pass
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.local_path(key), "rb")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+class MemoryStorageBackend(StorageBackend):
+    """
+    In-memory stand-in for an object store, useful for tests and development
+    """
+
+    def __init__(self):
+        self._objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, file: BinaryIO, max_size: int) -> StagedBlob:
+        buffer = io.BytesIO()
+        size = copy_file(file, buffer, max_size)
+        data = buffer.getvalue()
+        return StagedBlob(hashlib.sha256(data).hexdigest(), size, data)
+
+    def save(self, staged: StagedBlob) -> None:
+        with self._lock:
+            self._objects[staged.key] = staged.location
+
+    def discard(self, staged: StagedBlob) -> None:
+        pass
+
+    def open(self, key: str) -> BinaryIO:
+        with self._lock:
+            if key not in self._objects:
+                raise FileNotFoundError(key)
+            return io.BytesIO(self._objects[key])
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._objects.pop(key, None)
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            return key in self._objects
+
+def get_storage_backend() -> StorageBackend:
+    """
+    Create the storage backend selected by STORAGE_BACKEND
+    """
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(os.path.join(settings.UPLOAD_DIR, "blobs"))
+    if settings.STORAGE_BACKEND == "memory":
+        return MemoryStorageBackend()
+    raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
+
+storage = get_storage_backend()
+
+def store_blob(db: Session, file: BinaryIO, max_size: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Store a file and add a reference to it. The reference is not committed,
+    so it is saved together with the row that points at the blob.
+
+    Args:
+        db: Database session
+        file: File object to store
+        max_size: Maximum number of bytes allowed (default: MAX_UPLOAD_SIZE)
+
+    Returns:
+        Tuple of (key, size)
+    """
+    staged = storage.stage(file, max_size or settings.MAX_UPLOAD_SIZE)
+    try:
+        # Insert the blob row or increment its reference count atomically.
+        # This waits for a sweep deleting the row to commit, which deletes
+        # the file first.
+        insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = insert(StoredBlob).values(key=staged.key, size=staged.size, ref_count=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=[StoredBlob.key],
+            set_={"ref_count": StoredBlob.ref_count + 1}
+        ).returning(StoredBlob.ref_count)
+        ref_count = db.execute(statement).scalar_one()
+
+        # The file of a blob nothing referred to may have been swept, so it is
+        # written again rather than trusted to exist
+        if ref_count == 1 or not storage.exists(staged.key):
+            storage.save(staged)
+        else:
+            storage.discard(staged)
+    except Exception:
+        storage.discard(staged)
+        raise
+    return staged.key, staged.size
+
+def release_blobs(db: Session, keys: Iterable[str]) -> None:
+    """
+    Drop one reference to a blob per key, in one statement; a key listed
+    twice loses two references. The references are not committed.
+    """
+    blobs = StoredBlob.__table__
+    statement = update(blobs).where(blobs.c.key == bindparam("blob_key")).values(
+        ref_count=blobs.c.ref_count - bindparam("released")
+    )
+    db.execute(statement, [{"blob_key": key, "released": count} for key, count in Counter(keys).items()])
+
+def abandon_blobs(db: Session, keys: Iterable[str]) -> None:
+    """
+    Keep a row without references for each stored blob whose references
+    were rolled back, so a sweep of the keys removes the files unless they
+    have been referenced again. Not committed.
+    """
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    db.execute(
+        insert(StoredBlob).on_conflict_do_nothing(index_elements=[StoredBlob.key]),
+        [{"key": key, "ref_count": 0} for key in sorted(set(keys))]
+    )
+
+def delete_unreferenced_blobs(db: Session, keys: List[str]) -> List[str]:
+    """
+    Delete the blobs among keys that nothing refers to any more, and commit.
+
+    Their files are deleted before the rows are committed. Until then the
+    deleted rows stay locked, so an upload of the same content waits for
+    the commit, finds no row and writes the file again.
+
+    Returns:
+        Keys of the deleted blobs
+    """
+    deleted = db.execute(
+        delete(StoredBlob)
+        .where(StoredBlob.key.in_(keys), StoredBlob.ref_count <= 0)
+        .returning(StoredBlob.key)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    for key in deleted:
+        storage.delete(key)
+    db.commit()
+    return list(deleted)
@@ -0,0 +1,358 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.resume import Resume
+from app.models.job_application import ApplicationStatus, JobApplication
+from app.models.job_import import JobApplicationImport
+from app.models.task_queue import QueuedTask, TaskStatus
+from app.services.resume_parser import ResumeParser, UnreadableResumeError
+from app.services.openai_service import OpenAIService
+from app.services.events import record_event
+from app.services.storage import storage, delete_unreferenced_blobs, release_blobs
+from app.services.bulk_persistence import replace_resume_rows, replace_job_rows
+from app.services.parsed_sections import store_resume_sections, store_job_application_sections
+from app.services.write_queue import write_queue
+from app.services.task_queue import PermanentTaskError, TaskQueue
+from app.services import dashboard_stats
+from app.services.job_imports import ImportEntry, hash_description, normalize_job_url, read_import_batches
+from app.utils.security import generate_uuid
+
+# Task types
+PARSE_RESUME = "parse_resume"
+PARSE_RESUME_BULK = "parse_resume_bulk"  # Bulk uploads, kept apart so they cannot starve single uploads
+PARSE_JOB_DESCRIPTION = "parse_job_description"
+SWEEP_BLOBS = "sweep_blobs"  # Removes the files of blobs released by deletes
+IMPORT_JOB_APPLICATIONS = "import_job_applications"
+PARSE_JOB_DESCRIPTION_IMPORT = "parse_job_description_import"  # Imported applications, rate limited
+
+def start_resume_parse(db: Session, resume_id: str) -> Optional[Resume]:
+    """
+    Mark a resume as processing. Returns None if the resume no longer exists.
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        return None
+
+    resume.parsed_status = "processing"
+    record_event(db, resume.user_id, "resume.status", {"resume_id": resume_id, "status": "processing"})
+    db.commit()
+    return resume
+
+def save_parsed_resume(db: Session, resume_id: str, parsed_data: Dict[str, Any]):
+    """
+    Save parsed resume data and mark the resume as completed
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        return
+
+    resume.parsed_content = parsed_data
+    resume.parsed_status = "completed"
+
+    # Replace rows left by an earlier attempt so retries stay idempotent
+    replace_resume_rows(db, resume_id, parsed_data)
+    store_resume_sections(db, resume)
+
+    record_event(db, resume.user_id, "resume.status", {
+        "resume_id": resume_id,
+        "status": "completed",
+        "sections": {
+            section: len(parsed_data.get(section) or [])
+            for section in ("education", "experience", "skills", "projects")
+        }
+    })
+    db.commit()
+
+def mark_resume_failed(db: Session, resume_id: str):
+    """
+    Mark a resume as failed
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if resume:
+        resume.parsed_status = "failed"
+        record_event(db, resume.user_id, "resume.status", {"resume_id": resume.id, "status": "failed"})
+        db.commit()
+
+def get_job_description(job_application_id: str) -> Optional[Row]:
+    """
+    Get the description of a job application, or None if it no longer exists
+    """
+    with SessionLocal() as db:
+        return db.query(JobApplication.job_description).filter(JobApplication.id == job_application_id).first()
+
+def save_parsed_job_description(db: Session, job_application_id: str, parsed_data: Dict[str, Any]):
+    """
+    Save parsed job details
+    """
+    job_application = db.query(JobApplication).filter(JobApplication.id == job_application_id).first()
+    if not job_application:
+        return
+
+    job_application.parsed_job_details = parsed_data
+
+    # Replace rows from an earlier parse or attempt
+    replace_job_rows(db, job_application_id, parsed_data)
+    store_job_application_sections(db, job_application)
+
+    record_event(db, job_application.user_id, "job_application.parsed", {
+        "job_application_id": job_application_id,
+        "required_skills": len(parsed_data.get("required_skills") or []),
+        "preferred_skills": len(parsed_data.get("preferred_skills") or []),
+        "responsibilities": len(parsed_data.get("responsibilities") or [])
+    })
+    db.commit()
+
+def start_import(db: Session, import_id: str) -> Optional[JobApplicationImport]:
+    """
+    Mark an import as processing. Returns None if it no longer exists or has already finished.
+    """
+    job_import = db.get(JobApplicationImport, import_id)
+    if job_import is None or job_import.status in ("completed", "failed"):
+        return None
+
+    job_import.status = "processing"
+    db.commit()
+    return job_import
+
+def import_progress(job_import: JobApplicationImport) -> Dict[str, Any]:
+    return {
+        "import_id": job_import.id,
+        "status": job_import.status,
+        "processed": job_import.processed,
+        "created": job_import.created,
+        "duplicates": job_import.duplicates,
+        "failed": job_import.failed
+    }
+
+def schedule_import_parses(db: Session, job_application_ids: List[str]):
+    """
+    Queue the parses of imported job applications after those already
+    queued, spaced so that all imports together start no more than
+    IMPORT_PARSE_RATE_PER_MINUTE of them
+    """
+    interval = timedelta(seconds=60 / settings.IMPORT_PARSE_RATE_PER_MINUTE)
+    start = datetime.now(timezone.utc)
+    latest = db.query(func.max(QueuedTask.run_after)).filter(
+        QueuedTask.task_type == PARSE_JOB_DESCRIPTION_IMPORT,
+        QueuedTask.status == TaskStatus.PENDING
+    ).scalar()
+    if latest is not None:
+        # SQLite returns timestamps without their time zone
+        if latest.tzinfo is None:
+            latest = latest.replace(tzinfo=timezone.utc)
+        start = max(start, latest + interval)
+
+    for index, job_application_id in enumerate(job_application_ids):
+        TaskQueue.enqueue(
+            db, PARSE_JOB_DESCRIPTION_IMPORT, {"job_application_id": job_application_id},
+            run_after=start + index * interval
+        )
+
+def save_import_batch(db: Session, import_id: str, entries: List[ImportEntry]) -> Optional[Dict[str, Any]]:
+    """
+    Insert a batch of imported rows, skipping duplicates of the user's job
+    applications and of earlier rows, and save the progress of the import
+    in the same transaction
+
+    Returns:
+        Progress of the import, or None if it no longer exists
+    """
+    job_import = db.get(JobApplicationImport, import_id)
+    if job_import is None:
+        return None
+
+    rows = [
+        (row, normalize_job_url(row.job_url), hash_description(row.job_description))
+        for _, row in entries if not isinstance(row, str)
+    ]
+    errors = [{"row": number, "error": row} for number, row in entries if isinstance(row, str)]
+
+    # Keys taken by the user's applications, including earlier batches of this import
+    url_keys = {url_key for _, url_key, _ in rows if url_key}
+    description_hashes = {description_hash for _, _, description_hash in rows if description_hash}
+    seen_urls = set()
+    seen_descriptions = set()
+    if url_keys or description_hashes:
+        existing = db.query(JobApplication.job_url_key, JobApplication.description_hash).filter(
+            JobApplication.user_id == job_import.user_id,
+            or_(
+                JobApplication.job_url_key.in_(url_keys),
+                JobApplication.description_hash.in_(description_hashes)
+            )
+        )
+        for url_key, description_hash in existing:
+            seen_urls.add(url_key)
+            seen_descriptions.add(description_hash)
+
+    job_applications = []
+    for row, url_key, description_hash in rows:
+        if (url_key and url_key in seen_urls) or (description_hash and description_hash in seen_descriptions):
+            continue
+        seen_urls.add(url_key)
+        seen_descriptions.add(description_hash)
+        job_applications.append(JobApplication(
+            id=generate_uuid(),
+            user_id=job_import.user_id,
+            job_title=row.job_title,
+            company_name=row.company_name,
+            job_description=row.job_description,
+            job_url=row.job_url,
+            job_location=row.job_location,
+            salary_range=row.salary_range,
+            status=ApplicationStatus(row.status) if row.status else ApplicationStatus.PLANNING,
+            applied_date=row.applied_date,
+            notes=row.notes,
+            job_url_key=url_key,
+            description_hash=description_hash
+        ))
+
+    if job_applications:
+        db.add_all(job_applications)
+        dashboard_stats.record_applications_created(db, job_import.user_id, job_applications)
+        schedule_import_parses(db, [job_application.id for job_application in job_applications])
+
+    job_import.processed += len(entries)
+    job_import.created += len(job_applications)
+    job_import.duplicates += len(rows) - len(job_applications)
+    job_import.failed += len(errors)
+    kept_errors = job_import.errors or []
+    if errors and len(kept_errors) < settings.IMPORT_MAX_ERRORS:
+        job_import.errors = kept_errors + errors[:settings.IMPORT_MAX_ERRORS - len(kept_errors)]
+
+    progress = import_progress(job_import)
+    record_event(db, job_import.user_id, "job_application_import.progress", progress)
+    db.commit()
+    return progress
+
+def finish_import(db: Session, import_id: str, error: Optional[str] = None):
+    """
+    Mark an import as completed, or as failed with an error, and release
+    its file to the blob sweep
+    """
+    job_import = db.get(JobApplicationImport, import_id)
+    if job_import is None or job_import.status in ("completed", "failed"):
+        return
+
+    job_import.status = "failed" if error else "completed"
+    job_import.error = error
+    job_import.completed_at = datetime.now(timezone.utc)
+    release_blobs(db, [job_import.file_key])
+    TaskQueue.enqueue(db, SWEEP_BLOBS, {"keys": [job_import.file_key]})
+    record_event(db, job_import.user_id, "job_application_import.progress", import_progress(job_import))
+    db.commit()
+
+async def parse_resume_task(payload: Dict[str, Any]):
+    """
+    Queue task to parse a resume
+    """
+    resume_id = payload["resume_id"]
+
+    # Update resume status to processing
+    resume = await write_queue.run(start_resume_parse, resume_id)
+    if not resume:
+        return
+    if resume.file_key is None:
+        # Its file was missing when uploads moved to blob storage
+        await write_queue.run(mark_resume_failed, resume_id)
+        return
+
+    # Parse the resume; no connection is held while it runs
+    try:
+        with storage.open(resume.file_key) as file:
+            parsed_data = await ResumeParser.parse_stream(file, resume.file_type)
+    except (FileNotFoundError, UnreadableResumeError) as e:
+        # Retrying cannot make the file readable; the failure handler marks the resume failed
+        raise PermanentTaskError(str(e)) from e
+
+    # Save parsed data
+    await write_queue.run(save_parsed_resume, resume_id, parsed_data)
+
+async def parse_resume_failed(payload: Dict[str, Any]):
+    """
+    Mark a resume as failed once its parse task has been dead-lettered
+    """
+    await write_queue.run(mark_resume_failed, payload["resume_id"])
+
+async def parse_job_description_task(payload: Dict[str, Any]):
+    """
+    Queue task to parse a job description
+    """
+    job_application_id = payload["job_application_id"]
+
+    # Get the job description from the database
+    job_application = await asyncio.to_thread(get_job_description, job_application_id)
+    if not job_application:
+        return
+
+    # Parse the job description
+    parsed_data = await OpenAIService.parse_job_description(job_application.job_description)
+
+    # Save parsed data
+    await write_queue.run(save_parsed_job_description, job_application_id, parsed_data)
+
+async def sweep_blobs_task(payload: Dict[str, Any]):
+    """
+    Queue task to delete released blobs. A blob referenced again since it
+    was released, e.g. by an upload of the same file, is kept.
+    """
+    await write_queue.run(delete_unreferenced_blobs, payload["keys"])
+
+async def import_job_applications_task(payload: Dict[str, Any]):
+    """
+    Queue task to import an uploaded file of job applications, one
+    committed batch of rows at a time
+    """
+    import_id = payload["import_id"]
+
+    job_import = await write_queue.run(start_import, import_id)
+    if not job_import:
+        return
+
+    # Rows saved by an earlier attempt are skipped; only one batch is held in memory
+    with storage.open(job_import.file_key) as file:
+        batches = read_import_batches(file, job_import.file_format, settings.IMPORT_BATCH_SIZE, job_import.processed)
+        while batch := await asyncio.to_thread(next, batches, None):
+            await write_queue.run(save_import_batch, import_id, batch)
+
+    await write_queue.run(finish_import, import_id)
+
+async def import_job_applications_failed(payload: Dict[str, Any]):
+    """
+    Mark an import as failed once its task has been dead-lettered. Rows
+    saved before the failure are kept.
+    """
+    await write_queue.run(finish_import, payload["import_id"], "The file could not be imported")
+
+# Registered task handlers
+TASK_HANDLERS = {
+    PARSE_RESUME: parse_resume_task,
+    PARSE_RESUME_BULK: parse_resume_task,
+    PARSE_JOB_DESCRIPTION: parse_job_description_task,
+    SWEEP_BLOBS: sweep_blobs_task,
+    IMPORT_JOB_APPLICATIONS: import_job_applications_task,
+    PARSE_JOB_DESCRIPTION_IMPORT: parse_job_description_task,
+}
+
+# Handlers run when a task is moved to the dead-letter state
+TASK_FAILURE_HANDLERS = {
+    PARSE_RESUME: parse_resume_failed,
+    PARSE_RESUME_BULK: parse_resume_failed,
+    IMPORT_JOB_APPLICATIONS: import_job_applications_failed,
+}
+
+# Maximum number of concurrently running tasks of each type per process
+TASK_CONCURRENCY = {
+    PARSE_RESUME: settings.PARSE_RESUME_CONCURRENCY,
+    PARSE_RESUME_BULK: settings.BULK_PARSE_RESUME_CONCURRENCY,
+    PARSE_JOB_DESCRIPTION: settings.PARSE_JOB_DESCRIPTION_CONCURRENCY,
+    SWEEP_BLOBS: settings.SWEEP_BLOBS_CONCURRENCY,
+    IMPORT_JOB_APPLICATIONS: settings.IMPORT_JOB_APPLICATIONS_CONCURRENCY,
+    PARSE_JOB_DESCRIPTION_IMPORT: settings.IMPORT_PARSE_JOB_DESCRIPTION_CONCURRENCY,
+}
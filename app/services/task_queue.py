@@ -0,0 +1,323 @@
+import asyncio
+import logging
+import random
+import socket
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.task_queue import QueuedTask, TaskStatus
+from app.services.write_queue import write_queue
+from app.utils.security import generate_uuid
+
+logger = logging.getLogger(__name__)
+
+# Number of candidate rows fetched per claim attempt
+CLAIM_BATCH_SIZE = 5
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+class PermanentTaskError(Exception):
+    """
+    Raised by a task handler when retrying cannot succeed, e.g. for a
+    corrupt file. The task is dead-lettered on its first failure.
+    """
+
+class TaskQueue:
+    """
+    Durable work queue stored in the application database.
+
+    Tasks are claimed with a lease (visibility timeout). A task whose lease
+    expires without being completed becomes claimable again, so work survives
+    worker crashes and restarts.
+    """
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        task_type: str,
+        payload: Dict[str, Any],
+        run_after: Optional[datetime] = None,
+        max_attempts: Optional[int] = None
+    ) -> QueuedTask:
+        """
+        Add a task to the queue. The task is not committed, so it becomes
+        visible to workers together with the caller's own changes.
+
+        Args:
+            db: Database session
+            task_type: Registered task type
+            payload: JSON-serialisable task arguments
+            run_after: Earliest time the task may run
+            max_attempts: Attempts before the task is dead-lettered
+
+        Returns:
+            The queued task
+        """
+        task = QueuedTask(
+            id=generate_uuid(),
+            task_type=task_type,
+            payload=payload,
+            status=TaskStatus.PENDING,
+            attempts=0,
+            max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+            run_after=run_after or _utcnow()
+        )
+        db.add(task)
+        return task
+
+    @staticmethod
+    def claim(db: Session, task_type: str, worker_id: str, lease_seconds: int) -> Optional[QueuedTask]:
+        """
+        Claim the next runnable task of a given type
+
+        Args:
+            db: Database session
+            task_type: Task type to claim
+            worker_id: Identifier of the claiming worker
+            lease_seconds: Visibility timeout for the claimed task
+
+        Returns:
+            The claimed task, or None if nothing is runnable
+        """
+        now = _utcnow()
+        claimable = and_(
+            QueuedTask.task_type == task_type,
+            or_(
+                and_(QueuedTask.status == TaskStatus.PENDING, QueuedTask.run_after <= now),
+                and_(QueuedTask.status == TaskStatus.RUNNING, QueuedTask.lease_expires_at < now)
+            )
+        )
+
+        candidates = db.query(QueuedTask.id).filter(claimable).order_by(
+            QueuedTask.run_after
+        ).limit(CLAIM_BATCH_SIZE).with_for_update(skip_locked=True).all()
+
+        for (task_id,) in candidates:
+            # The conditional update only succeeds for one worker per task
+            claimed = db.query(QueuedTask).filter(QueuedTask.id == task_id, claimable).update(
+                {
+                    QueuedTask.status: TaskStatus.RUNNING,
+                    QueuedTask.locked_by: worker_id,
+                    QueuedTask.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                    QueuedTask.attempts: QueuedTask.attempts + 1
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            if claimed:
+                return db.get(QueuedTask, task_id)
+
+        db.commit()
+        return None
+
+    @staticmethod
+    def extend_lease(db: Session, task_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """
+        Extend the lease on a running task. Returns False if the lease was lost.
+        """
+        extended = db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.locked_by == worker_id,
+            QueuedTask.status == TaskStatus.RUNNING
+        ).update(
+            {QueuedTask.lease_expires_at: _utcnow() + timedelta(seconds=lease_seconds)},
+            synchronize_session=False
+        )
+        db.commit()
+        return bool(extended)
+
+    @staticmethod
+    def complete(db: Session, task_id: str, worker_id: str) -> None:
+        """
+        Remove a successfully completed task from the queue
+        """
+        db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.locked_by == worker_id
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, task_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt. The task is retried with exponential backoff
+        until it runs out of attempts, then moved to the dead-letter state.
+
+        Args:
+            db: Database session
+            task_id: ID of the failed task
+            worker_id: Identifier of the worker holding the lease
+            error: Why the attempt failed
+            retry: Whether the task may be retried; if False it is dead-lettered at once
+
+        Returns:
+            True if the task was dead-lettered
+        """
+        task = db.query(QueuedTask).filter(
+            QueuedTask.id == task_id,
+            QueuedTask.locked_by == worker_id
+        ).first()
+        if task is None:
+            return False
+
+        task.last_error = error
+        task.locked_by = None
+        task.lease_expires_at = None
+
+        if not retry or task.attempts >= task.max_attempts:
+            task.status = TaskStatus.DEAD
+        else:
+            backoff = min(
+                settings.TASK_RETRY_BACKOFF_SECONDS * 2 ** (task.attempts - 1),
+                settings.TASK_RETRY_BACKOFF_MAX_SECONDS
+            )
+            task.status = TaskStatus.PENDING
+            task.run_after = _utcnow() + timedelta(seconds=backoff * random.uniform(0.8, 1.2))
+
+        db.commit()
+        return task.status == TaskStatus.DEAD
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class TaskWorkerPool:
+    """
+    Pool of asyncio workers that pull tasks from the queue.
+
+    Each task type gets its own fixed number of workers, which bounds how
+    many tasks of that type run concurrently in this process.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, TaskHandler],
+        concurrency: Dict[str, int],
+        failure_handlers: Optional[Dict[str, TaskHandler]] = None,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize the worker pool
+
+        Args:
+            handlers: Coroutine to run for each task type
+            concurrency: Number of concurrent workers per task type
+            failure_handlers: Coroutine to run when a task is dead-lettered
+            worker_id: Identifier recorded on claimed tasks
+        """
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.failure_handlers = failure_handlers or {}
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = None
+        self._workers = []
+
+    async def start(self):
+        """
+        Start the workers on the running event loop
+        """
+        self._stopping = asyncio.Event()
+        for task_type, count in self.concurrency.items():
+            for index in range(count):
+                worker_id = f"{self.worker_id}:{task_type}:{index}"
+                self._workers.append(asyncio.create_task(self._run_worker(task_type, worker_id)))
+        logger.info(f"Started {len(self._workers)} task workers ({self.worker_id})")
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Stop claiming new tasks and wait for running tasks to finish.
+        Tasks still running after the timeout are cancelled; their leases
+        expire and they are picked up again by another worker.
+        """
+        if not self._workers:
+            return
+        self._stopping.set()
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+
+    async def _run_worker(self, task_type: str, worker_id: str):
+        while not self._stopping.is_set():
+            try:
+                await self._run_once(task_type, worker_id)
+            except Exception:
+                # A task whose completion or failure could not be recorded
+                # keeps its lease, and is retried once the lease expires
+                logger.exception(f"Error running {task_type} task")
+                await self._wait_for_poll()
+
+    async def _wait_for_poll(self):
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=settings.TASK_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_once(self, task_type: str, worker_id: str):
+        try:
+            task = await write_queue.run(TaskQueue.claim, task_type, worker_id, settings.TASK_LEASE_SECONDS)
+        except Exception as e:
+            logger.error(f"Error claiming {task_type} task: {str(e)}")
+            task = None
+
+        if task is None:
+            await self._wait_for_poll()
+            return
+
+        await self._execute(task, worker_id)
+
+    async def _execute(self, task: QueuedTask, worker_id: str):
+        if task.attempts > task.max_attempts:
+            # The lease of the final attempt expired without the task finishing
+            await self._handle_failure(task, worker_id, "Lease expired on final attempt")
+            return
+
+        handler = asyncio.create_task(self.handlers[task.task_type](task.payload))
+        heartbeat = asyncio.create_task(self._heartbeat(task.id, worker_id))
+        try:
+            await asyncio.wait([handler, heartbeat], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            heartbeat.cancel()
+            if not handler.done():
+                handler.cancel()
+            await asyncio.gather(handler, heartbeat, return_exceptions=True)
+
+        if handler.cancelled():
+            # Another worker has claimed the task since its lease was lost,
+            # so it is neither completed nor failed here
+            logger.warning(f"Lease lost on task {task.id} ({task.task_type}), cancelled attempt {task.attempts}")
+            return
+        if handler.exception() is not None:
+            e = handler.exception()
+            logger.warning(f"Task {task.id} ({task.task_type}) failed on attempt {task.attempts}: {str(e)}")
+            await self._handle_failure(task, worker_id, str(e), retry=not isinstance(e, PermanentTaskError))
+        else:
+            await write_queue.run(TaskQueue.complete, task.id, worker_id)
+
+    async def _handle_failure(self, task: QueuedTask, worker_id: str, error: str, retry: bool = True):
+        dead = await write_queue.run(TaskQueue.fail, task.id, worker_id, error, retry)
+        if dead and task.task_type in self.failure_handlers:
+            try:
+                await self.failure_handlers[task.task_type](task.payload)
+            except Exception as e:
+                logger.error(f"Failure handler for task {task.id} failed: {str(e)}")
+
+    async def _heartbeat(self, task_id: str, worker_id: str):
+        """
+        Extend the lease on a task while it runs. Returns once the lease is lost.
+        """
+        interval = settings.TASK_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                extended = await write_queue.run(TaskQueue.extend_lease, task_id, worker_id, settings.TASK_LEASE_SECONDS)
+            except Exception as e:
+                logger.error(f"Error extending lease on task {task_id}: {str(e)}")
+                continue
+            if not extended:
+                return
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import WriteSessionLocal
+
+T = TypeVar("T")
+
+# Maximum number of queued writes applied per thread hop
+WRITE_BATCH_SIZE = 32
+
+class WriteQueue:
+    """
+    Serializes database writes from background work onto one writer.
+
+    SQLite allows a single writer at a time. Feeding writes through one
+    queue turns lock contention between workers into FIFO ordering on a
+    single connection. Until the queue is started, writes run directly in
+    a worker thread, which is what other databases want.
+    """
+
+    def __init__(self, session_factory: sessionmaker = WriteSessionLocal):
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """
+        Start the writer on the running event loop
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Wait for queued writes to finish, then stop the writer
+        """
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._queue = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run fn(db, *args) with a write session and return its result.
+        fn commits its own changes.
+        """
+        if self._task is None:
+            return await asyncio.to_thread(self._apply, fn, args)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, args, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            # Take everything already queued so one thread hop applies the batch
+            batch = [await self._queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                outcomes = await asyncio.to_thread(self._apply_batch, batch)
+                for (fn, args, future), (error, result) in zip(batch, outcomes):
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _apply_batch(self, batch: List[tuple]) -> List[Tuple[Optional[Exception], Any]]:
+        outcomes = []
+        for fn, args, future in batch:
+            try:
+                outcomes.append((None, self._apply(fn, args)))
+            except Exception as e:
+                outcomes.append((e, None))
+        return outcomes
+
+    def _apply(self, fn: Callable[..., T], args: tuple) -> T:
+        with self.session_factory() as db:
+            return fn(db, *args)
+
+write_queue = WriteQueue()
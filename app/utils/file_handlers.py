@@ -1,34 +1,58 @@
 import os
-import shutil
-from typing import Optional
+from typing import BinaryIO
 from fastapi import UploadFile, HTTPException
-import uuid
-import mimetypes
+import zipfile
+import magic
 
-from app.config import settings
-
-# Allowed file types and their MIME types
+# Allowed file types and their MIME types.
+# Only formats that ResumeParser can actually extract text from are listed here.
 ALLOWED_EXTENSIONS = {
     'pdf': 'application/pdf',
     'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-    'doc': 'application/msword',
     'txt': 'text/plain',
-    'rtf': 'application/rtf',
 }
 
-def save_upload_file(upload_file: UploadFile, directory: Optional[str] = None) -> tuple[str, str]:
+# Number of leading bytes inspected when sniffing the real format of an upload
+SNIFF_SIZE = 2048
+
+# Chunk size used when copying uploads to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def _matches_extension(file_extension: str, mime_type: str, file: BinaryIO) -> bool:
+    """
+    Checks whether a sniffed MIME type is consistent with the claimed extension.
+    """
+    if file_extension == 'txt':
+        return mime_type.startswith('text/')
+    if file_extension == 'docx' and mime_type == 'application/zip':
+        # Some libmagic builds only recognise the ZIP container; look for the
+        # Word document part before accepting it.
+        try:
+            with zipfile.ZipFile(file) as archive:
+                return 'word/document.xml' in archive.namelist()
+        except zipfile.BadZipFile:
+            return False
+        finally:
+            file.seek(0)
+    return mime_type == ALLOWED_EXTENSIONS[file_extension]
+
+def detect_file_type(filename: str, file: BinaryIO) -> str:
     """
-    Saves an uploaded file to the specified directory and returns the file path.
+    Validates a file by its extension and by the magic bytes at the start of
+    the stream, without writing anything to disk.
     
     Args:
-        upload_file: The uploaded file
-        directory: Optional subdirectory within UPLOAD_DIR
+        filename: Original name of the file
+        file: Seekable file object positioned at the start
     
     Returns:
-        Tuple of (file_path, file_type)
+        The validated file type (extension)
+    
+    Raises:
+        HTTPException: If the file cannot be parsed by any available parser
     """
     # Get file extension
-    file_extension = os.path.splitext(upload_file.filename)[1].lower().lstrip('.')
+    file_extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
     
     # Check if the file type is allowed
     if file_extension not in ALLOWED_EXTENSIONS:
@@ -37,38 +61,55 @@ def save_upload_file(upload_file: UploadFile, directory: Optional[str] = None) -
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS.keys())}"
         )
     
-    # Create a unique filename
-    unique_filename = f"{uuid.uuid4()}_{upload_file.filename}"
+    # Sniff the real format from the first bytes of the stream
+    head = file.read(SNIFF_SIZE)
+    file.seek(0)
+    if not head:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
     
-    # Determine save directory
-    save_dir = settings.UPLOAD_DIR
-    if directory:
-        save_dir = os.path.join(save_dir, directory)
-        os.makedirs(save_dir, exist_ok=True)
+    mime_type = magic.from_buffer(head, mime=True)
+    if not _matches_extension(file_extension, mime_type, file):
+        raise HTTPException(
+            status_code=400,
+            detail=f"File content ({mime_type}) does not match a supported {file_extension.upper()} file"
+        )
     
-    # Create full file path
-    file_path = os.path.join(save_dir, unique_filename)
+    return file_extension
+
+def validate_upload_file(upload_file: UploadFile) -> str:
+    """
+    Validates an uploaded file against the formats ResumeParser supports.
     
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    Args:
+        upload_file: The uploaded file
     
-    return file_path, file_extension
+    Returns:
+        The validated file type (extension)
+    """
+    return detect_file_type(upload_file.filename, upload_file.file)
 
-def remove_file(file_path: str) -> bool:
+def copy_file(source: BinaryIO, destination: BinaryIO, max_size: int) -> int:
     """
-    Removes a file from the filesystem.
+    Copies a file object in chunks, stopping as soon as it exceeds max_size.
     
     Args:
-        file_path: Path to the file
-        
+        source: File object to copy from
+        destination: File object to copy to
+        max_size: Maximum number of bytes allowed
+    
     Returns:
-        True if successful, False otherwise
+        Number of bytes copied
+    
+    Raises:
+        HTTPException: If the source is larger than max_size
     """
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            return True
-        return False
-    except Exception:
-        return False
\ No newline at end of file
+    size = 0
+    while chunk := source.read(COPY_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File is larger than {max_size} bytes"
+            )
+        destination.write(chunk)
+    return size
@@ -0,0 +1,179 @@
+import os
+import re
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.services.storage import StorageBackend
+
+# Chunk size used when the server cannot send the file with sendfile
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def make_etag(key: str) -> str:
+    """
+    Strong ETag for a blob. Keys are content hashes, so the key itself
+    identifies the exact bytes.
+    """
+    return f'"{key}"'
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison)
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    return etag in (value[2:] if value.startswith("W/") else value for value in candidates)
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range header.
+
+    Args:
+        header: Value of the Range header
+        size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) tuple, or None if the whole file should be sent
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        # Multiple or malformed ranges; serving the whole file is allowed
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+class BlobResponse(Response):
+    """
+    Serves a stored blob with strong ETags, conditional requests and single
+    byte ranges. Local blobs are sent with sendfile when the ASGI server
+    supports the zero-copy send extension.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        key: str,
+        size: int,
+        request_headers: Mapping[str, str],
+        media_type: str,
+        filename: Optional[str] = None
+    ):
+        self.storage = storage
+        self.key = key
+        # Only set for responses that carry the file
+        self.media_type = None
+        self.background = None
+        self.body = b""
+        self.offset = 0
+        self.count = 0
+
+        etag = make_etag(key)
+        headers = {
+            "etag": etag,
+            "accept-ranges": "bytes",
+            # Private to the user, and always revalidated (cheaply, via 304)
+            "cache-control": "private, no-cache",
+        }
+        if filename:
+            headers["content-disposition"] = f"inline; filename*=utf-8''{quote(filename)}"
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            self.status_code = 304
+            self.init_headers(headers)
+            return
+
+        byte_range = None
+        if_range = request_headers.get("if-range")
+        if if_range is None or if_range.strip() == etag:
+            try:
+                byte_range = parse_range(request_headers.get("range"), size)
+            except ValueError:
+                self.status_code = 416
+                headers["content-range"] = f"bytes */{size}"
+                self.init_headers(headers)
+                return
+
+        if byte_range is None:
+            self.status_code = 200
+            self.count = size
+        else:
+            start, end = byte_range
+            self.status_code = 206
+            self.offset = start
+            self.count = end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        self.media_type = media_type
+        headers["content-length"] = str(self.count)
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.status_code not in (200, 206) or scope.get("method") == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        path = self.storage.local_path(self.key)
+        if path is not None and "http.response.zerocopysend" in scope.get("extensions", {}):
+            await self._send_zerocopy(path, send)
+        else:
+            await self._send_chunks(send)
+
+    async def _send_zerocopy(self, path: str, send: Send) -> None:
+        fd = await anyio.to_thread.run_sync(os.open, path, os.O_RDONLY)
+        try:
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": fd,
+                "offset": self.offset,
+                "count": self.count,
+            })
+        finally:
+            os.close(fd)
+
+    async def _send_chunks(self, send: Send) -> None:
+        file = await anyio.to_thread.run_sync(self.storage.open, self.key)
+        try:
+            await anyio.to_thread.run_sync(file.seek, self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(file.read, min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await anyio.to_thread.run_sync(file.close)
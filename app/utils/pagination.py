@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, literal, or_
+from sqlalchemy.orm import Query as SQLQuery
+
+from app.config import settings
+
+class PageParams:
+    """
+    Query parameters of a paginated list endpoint
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE)
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def encode_keyset(values: List[Any]) -> str:
+    """
+    Encode the JSON-serializable sort key of the last row of a page as an
+    opaque cursor
+    """
+    data = json.dumps(values)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+def decode_keyset(cursor: str) -> List[Any]:
+    """
+    Decode a cursor created by encode_keyset
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+        if not isinstance(values, list):
+            raise ValueError(values)
+        return values
+    except (binascii.Error, ValueError, TypeError):
+        raise invalid_cursor()
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor
+    """
+    return encode_keyset([created_at.isoformat(), id])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor created by encode_cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, id = decode_keyset(cursor)
+        return datetime.fromisoformat(created_at), str(id)
+    except (ValueError, TypeError):
+        raise invalid_cursor()
+
+def _created_at_bound(query: SQLQuery, value: datetime):
+    if query.session.get_bind().dialect.name == "sqlite":
+        # SQLite stores server-default timestamps as text without microseconds,
+        # while bound datetimes always get them; compare in the stored format
+        # so rows created in the same second are not skipped or repeated
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text)
+    return value
+
+def paginate(query: SQLQuery, model, params: PageParams) -> Dict[str, Any]:
+    """
+    Apply keyset pagination on (created_at, id), newest first.
+
+    Seeking past the cursor instead of using OFFSET keeps the cost of a page
+    the same however deep the client pages.
+
+    Args:
+        query: Filtered query of the rows to list
+        model: Model being listed; must have created_at and id columns
+        params: Cursor and page size
+
+    Returns:
+        Page with the items and the cursor of the next page
+    """
+    if params.cursor:
+        created_at, id = decode_cursor(params.cursor)
+        bound = _created_at_bound(query, created_at)
+        query = query.filter(or_(
+            model.created_at < bound,
+            and_(model.created_at == bound, model.id < id)
+        ))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1).all()
+    items = rows[:params.limit]
+    next_cursor = None
+    if len(rows) > params.limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": items, "next_cursor": next_cursor}
+
+def merge_pages(pages: List[Dict[str, Any]], params: PageParams) -> Dict[str, Any]:
+    """
+    Merge pages of serialized items of several tables, each fetched with the
+    same cursor and page size, into one page of the newest items
+
+    Args:
+        pages: Pages returned for the same params, with created_at and id in their items
+        params: Cursor and page size
+
+    Returns:
+        Page with the items and the cursor of the next page
+    """
+    items = sorted(
+        (item for page in pages for item in page["items"]),
+        key=lambda item: (item["created_at"], item["id"]),
+        reverse=True
+    )
+    next_cursor = None
+    if len(items) > params.limit or any(page["next_cursor"] for page in pages):
+        items = items[:params.limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,66 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query, load_only
+
+from app.utils.pagination import PageParams, paginate
+
+class ListProjection:
+    """
+    Columns loaded by a list endpoint: a fixed set of summary columns plus
+    large columns that are only loaded when the client asks for them with
+    the `fields` query parameter.
+    """
+
+    def __init__(self, model, summary: Sequence[str], optional: Sequence[str]):
+        self.model = model
+        self.summary = list(summary)
+        self.optional = list(optional)
+
+    def parse_fields(self, fields: Optional[str]) -> List[str]:
+        """
+        Parse a comma-separated `fields` parameter
+
+        Raises:
+            HTTPException: If a field cannot be requested
+        """
+        if not fields:
+            return []
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in self.optional]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(self.optional)}"
+            )
+        return requested
+
+    def apply(self, query: Query, fields: Sequence[str]) -> Query:
+        """
+        Load only the summary columns and the requested fields
+        """
+        columns = [getattr(self.model, name) for name in (*self.summary, *fields)]
+        return query.options(load_only(*columns))
+
+    def serialize(self, obj, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        Read the loaded attributes of a row without touching deferred ones
+        """
+        return {name: getattr(obj, name) for name in (*self.summary, *fields)}
+
+    def paginate(self, query: Query, params: PageParams, fields: Optional[str]) -> Dict[str, Any]:
+        """
+        Get one page of the projected rows
+
+        Args:
+            query: Filtered query of the rows to list
+            params: Cursor and page size
+            fields: Comma-separated optional fields to include
+
+        Returns:
+            Page with the serialized items and the cursor of the next page
+        """
+        requested = self.parse_fields(fields)
+        result = paginate(self.apply(query, requested), self.model, params)
+        result["items"] = [self.serialize(item, requested) for item in result["items"]]
+        return result
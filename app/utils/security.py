@@ -1,23 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 import uuid
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.utils.user_cache import user_cache
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; hashes made with a different cost are flagged for rehashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is CPU-bound, so it runs on a bounded pool instead of the event loop
+password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
 
 # OAuth2 setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/token", auto_error=False)
 
 # Password verification and hashing
 def verify_password(plain_password, hashed_password):
@@ -26,11 +34,28 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def hash_password(password: str) -> str:
+    """
+    Hash a password on the password hashing pool
+    """
+    return await asyncio.get_running_loop().run_in_executor(password_executor, get_password_hash, password)
+
 # User authentication
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        return False
+
+    valid, new_hash = await asyncio.get_running_loop().run_in_executor(
+        password_executor, pwd_context.verify_and_update, password, user.hashed_password
+    )
+    if not valid:
         return False
+
+    # Migrate the hash to the current cost while the password is at hand
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 # Token creation
@@ -41,27 +66,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", generate_uuid())
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-# Get current user from token
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+# Get token data from token
+def decode_token(token: str) -> Optional[TokenData]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+            return None
+        return TokenData(username=username, token_id=payload.get("jti"))
     except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.username == token_data.username).first()
+        return None
+
+# Get user from token
+async def get_user_from_token(db: AsyncSession, token: str) -> Optional[User]:
+    token_data = decode_token(token)
+    if token_data is None:
+        return None
+    return await user_cache.get_or_load(
+        token_data.username,
+        token_data.token_id or "",
+        lambda: db.scalar(select(User).where(User.username == token_data.username))
+    )
+
+# Get current user from token
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_from_token(db, token)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 # Get current active user
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.config import settings
+
+# Number of tracked keys above which idle ones are dropped
+ATTEMPT_LIMITER_PRUNE_SIZE = 10000
+
+class AttemptLimiter:
+    """
+    Per-process sliding-window limit on attempts per key, such as an
+    account or a client IP. Checking it costs a dictionary lookup, so
+    bursts are rejected before any expensive work is done.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: float):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._attempts: Dict[str, Deque[float]] = {}
+        self._mutex = threading.Lock()
+
+    def hit(self, key: str) -> Optional[float]:
+        """
+        Record an attempt
+
+        Returns:
+            None if the attempt is allowed, otherwise the seconds until the
+            next one will be
+        """
+        now = time.monotonic()
+        with self._mutex:
+            if len(self._attempts) > ATTEMPT_LIMITER_PRUNE_SIZE:
+                self._attempts = {
+                    k: attempts for k, attempts in self._attempts.items()
+                    if attempts and attempts[-1] > now - self.window_seconds
+                }
+
+            attempts = self._attempts.setdefault(key, deque())
+            while attempts and attempts[0] <= now - self.window_seconds:
+                attempts.popleft()
+            if len(attempts) >= self.max_attempts:
+                return attempts[0] + self.window_seconds - now
+            attempts.append(now)
+            return None
+
+    def undo(self, key: str):
+        """
+        Take back the latest attempt of a key, e.g. one that turned out to
+        be a successful login, so only failures count towards the limit
+        """
+        with self._mutex:
+            attempts = self._attempts.get(key)
+            if attempts:
+                attempts.pop()
+
+    def reset(self, key: str):
+        """
+        Forget the attempts of a key, e.g. after a successful login
+        """
+        with self._mutex:
+            self._attempts.pop(key, None)
+
+# Login attempts per account and per client IP
+account_login_limiter = AttemptLimiter(settings.LOGIN_MAX_ATTEMPTS_PER_ACCOUNT, settings.LOGIN_ATTEMPT_WINDOW_SECONDS)
+ip_login_limiter = AttemptLimiter(settings.LOGIN_MAX_ATTEMPTS_PER_IP, settings.LOGIN_ATTEMPT_WINDOW_SECONDS)
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+# Column attributes copied into a snapshot
+USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+CacheKey = Tuple[str, str]
+
+class UserCache:
+    """
+    Per-process cache of authenticated users, keyed by username and token ID.
+
+    Entries are column snapshots rather than ORM instances, so every request
+    gets its own detached User and no session state is shared between
+    concurrent requests. Entries expire after a TTL, which bounds how long a
+    change made by another process goes unnoticed.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[CacheKey, Tuple[float, Dict[str, Any]]] = {}
+        self._loading: Dict[CacheKey, asyncio.Lock] = {}
+        # Invalidation can come from handlers running in the thread pool
+        self._mutex = threading.Lock()
+        self._invalidations = 0
+
+    def get(self, username: str, token_id: str) -> Optional[User]:
+        """
+        Get a cached user, or None on a miss
+        """
+        with self._mutex:
+            entry = self._entries.get((username, token_id))
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if expires <= time.monotonic():
+                del self._entries[(username, token_id)]
+                return None
+
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, username: str, token_id: str, user: User, invalidations: Optional[int] = None):
+        """
+        Cache a user. When given the invalidation count seen before the user
+        was loaded, the user is not cached if an invalidation happened since.
+        """
+        snapshot = {key: getattr(user, key) for key in USER_COLUMNS}
+        with self._mutex:
+            if invalidations is not None and invalidations != self._invalidations:
+                return
+            self._entries.pop((username, token_id), None)
+            if len(self._entries) >= self.max_size:
+                now = time.monotonic()
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+                # Still full: drop the oldest entry
+                if len(self._entries) >= self.max_size:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[(username, token_id)] = (time.monotonic() + self.ttl_seconds, snapshot)
+
+    def invalidate(self, username: str):
+        """
+        Drop every cached entry of a user
+        """
+        with self._mutex:
+            self._invalidations += 1
+            self._entries = {key: entry for key, entry in self._entries.items() if key[0] != username}
+
+    async def get_or_load(
+        self,
+        username: str,
+        token_id: str,
+        load: Callable[[], Awaitable[Optional[User]]]
+    ) -> Optional[User]:
+        """
+        Get a cached user, loading it on a miss. Concurrent misses for the
+        same key wait for a single load.
+        """
+        if self.ttl_seconds <= 0:
+            return await load()
+
+        user = self.get(username, token_id)
+        if user is not None:
+            return user
+
+        key = (username, token_id)
+        lock = self._loading.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                user = self.get(username, token_id)
+                if user is None:
+                    invalidations = self._invalidations
+                    user = await load()
+                    if user is not None:
+                        self.set(username, token_id, user, invalidations)
+                return user
+        finally:
+            if not lock.locked():
+                self._loading.pop(key, None)
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_SIZE)
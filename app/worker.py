@@ -0,0 +1,101 @@
+"""
+Standalone task worker for JobCraftAI
+
+Runs the resume and job description parsing tasks from the shared task
+queue outside the API process, so parsing capacity can be scaled
+separately from the web servers:
+
+    python -m app.worker --concurrency parse_resume=4
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.database import engine, Base, SQLITE_PRODUCTION
+# Import every model so all mappers and tables are registered
+from app.models import user, resume, job_application, linkedin, cover_letter, resume_optimization, task_queue, event, blob, stats, search, archive, job_import
+from app.services.task_queue import TaskWorkerPool
+from app.services.write_queue import write_queue
+from app.services.task_handlers import TASK_HANDLERS, TASK_FAILURE_HANDLERS, TASK_CONCURRENCY
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def parse_concurrency(values: List[str]) -> Dict[str, int]:
+    """
+    Parse TASK_TYPE=N overrides from the command line
+    """
+    concurrency = {}
+    for value in values:
+        task_type, _, count = value.partition("=")
+        if task_type not in TASK_HANDLERS or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid concurrency override: {value}")
+        concurrency[task_type] = int(count)
+    return concurrency
+
+async def run(concurrency: Dict[str, int], drain_timeout: Optional[float]):
+    """
+    Run the worker pool until SIGTERM or SIGINT, then drain running tasks
+    """
+    pool = TaskWorkerPool(TASK_HANDLERS, concurrency, TASK_FAILURE_HANDLERS)
+    shutdown = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, shutdown.set)
+
+    if SQLITE_PRODUCTION:
+        await write_queue.start()
+    await pool.start()
+    await shutdown.wait()
+
+    logger.info("Shutdown requested, waiting for running tasks to finish")
+    await pool.stop(timeout=drain_timeout)
+    await write_queue.stop()
+    logger.info("Worker stopped")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run JobCraftAI task workers")
+    parser.add_argument(
+        "--concurrency",
+        action="append",
+        default=[],
+        metavar="TASK_TYPE=N",
+        help="Number of concurrent workers for a task type (repeatable)"
+    )
+    parser.add_argument(
+        "--task-type",
+        action="append",
+        dest="task_types",
+        choices=sorted(TASK_HANDLERS),
+        help="Only run these task types (repeatable, default: all)"
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=settings.WORKER_DRAIN_TIMEOUT,
+        help="Seconds to wait for running tasks on shutdown"
+    )
+    args = parser.parse_args(argv)
+
+    concurrency = dict(TASK_CONCURRENCY)
+    try:
+        concurrency.update(parse_concurrency(args.concurrency))
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.task_types:
+        concurrency = {task_type: concurrency[task_type] for task_type in args.task_types}
+
+    # Create all tables in the database
+    # Comment this out if using Alembic migrations
+    Base.metadata.create_all(bind=engine)
+
+    asyncio.run(run(concurrency, args.drain_timeout))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark of mixed read/write throughput on SQLite
+
+Runs list-page readers alongside writers that save parse results, once
+with the default SQLite setup (rollback journal, one shared pool) and once
+with the production profile (WAL and tuned pragmas, a query-only read pool
+and a single writer fed by the write queue), and prints the throughput of
+each:
+
+    python -m benchmarks.sqlite_profile
+    python -m benchmarks.sqlite_profile --readers 16 --writers 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, use_sqlite_profile
+from app.models import user, resume, job_application, linkedin, cover_letter, resume_optimization, task_queue, event, blob, stats, search, archive, job_import
+from app.models.event import UserEvent
+from app.models.job_application import JobApplication
+from app.models.user import User
+from app.services.write_queue import WriteQueue
+from app.utils.security import generate_uuid
+
+def seed(session_factory: sessionmaker, users: int, applications: int) -> Dict[str, List[str]]:
+    """
+    Create users with job applications
+
+    Returns:
+        Job application IDs per user ID
+    """
+    owned = {}
+    with session_factory() as db:
+        for _ in range(users):
+            owner = User(id=generate_uuid(), email=f"{generate_uuid()}@bench.local", username=generate_uuid())
+            db.add(owner)
+            owned[owner.id] = []
+            for i in range(applications):
+                owned[owner.id].append(generate_uuid())
+                db.add(JobApplication(id=owned[owner.id][-1], user_id=owner.id, job_title=f"Engineer {i}",
+                                      company_name=f"Company {i}", job_description="Build services. " * 100))
+        db.commit()
+    return owned
+
+def read_page(db: Session, user_id: str):
+    """
+    The job applications list query
+    """
+    db.query(JobApplication.id, JobApplication.job_title, JobApplication.created_at).filter(
+        JobApplication.user_id == user_id
+    ).order_by(JobApplication.created_at.desc(), JobApplication.id.desc()).limit(50).all()
+
+def save_parse_result(db: Session, user_id: str, job_application_id: str):
+    """
+    A parse task's write: the parsed details and the event announcing them
+    """
+    db.query(JobApplication).filter(JobApplication.id == job_application_id).update(
+        {JobApplication.parsed_job_details: {"required_skills": ["Python"] * 20}},
+        synchronize_session=False
+    )
+    db.add(UserEvent(user_id=user_id, event_type="job_application.parsed", data={"job_application_id": job_application_id}))
+    db.commit()
+
+async def run(
+    read_sessions: sessionmaker,
+    write: Callable[..., asyncio.Future],
+    owned: Dict[str, List[str]],
+    readers: int,
+    writers: int,
+    seconds: float
+) -> Dict[str, float]:
+    """
+    Run readers and writers concurrently for a fixed time
+    """
+    deadline = time.perf_counter() + seconds
+    read_latencies = []
+    counts = {"writes": 0, "errors": 0}
+    user_ids = list(owned)
+
+    def read(user_id: str):
+        with read_sessions() as db:
+            read_page(db, user_id)
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(read, random.choice(user_ids))
+            except OperationalError:
+                counts["errors"] += 1
+                continue
+            read_latencies.append(time.perf_counter() - start)
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            user_id = random.choice(user_ids)
+            try:
+                await write(save_parse_result, user_id, random.choice(owned[user_id]))
+            except OperationalError:
+                counts["errors"] += 1
+                continue
+            counts["writes"] += 1
+
+    await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+    return {
+        "reads_per_second": len(read_latencies) / seconds,
+        "writes_per_second": counts["writes"] / seconds,
+        "read_p95_ms": statistics.quantiles(read_latencies, n=20)[-1] * 1000 if len(read_latencies) > 1 else 0.0,
+        "errors": counts["errors"],
+    }
+
+async def run_default(database_url: str, owned: Dict[str, List[str]], args) -> Dict[str, float]:
+    engine = create_engine(database_url, connect_args={"check_same_thread": False},
+                           pool_size=args.readers + args.writers)
+    sessions = sessionmaker(bind=engine)
+
+    def apply(fn, *fn_args):
+        with sessions() as db:
+            return fn(db, *fn_args)
+
+    async def write(fn, *fn_args):
+        return await asyncio.to_thread(apply, fn, *fn_args)
+
+    try:
+        return await run(sessions, write, owned, args.readers, args.writers, args.seconds)
+    finally:
+        engine.dispose()
+
+async def run_production(database_url: str, owned: Dict[str, List[str]], args) -> Dict[str, float]:
+    connect_args = {"check_same_thread": False}
+    read_engine = create_engine(database_url, connect_args=connect_args, pool_size=args.readers)
+    use_sqlite_profile(read_engine, read_only=True)
+    write_engine = create_engine(database_url, connect_args=connect_args, pool_size=1, max_overflow=0)
+    use_sqlite_profile(write_engine)
+
+    write_queue = WriteQueue(sessionmaker(bind=write_engine, expire_on_commit=False))
+    await write_queue.start()
+    try:
+        return await run(sessionmaker(bind=read_engine), write_queue.run, owned, args.readers, args.writers, args.seconds)
+    finally:
+        await write_queue.stop()
+        read_engine.dispose()
+        write_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite mixed read/write throughput")
+    parser.add_argument("--readers", type=int, default=8, help="Number of concurrent readers")
+    parser.add_argument("--writers", type=int, default=4, help="Number of concurrent writers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+    parser.add_argument("--users", type=int, default=20, help="Number of seeded users")
+    parser.add_argument("--applications", type=int, default=200, help="Job applications per user")
+    args = parser.parse_args()
+
+    print(f"sqlite: {args.readers} readers, {args.writers} writers, {args.seconds:g}s per profile")
+    for name, profile in (("default", run_default), ("production", run_production)):
+        # Each profile gets its own file, since the WAL journal mode persists
+        database_url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+        engine = create_engine(database_url)
+        Base.metadata.create_all(bind=engine)
+        owned = seed(sessionmaker(bind=engine), args.users, args.applications)
+        engine.dispose()
+
+        result = asyncio.run(profile(database_url, owned, args))
+        print(
+            f"  {name:<10} {result['reads_per_second']:8.0f} reads/s  {result['writes_per_second']:7.0f} writes/s"
+            f"  read p95 {result['read_p95_ms']:7.2f} ms  {result['errors']} errors"
+        )
+
+if __name__ == "__main__":
+    main()
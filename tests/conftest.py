@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+# Point the application at a throwaway database and upload directory before
+# anything imports app.config
+TEST_DIR = tempfile.mkdtemp(prefix="jobcraftai-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(TEST_DIR, "uploads")
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["TASK_WORKERS_ENABLED"] = "False"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app  # Creates the tables
+from app.database import Base, SessionLocal, engine
+from app.models.user import User
+from app.utils.security import create_access_token, generate_uuid
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def make_user(db):
+    """
+    Create a user named after the given username
+    """
+    def make_user(username: str) -> User:
+        user = User(id=generate_uuid(), email=f"{username}@example.com", username=username, hashed_password="-")
+        db.add(user)
+        db.commit()
+        return user
+    return make_user
+
+@pytest.fixture
+def user(make_user):
+    return make_user("test")
+
+@pytest.fixture
+def auth_headers():
+    """
+    Authorization headers of a user, without logging in
+    """
+    def auth_headers(user: User):
+        return {"Authorization": f"Bearer {create_access_token(data={'sub': user.username})}"}
+    return auth_headers
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
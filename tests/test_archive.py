@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.archive import ArchivedArtifact, ArchivedJobApplication
+from app.models.cover_letter import CoverLetter
+from app.models.job_application import ApplicationStatus, JobApplication
+from app.models.linkedin import LinkedInMessage
+from app.models.resume_optimization import ResumeOptimization, SkillMatch
+from app.services.archive import archive_job_applications
+from app.services.dashboard_stats import rebuild_stats
+from tests.test_deletion import add_everything
+
+def add_readable(db, user, name):
+    """
+    Add an application with every row hanging off it, all of them valid responses
+    """
+    add_everything(db, user, name)
+    db.query(LinkedInMessage).update({LinkedInMessage.character_count: 2})
+    db.query(SkillMatch).update({SkillMatch.is_present: "yes", SkillMatch.importance: "high"})
+    db.commit()
+
+def archive(db, user, name):
+    """
+    Add an application with every row hanging off it, leave it rejected for
+    years, count it in the dashboard aggregates and archive it
+    """
+    add_readable(db, user, name)
+    db.query(ResumeOptimization).filter(ResumeOptimization.id == f"{name}-optimization").update(
+        {ResumeOptimization.match_score: 0.75}
+    )
+    db.query(JobApplication).filter(JobApplication.id == f"{name}-job").update({
+        JobApplication.status: ApplicationStatus.REJECTED,
+        JobApplication.updated_at: datetime(2000, 1, 1, tzinfo=timezone.utc),
+    })
+    db.commit()
+    rebuild_stats(db)
+    return archive_job_applications(db, timedelta(days=365), 10)
+
+def test_archive_round_trip(client, db, user, auth_headers):
+    headers = auth_headers(user)
+    add_everything(db, user, "live")
+    db.query(JobApplication).update({JobApplication.status: ApplicationStatus.REJECTED})
+    db.commit()
+
+    rebuild_stats(db)
+    stats = client.get("/api/job-applications/stats", headers=headers).json()
+    assert archive(db, user, "old") == 1
+    assert db.get(JobApplication, "old-job") is None
+    assert db.get(CoverLetter, "old-letter") is None
+    assert db.get(JobApplication, "live-job") is not None
+
+    # Still counted, and listed and read again when asked for
+    archived_stats = client.get("/api/job-applications/stats", headers=headers).json()
+    assert archived_stats["total"] == 2 and archived_stats["scored_optimizations"] == 1
+    jobs = client.get("/api/job-applications", headers=headers).json()["items"]
+    assert [job["id"] for job in jobs] == ["live-job"]
+    jobs = client.get("/api/job-applications?include_archived=true", headers=headers).json()["items"]
+    assert sorted(job["id"] for job in jobs) == ["live-job", "old-job"]
+    job = client.get("/api/job-applications/old-job?include_archived=true", headers=headers).json()
+    assert job["job_description"] == "Python" and job["archived_at"] is not None
+    assert [requirement["requirement"] for requirement in job["requirements"]] == ["Python"]
+
+    # Deleting the archived application deletes its archived rows and uncounts it
+    assert client.delete("/api/job-applications/old-job", headers=headers).status_code == 204
+    assert db.query(ArchivedJobApplication).count() == 0
+    assert db.query(ArchivedArtifact).count() == 0
+    assert client.get("/api/job-applications/stats", headers=headers).json() == stats
+
+def test_generated_rows_of_archived_applications_stay_readable(client, db, user, auth_headers):
+    headers = auth_headers(user)
+    add_readable(db, user, "live")
+    archive(db, user, "old")
+
+    for path, suffix in [("cover-letters", "letter"), ("linkedin", "message"), ("resume-optimizations", "optimization")]:
+        ids = [item["id"] for item in client.get(f"/api/{path}", headers=headers).json()["items"]]
+        assert ids == [f"live-{suffix}"]
+        page = client.get(f"/api/{path}?include_archived=true&limit=1", headers=headers).json()
+        assert len(page["items"]) == 1 and page["next_cursor"] is not None
+        rest = client.get(f"/api/{path}?include_archived=true&limit=1&cursor={page['next_cursor']}", headers=headers).json()
+        assert sorted(item["id"] for item in page["items"] + rest["items"]) == [f"live-{suffix}", f"old-{suffix}"]
+        assert rest["next_cursor"] is None
+
+        filtered = client.get(f"/api/{path}?include_archived=true&job_application_id=old-job", headers=headers).json()
+        assert [item["id"] for item in filtered["items"]] == [f"old-{suffix}"]
+
+        assert client.get(f"/api/{path}/old-{suffix}", headers=headers).status_code == 404
+        assert client.get(f"/api/{path}/old-{suffix}?include_archived=true", headers=headers).status_code == 200
+
+    letter = client.get("/api/cover-letters?include_archived=true&job_application_id=old-job", headers=headers).json()
+    assert letter["items"][0]["content_snippet"] == "Dear Acme" and "content" not in letter["items"][0]
+    letter = client.get("/api/cover-letters?include_archived=true&job_application_id=old-job&fields=content",
+                        headers=headers).json()
+    assert letter["items"][0]["content"] == "Dear Acme"
+    optimization = client.get("/api/resume-optimizations/old-optimization?include_archived=true", headers=headers).json()
+    assert optimization["match_score"] == 0.75
+    assert [match["skill_name"] for match in optimization["skill_matches"]] == ["Python"]
+    optimizations = client.get("/api/resume-optimizations?include_archived=true&resume_id=old-resume",
+                               headers=headers).json()
+    assert [item["id"] for item in optimizations["items"]] == ["old-optimization"]
+
+def test_archived_rows_of_other_users_are_not_readable(client, db, make_user, auth_headers):
+    alice, bob = make_user("alice"), make_user("bob")
+    headers = auth_headers(bob)
+    archive(db, alice, "alice")
+
+    assert client.get("/api/cover-letters?include_archived=true", headers=headers).json()["items"] == []
+    assert client.get("/api/cover-letters/alice-letter?include_archived=true", headers=headers).status_code == 404
+    assert client.get("/api/linkedin/alice-message?include_archived=true", headers=headers).status_code == 404
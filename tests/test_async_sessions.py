@@ -0,0 +1,27 @@
+from app.database import get_async_database_url
+from app.models.user import User
+
+def test_async_url_uses_the_asyncio_driver_of_the_backend():
+    assert str(get_async_database_url("sqlite:///./app.db")) == "sqlite+aiosqlite:///./app.db"
+    assert str(get_async_database_url("postgresql://u:p@db/app")).startswith("postgresql+asyncpg://")
+
+def test_create_and_update_user_through_async_sessions(client, db):
+    payload = {"email": "jane@example.com", "username": "jane", "password": "secret-password"}
+    response = client.post("/api/users", json=payload)
+    assert response.status_code == 201
+    assert db.query(User).filter(User.username == "jane").one().email == "jane@example.com"
+    assert client.post("/api/users", json=payload).status_code == 400
+
+    token = client.post("/api/auth/login", json={"email": "jane@example.com", "password": "secret-password"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.put("/api/users/me", json={"first_name": "Jane"}, headers=headers)
+    assert response.status_code == 200
+    assert client.get("/api/users/me", headers=headers).json()["first_name"] == "Jane"
+
+def test_async_endpoint_checks_the_job_application(client, user, auth_headers):
+    response = client.post(
+        "/api/cover-letters",
+        json={"job_application_id": "missing"},
+        headers=auth_headers(user)
+    )
+    assert response.status_code == 404
@@ -0,0 +1,50 @@
+from app.models.job_application import JobApplication, JobRequirement, JobResponsibility
+from app.models.resume import ParsedEducation, ParsedExperience, ParsedProject, ParsedSkill, Resume
+from app.services.bulk_persistence import replace_job_rows, replace_resume_rows
+
+PARSED_RESUME = {
+    "education": [{"institution": "MIT", "degree": "BSc"}],
+    "experience": [{"company": "Acme", "title": "Engineer"}, {"company": "Initech", "title": "Intern"}],
+    "skills": [{"name": "Python"}, {"name": "SQL", "category": "Databases"}],
+    "projects": [{"name": "Parser", "technologies": ["Python", "FastAPI"]}],
+}
+
+def test_resume_rows_are_replaced_not_duplicated(db, user):
+    db.add(Resume(id="resume", user_id=user.id, file_name="resume.pdf", file_type="pdf"))
+    db.commit()
+
+    replace_resume_rows(db, "resume", PARSED_RESUME)
+    db.commit()
+    replace_resume_rows(db, "resume", {**PARSED_RESUME, "skills": [{"name": "Go"}]})
+    db.commit()
+
+    assert db.query(ParsedEducation).count() == 1
+    assert db.query(ParsedExperience).count() == 2
+    assert [skill.name for skill in db.query(ParsedSkill)] == ["Go"]
+    assert db.query(ParsedProject).one().technologies == "Python,FastAPI"
+
+def test_missing_sections_insert_nothing(db, user):
+    db.add(Resume(id="resume", user_id=user.id, file_name="resume.pdf", file_type="pdf"))
+    db.commit()
+
+    rows = replace_resume_rows(db, "resume", {"skills": None})
+    db.commit()
+    assert all(not model_rows for model_rows in rows.values())
+    assert db.query(ParsedSkill).count() == 0
+
+def test_job_rows_are_replaced_for_one_application_only(db, user):
+    db.add_all([JobApplication(id="job", user_id=user.id), JobApplication(id="other", user_id=user.id)])
+    db.commit()
+    parsed = {"required_skills": ["Python"], "preferred_skills": ["Rust"], "responsibilities": ["Ship it"]}
+    replace_job_rows(db, "other", parsed)
+    replace_job_rows(db, "job", parsed)
+    db.commit()
+
+    replace_job_rows(db, "job", {"required_skills": ["Go"]})
+    db.commit()
+
+    requirements = db.query(JobRequirement).filter(JobRequirement.job_application_id == "job").all()
+    assert [(row.requirement, row.type) for row in requirements] == [("Go", "required")]
+    assert db.query(JobResponsibility).filter(JobResponsibility.job_application_id == "job").count() == 0
+    assert db.query(JobRequirement).filter(JobRequirement.job_application_id == "other").count() == 2
+    assert db.query(JobResponsibility).filter(JobResponsibility.job_application_id == "other").count() == 1
@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+from app.config import settings
+from app.models.blob import StoredBlob
+from app.models.resume import Resume, ResumeBatch
+from app.models.task_queue import QueuedTask
+from app.services.task_handlers import PARSE_RESUME_BULK
+
+PDF = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+def zip_bytes(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def upload(client, headers, content, file_name="resumes.zip"):
+    return client.post(
+        "/api/resumes/bulk",
+        files={"file": (file_name, content, "application/zip")},
+        headers=headers
+    )
+
+def test_bulk_upload_queues_every_parseable_resume(client, db, user, auth_headers):
+    response = upload(client, auth_headers(user), zip_bytes({
+        "cohort/alice.pdf": PDF,
+        "cohort/bob.txt": b"Bob\nPython developer\n",
+        "cohort/carol.pdf": b"not really a PDF",
+        "__MACOSX/cohort/._alice.pdf": b"metadata",
+        "cohort/.DS_Store": b"metadata",
+    }))
+    assert response.status_code == 201
+    body = response.json()
+    assert body["total"] == 2
+    assert body["pending"] == 2
+    assert [rejected["file_name"] for rejected in body["rejected"]] == ["cohort/carol.pdf"]
+
+    resumes = db.query(Resume).filter(Resume.batch_id == body["id"]).all()
+    assert sorted(resume.file_name for resume in resumes) == ["alice.pdf", "bob.txt"]
+    assert sorted(resume.id for resume in resumes) == sorted(body["resume_ids"])
+    tasks = db.query(QueuedTask).filter(QueuedTask.task_type == PARSE_RESUME_BULK).all()
+    assert sorted(task.payload["resume_id"] for task in tasks) == sorted(body["resume_ids"])
+
+def test_batch_progress_counts_parse_statuses(client, db, make_user, auth_headers):
+    user = make_user("alice")
+    body = upload(client, auth_headers(user), zip_bytes({"a.pdf": PDF, "b.pdf": PDF, "c.pdf": PDF})).json()
+    db.query(Resume).filter(Resume.id == body["resume_ids"][0]).update({Resume.parsed_status: "completed"})
+    db.query(Resume).filter(Resume.id == body["resume_ids"][1]).update({Resume.parsed_status: "failed"})
+    db.commit()
+
+    response = client.get(f"/api/resumes/batches/{body['id']}", headers=auth_headers(user))
+    assert response.status_code == 200
+    progress = response.json()
+    assert (progress["total"], progress["pending"], progress["completed"], progress["failed"]) == (3, 1, 1, 1)
+
+    other = make_user("bob")
+    assert client.get(f"/api/resumes/batches/{body['id']}", headers=auth_headers(other)).status_code == 404
+
+def test_archive_without_parseable_resumes_stores_nothing(client, db, user, auth_headers):
+    response = upload(client, auth_headers(user), zip_bytes({"notes.pdf": b"not really a PDF"}))
+    assert response.status_code == 400
+    assert db.query(ResumeBatch).count() == 0
+    assert db.query(StoredBlob).count() == 0
+
+def test_rejects_files_that_are_not_zip_archives(client, user, auth_headers):
+    assert upload(client, auth_headers(user), PDF, file_name="resume.pdf").status_code == 400
+    assert upload(client, auth_headers(user), PDF).status_code == 400
+
+def test_rejects_archives_with_too_many_files(client, db, user, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BULK_UPLOAD_FILES", 2)
+    response = upload(client, auth_headers(user), zip_bytes({"a.pdf": PDF, "b.pdf": PDF, "c.pdf": PDF}))
+    assert response.status_code == 400
+    assert db.query(Resume).count() == 0
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.job_application import JobApplication
+from app.models.types import COMPRESS_MIN_SIZE, RAW, ZLIB, pack_document, unpack_document
+
+SMALL = {"skills": ["Python"], "score": 0.5, "nested": {"ok": True, "none": None}}
+LARGE = {"description": "Python developer " * 100, "items": list(range(100))}
+
+@pytest.mark.parametrize("document", [SMALL, LARGE, [], "text", 3, {"unicode": "café ✓"}])
+def test_documents_round_trip(document):
+    assert unpack_document(pack_document(document)) == document
+
+def test_only_large_documents_are_compressed():
+    assert pack_document(SMALL)[:1] == RAW
+    packed = pack_document(LARGE)
+    assert packed[:1] == ZLIB
+    assert len(packed) < COMPRESS_MIN_SIZE
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        unpack_document(b"\x02" + pack_document(SMALL)[1:])
+
+def test_column_stores_packed_documents(db, user):
+    db.add(JobApplication(id="job", user_id=user.id, parsed_job_details=LARGE))
+    db.commit()
+
+    stored = db.execute(text("SELECT parsed_job_details FROM job_applications WHERE id = 'job'")).scalar()
+    assert stored[:1] == ZLIB
+
+    db.expire_all()
+    assert db.get(JobApplication, "job").parsed_job_details == LARGE
+
+    db.get(JobApplication, "job").parsed_job_details = None
+    db.commit()
+    assert db.execute(text("SELECT parsed_job_details FROM job_applications WHERE id = 'job'")).scalar() is None
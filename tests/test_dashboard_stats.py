@@ -0,0 +1,78 @@
+from app.models.resume_optimization import ResumeOptimization
+from app.models.stats import UserStatCounter
+from app.services import dashboard_stats
+from app.services.dashboard_stats import get_stats, rebuild_stats, record_match_score
+
+def create(client, headers, company_name):
+    response = client.post(
+        "/api/job-applications",
+        json={"job_title": "Engineer", "company_name": company_name, "job_description": f"Join {company_name}"},
+        headers=headers
+    )
+    return response.json()["id"]
+
+def counters(db, user_id):
+    db.expire_all()
+    return {
+        (counter.dimension, counter.key): (counter.count, counter.total)
+        for counter in db.query(UserStatCounter).filter(UserStatCounter.user_id == user_id)
+        if counter.count or counter.total
+    }
+
+def add_optimization(db, user_id, job_application_id, match_score):
+    db.add(ResumeOptimization(
+        id=f"{job_application_id}-{match_score}",
+        job_application_id=job_application_id,
+        user_id=user_id,
+        match_score=match_score
+    ))
+    record_match_score(db, user_id, match_score)
+    db.commit()
+
+def test_counters_follow_creates_updates_and_deletes(client, db, user, auth_headers):
+    headers = auth_headers(user)
+    acme = create(client, headers, "Acme")
+    create(client, headers, "Acme")
+    initech = create(client, headers, "Initech")
+    client.put(f"/api/job-applications/{acme}", json={"status": "applied"}, headers=headers)
+    add_optimization(db, user.id, acme, 0.75)
+    add_optimization(db, user.id, initech, 0.25)
+    client.delete(f"/api/job-applications/{initech}", headers=headers)
+
+    stats = client.get("/api/job-applications/stats", headers=headers).json()
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"planning": 1, "applied": 1}
+    assert stats["by_company"] == {"Acme": 2}
+    assert sum(stats["applied_by_week"].values()) == 1
+    assert stats["scored_optimizations"] == 1
+    assert stats["average_match_score"] == 0.75
+
+    # The incremental counters agree with a rebuild from the rows
+    incremental = counters(db, user.id)
+    rebuild_stats(db, [user.id])
+    assert counters(db, user.id) == incremental
+
+def test_counters_are_per_user(client, db, make_user, auth_headers):
+    alice, bob = make_user("alice"), make_user("bob")
+    create(client, auth_headers(alice), "Acme")
+    assert get_stats(db, bob.id, 52, 20)["total"] == 0
+    assert get_stats(db, alice.id, 52, 20)["total"] == 1
+
+def test_bulk_delete_uncounts_every_application(client, db, user, auth_headers):
+    headers = auth_headers(user)
+    ids = [create(client, headers, company) for company in ("Acme", "Acme", "Initech")]
+    add_optimization(db, user.id, ids[0], 0.5)
+
+    response = client.post("/api/job-applications/bulk-delete", json={"ids": ids}, headers=headers)
+    assert sorted(response.json()["deleted"]) == sorted(ids)
+    assert counters(db, user.id) == {}
+    assert get_stats(db, user.id, 52, 20)["by_company"] == {}
+
+def test_top_companies_are_limited(db, user):
+    dashboard_stats.adjust_counters(db, user.id, {
+        (dashboard_stats.COMPANY, "Acme"): (3, 0.0),
+        (dashboard_stats.COMPANY, "Initech"): (1, 0.0),
+        (dashboard_stats.COMPANY, "Globex"): (2, 0.0),
+    })
+    db.commit()
+    assert get_stats(db, user.id, 52, 2)["by_company"] == {"Acme": 3, "Globex": 2}
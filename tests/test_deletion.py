@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from app.config import settings
+from app.models.blob import StoredBlob
+from app.models.cover_letter import CoverLetter
+from app.models.job_application import JobApplication, JobRequirement, JobResponsibility
+from app.models.linkedin import LinkedInMessage
+from app.models.resume import ParsedSkill, Resume
+from app.models.resume_optimization import ResumeOptimization, SkillMatch
+from app.models.task_queue import QueuedTask
+from app.services.bulk_persistence import replace_job_rows, replace_resume_rows
+from app.services.storage import store_blob
+from app.services.task_handlers import SWEEP_BLOBS
+
+CHILDREN = [JobRequirement, JobResponsibility, CoverLetter, LinkedInMessage, ResumeOptimization, SkillMatch, ParsedSkill]
+
+def add_everything(db, user, name):
+    """
+    A job application and a resume with a file, and every row hanging off them
+    """
+    file_key, file_size = store_blob(db, io.BytesIO(f"{name} resume".encode()))
+    db.add(JobApplication(id=f"{name}-job", user_id=user.id, job_title="Engineer", company_name="Acme", job_description="Python"))
+    db.add(Resume(id=f"{name}-resume", user_id=user.id, file_name="resume.txt", file_type="txt",
+                  file_key=file_key, file_size=file_size))
+    db.flush()
+    replace_job_rows(db, f"{name}-job", {"required_skills": ["Python"], "responsibilities": ["Ship it"]})
+    replace_resume_rows(db, f"{name}-resume", {"skills": [{"name": "Python"}]})
+    db.add(CoverLetter(id=f"{name}-letter", job_application_id=f"{name}-job", user_id=user.id, content="Dear Acme"))
+    db.add(LinkedInMessage(id=f"{name}-message", job_application_id=f"{name}-job", user_id=user.id,
+                           target_name="Sam", message_type="connection_request", generated_message="Hi"))
+    db.add(ResumeOptimization(id=f"{name}-optimization", job_application_id=f"{name}-job",
+                              resume_id=f"{name}-resume", user_id=user.id, suggestions=[]))
+    db.flush()
+    db.add(SkillMatch(id=f"{name}-match", resume_optimization_id=f"{name}-optimization", skill_name="Python"))
+    db.commit()
+    return file_key
+
+def counts(db):
+    db.expire_all()
+    return {model.__name__: db.query(model).count() for model in CHILDREN}
+
+def test_deleting_a_job_application_deletes_its_rows(client, db, user, auth_headers):
+    add_everything(db, user, "alice")
+    assert client.delete("/api/job-applications/alice-job", headers=auth_headers(user)).status_code == 204
+    # Only the parsed resume rows are left
+    assert counts(db) == {**{model.__name__: 0 for model in CHILDREN}, "ParsedSkill": 1}
+
+def test_deleting_a_resume_deletes_its_rows_and_releases_its_file(client, db, user, auth_headers):
+    file_key = add_everything(db, user, "alice")
+    assert client.delete("/api/resumes/alice-resume", headers=auth_headers(user)).status_code == 204
+
+    remaining = counts(db)
+    assert remaining["ParsedSkill"] == remaining["ResumeOptimization"] == remaining["SkillMatch"] == 0
+    assert remaining["CoverLetter"] == 1
+    assert db.get(StoredBlob, file_key).ref_count == 0
+    sweep = db.query(QueuedTask).filter(QueuedTask.task_type == SWEEP_BLOBS).one()
+    assert sweep.payload == {"keys": [file_key]}
+
+@pytest.mark.parametrize("path, suffix", [("job-applications", "job"), ("resumes", "resume")])
+def test_bulk_delete_skips_other_users_and_unknown_ids(client, db, make_user, auth_headers, path, suffix):
+    alice, bob = make_user("alice"), make_user("bob")
+    add_everything(db, alice, "alice")
+    add_everything(db, bob, "bob")
+
+    response = client.post(
+        f"/api/{path}/bulk-delete",
+        json={"ids": [f"alice-{suffix}", f"bob-{suffix}", "missing"]},
+        headers=auth_headers(alice)
+    )
+    assert response.json() == {"deleted": [f"alice-{suffix}"]}
+    assert client.get(f"/api/{path}/bob-{suffix}", headers=auth_headers(bob)).status_code == 200
+
+def test_bulk_delete_is_limited(client, user, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BULK_DELETE_IDS", 2)
+    response = client.post("/api/resumes/bulk-delete", json={"ids": ["a", "b", "c"]}, headers=auth_headers(user))
+    assert response.status_code == 400
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.models.event import UserEvent
+from app.services.events import EventBroker, EventRelay, get_events_since, record_event
+
+def record(db, user_id, event_type="test", **kwargs):
+    event = record_event(db, user_id, event_type, {})
+    for key, value in kwargs.items():
+        setattr(event, key, value)
+    db.commit()
+    return event.id
+
+def relay_once(relay):
+    events = relay._fetch(relay._last_id, list(relay._gaps))
+    relay._track(events)
+    return [event.id for event in events]
+
+def test_event_ids_are_not_reused_after_a_purge(db, user):
+    record(db, user.id)
+    last_id = record(db, user.id)
+    relay = EventRelay(EventBroker())
+    relay._last_id = relay._get_max_id()
+
+    EventRelay._purge(db, datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert db.query(UserEvent).count() == 0
+
+    event_id = record(db, user.id)
+    assert event_id > last_id
+    assert relay_once(relay) == [event_id]
+    assert get_events_since(db, user.id, last_id) == [{"id": event_id, "event": "test", "data": {}}]
+
+def test_purge_keeps_recent_events(db, user):
+    record(db, user.id, created_at=datetime.now(timezone.utc) - timedelta(hours=2))
+    recent_id = record(db, user.id)
+
+    EventRelay._purge(db, datetime.now(timezone.utc) - timedelta(hours=1))
+    assert [event.id for event in db.query(UserEvent)] == [recent_id]
+
+def test_relay_delivers_events_committed_out_of_order(db, user):
+    relay = EventRelay(EventBroker())
+    record(db, user.id, id=1)
+    record(db, user.id, id=3)
+    assert relay_once(relay) == [1, 3]
+    assert list(relay._gaps) == [2]
+
+    # The transaction holding ID 2 commits after ID 3 was relayed
+    record(db, user.id, id=2)
+    assert relay_once(relay) == [2]
+    assert relay._gaps == {}
+    assert relay_once(relay) == []
+
+def test_relay_stops_waiting_for_a_rolled_back_event(db, user, monkeypatch):
+    relay = EventRelay(EventBroker())
+    record(db, user.id, id=1)
+    record(db, user.id, id=3)
+    monkeypatch.setattr(settings, "EVENT_GAP_GRACE_SECONDS", 0)
+    assert relay_once(relay) == [1, 3]
+    assert relay._gaps == {}
+
+def test_replay_only_returns_the_users_own_events(db, make_user):
+    alice, bob = make_user("alice"), make_user("bob")
+    first_id = record(db, alice.id)
+    record(db, bob.id)
+    second_id = record(db, alice.id)
+
+    assert [event["id"] for event in get_events_since(db, alice.id, 0)] == [first_id, second_id]
+    assert [event["id"] for event in get_events_since(db, alice.id, first_id)] == [second_id]
+
+def test_broker_publishes_to_the_users_subscribers_only():
+    async def run():
+        broker = EventBroker()
+        alice, bob = broker.subscribe("alice"), broker.subscribe("bob")
+        broker.publish("alice", {"id": 1})
+        broker.unsubscribe("bob", bob)
+        broker.publish("bob", {"id": 2})
+        return alice.get_nowait(), alice.empty(), bob.empty()
+
+    assert asyncio.run(run()) == ({"id": 1}, True, True)
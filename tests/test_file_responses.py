@@ -0,0 +1,96 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.models.resume import Resume
+from app.services.storage import MemoryStorageBackend
+from app.utils.file_responses import BlobResponse
+
+CONTENT = b"0123456789"
+ETAG = f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+
+@pytest.fixture
+def blob_client():
+    storage = MemoryStorageBackend()
+    staged = storage.stage(io.BytesIO(CONTENT), len(CONTENT))
+    storage.save(staged)
+
+    app = FastAPI()
+
+    @app.get("/file")
+    def get_file(request: Request):
+        return BlobResponse(storage, staged.key, staged.size, request.headers, media_type="application/pdf")
+
+    return TestClient(app)
+
+def test_full_file(blob_client):
+    response = blob_client.get("/file")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == ETAG
+    assert response.headers["content-length"] == str(len(CONTENT))
+
+def test_matching_etag_is_not_modified(blob_client):
+    response = blob_client.get("/file", headers={"If-None-Match": ETAG})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = blob_client.get("/file", headers={"If-None-Match": f'"other", W/{ETAG}'})
+    assert response.status_code == 304
+
+def test_byte_range(blob_client):
+    response = blob_client.get("/file", headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == f"bytes 2-5/{len(CONTENT)}"
+
+def test_suffix_and_open_ended_ranges(blob_client):
+    response = blob_client.get("/file", headers={"Range": "bytes=-3"})
+    assert response.status_code == 206
+    assert response.content == b"789"
+
+    response = blob_client.get("/file", headers={"Range": "bytes=8-"})
+    assert response.status_code == 206
+    assert response.content == b"89"
+
+def test_unsatisfiable_range(blob_client):
+    response = blob_client.get("/file", headers={"Range": "bytes=20-30"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert response.content == b""
+
+def test_range_of_a_changed_file_sends_the_whole_file(blob_client):
+    response = blob_client.get("/file", headers={"Range": "bytes=2-5", "If-Range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+def test_resume_download(client, db, make_user, auth_headers):
+    owner = make_user("alice")
+    response = client.post(
+        "/api/resumes",
+        files={"file": ("resume.txt", CONTENT, "text/plain")},
+        headers=auth_headers(owner)
+    )
+    resume_id = response.json()["id"]
+
+    response = client.get(f"/api/resumes/{resume_id}/file", headers=auth_headers(owner))
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == ETAG
+    assert "resume.txt" in response.headers["content-disposition"]
+
+    response = client.get(f"/api/resumes/{resume_id}/file", headers={**auth_headers(owner), "Range": "bytes=0-3"})
+    assert response.status_code == 206
+    assert response.content == b"0123"
+
+    other = make_user("bob")
+    assert client.get(f"/api/resumes/{resume_id}/file", headers=auth_headers(other)).status_code == 404
+
+def test_download_of_a_resume_without_a_file(client, db, user, auth_headers):
+    resume = Resume(id="no-file", user_id=user.id, file_name="resume.pdf", file_type="pdf", parsed_status="completed")
+    db.add(resume)
+    db.commit()
+    assert client.get("/api/resumes/no-file/file", headers=auth_headers(user)).status_code == 404
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.database import AsyncSessionLocal
+from app.models.job_application import JobApplication
+from app.models.resume import Resume
+from app.services.generation_context import load_generation_context
+
+def load(*args, **kwargs):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await load_generation_context(db, *args, **kwargs)
+    return asyncio.run(run())
+
+def add_resume(db, user, resume_id, status="completed", age_days=0):
+    db.add(Resume(
+        id=resume_id,
+        user_id=user.id,
+        file_name=f"{resume_id}.pdf",
+        file_type="pdf",
+        parsed_status=status,
+        parsed_content={"resume": resume_id},
+        created_at=datetime.now(timezone.utc) - timedelta(days=age_days)
+    ))
+
+def test_loads_the_latest_parsed_resume(db, user):
+    user.portfolio_url = "https://example.com"
+    db.add(JobApplication(id="job", user_id=user.id, job_title="Engineer", company_name="Acme"))
+    add_resume(db, user, "old", age_days=2)
+    add_resume(db, user, "latest", age_days=1)
+    add_resume(db, user, "unparsed", status="pending")
+    db.commit()
+
+    context = load(user.id, "job")
+    assert (context.job_title, context.company_name, context.portfolio_url) == ("Engineer", "Acme", "https://example.com")
+    assert context.resume_id == "latest"
+    assert context.resume_data == {"resume": "latest"}
+
+    assert load(user.id, "job", resume_id="old").resume_id == "old"
+    assert load(user.id, "job", resume_id="unparsed").resume_id is None
+
+def test_only_loads_the_users_own_rows(db, make_user):
+    alice, bob = make_user("alice"), make_user("bob")
+    db.add(JobApplication(id="job", user_id=alice.id, job_title="Engineer", company_name="Acme"))
+    add_resume(db, bob, "bobs")
+    db.commit()
+
+    assert load(bob.id, "job") is None
+    context = load(alice.id, "job", resume_id="bobs")
+    assert context.job_application_id == "job"
+    assert context.resume_id is None
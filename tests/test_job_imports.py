@@ -0,0 +1,93 @@
+import asyncio
+import io
+
+import pytest
+
+from app.config import settings
+from app.models.job_application import JobApplication
+from app.models.job_import import JobApplicationImport
+from app.services import task_handlers
+from app.services.job_imports import read_import_rows, set_duplicate_keys
+from app.services.storage import store_blob
+from app.services.task_handlers import import_job_applications_task, save_import_batch
+from app.utils.security import generate_uuid
+
+CSV = b"""Job Title,Company Name,Job Description,Job URL
+Backend Engineer,Acme,Build APIs,https://www.example.com/jobs/1?utm_source=feed
+Data Engineer,Globex,Build pipelines,https://example.com/jobs/2
+Data Engineer,Globex,  build   PIPELINES ,https://example.com/jobs/3
+Designer,Initech,,https://example.com/jobs/4
+Frontend Engineer,Hooli,Build pages,example.com/jobs/5/
+"""
+
+def create_import(db, user, file_key=None):
+    job_import = JobApplicationImport(
+        id=generate_uuid(), user_id=user.id, file_name="jobs.csv", file_format="csv", file_key=file_key
+    )
+    db.add(job_import)
+    db.commit()
+    return job_import.id
+
+def imported_urls(db, user):
+    db.expire_all()
+    return sorted(job_url for (job_url,) in db.query(JobApplication.job_url).filter(JobApplication.user_id == user.id))
+
+def test_import_skips_duplicates_of_existing_and_earlier_rows(db, user):
+    existing = JobApplication(
+        id=generate_uuid(), user_id=user.id, job_title="Backend Engineer", company_name="Acme",
+        job_description="Backend work", job_url="https://example.com/jobs/1/"
+    )
+    set_duplicate_keys(existing)
+    db.add(existing)
+    db.commit()
+    import_id = create_import(db, user)
+
+    progress = save_import_batch(db, import_id, list(read_import_rows(io.BytesIO(CSV), "csv")))
+
+    # Row 1 has the URL of the existing application, row 3 the description of row 2
+    assert progress["processed"] == 5
+    assert progress["created"] == 2
+    assert progress["duplicates"] == 2
+    assert progress["failed"] == 1
+    assert imported_urls(db, user) == ["example.com/jobs/5/", "https://example.com/jobs/1/", "https://example.com/jobs/2"]
+
+    job_import = db.get(JobApplicationImport, import_id)
+    assert [error["row"] for error in job_import.errors] == [4]
+
+def test_import_skips_duplicates_across_batches(db, user):
+    import_id = create_import(db, user)
+    rows = list(read_import_rows(io.BytesIO(CSV), "csv"))
+
+    save_import_batch(db, import_id, rows[:2])
+    progress = save_import_batch(db, import_id, rows[2:])
+
+    assert progress["created"] == 3
+    assert progress["duplicates"] == 1
+
+def test_retried_import_resumes_after_the_last_saved_batch(db, user, monkeypatch):
+    file_key, _ = store_blob(db, io.BytesIO(CSV))
+    import_id = create_import(db, user, file_key)
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+
+    saved_batches = []
+    def save_batch(db, import_id, entries):
+        if len(saved_batches) == 1 and fail:
+            raise RuntimeError("worker stopped")
+        saved_batches.append([number for number, _ in entries])
+        return save_import_batch(db, import_id, entries)
+    monkeypatch.setattr(task_handlers, "save_import_batch", save_batch)
+
+    fail = True
+    with pytest.raises(RuntimeError):
+        asyncio.run(import_job_applications_task({"import_id": import_id}))
+    assert db.get(JobApplicationImport, import_id).processed == 2
+
+    fail = False
+    asyncio.run(import_job_applications_task({"import_id": import_id}))
+
+    assert saved_batches == [[1, 2], [3, 4], [5]]
+    db.expire_all()
+    job_import = db.get(JobApplicationImport, import_id)
+    assert job_import.status == "completed"
+    assert (job_import.processed, job_import.created, job_import.duplicates, job_import.failed) == (5, 3, 1, 1)
+    assert len(imported_urls(db, user)) == 3
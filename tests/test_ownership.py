@@ -0,0 +1,65 @@
+import pytest
+
+from app.models.cover_letter import CoverLetter
+from app.models.job_application import JobApplication
+from app.models.linkedin import LinkedInMessage
+from app.models.resume import Resume
+from app.models.resume_optimization import ResumeOptimization
+
+@pytest.fixture
+def owners(db, make_user):
+    """
+    Two users, each with a job application, resume, cover letter, LinkedIn
+    message and resume optimization named after them
+    """
+    users = [make_user("alice"), make_user("bob")]
+    for user in users:
+        name = user.username
+        db.add(JobApplication(id=f"{name}-job", user_id=user.id, job_title="Engineer", company_name="Acme"))
+        db.add(Resume(id=f"{name}-resume", user_id=user.id, file_name="resume.pdf", file_type="pdf"))
+        db.flush()
+        db.add(CoverLetter(id=f"{name}-letter", job_application_id=f"{name}-job", user_id=user.id, content="Dear Acme"))
+        db.add(LinkedInMessage(
+            id=f"{name}-message", job_application_id=f"{name}-job", user_id=user.id,
+            target_name="Sam", message_type="connection_request", generated_message="Hi Sam", character_count=6
+        ))
+        db.add(ResumeOptimization(
+            id=f"{name}-optimization", job_application_id=f"{name}-job", resume_id=f"{name}-resume",
+            user_id=user.id, suggestions=[], match_score=0.5
+        ))
+    db.commit()
+    return users
+
+PATHS = [
+    ("cover-letters", "letter"),
+    ("linkedin", "message"),
+    ("resume-optimizations", "optimization"),
+]
+
+@pytest.mark.parametrize("path, suffix", PATHS)
+def test_lists_only_contain_the_users_rows(client, owners, auth_headers, path, suffix):
+    alice, _ = owners
+    items = client.get(f"/api/{path}", headers=auth_headers(alice)).json()["items"]
+    assert [item["id"] for item in items] == [f"alice-{suffix}"]
+
+@pytest.mark.parametrize("path, suffix", PATHS)
+def test_other_users_rows_are_not_found(client, db, owners, auth_headers, path, suffix):
+    alice, _ = owners
+    headers = auth_headers(alice)
+    assert client.get(f"/api/{path}/alice-{suffix}", headers=headers).status_code == 200
+    assert client.get(f"/api/{path}/bob-{suffix}", headers=headers).status_code == 404
+    assert client.delete(f"/api/{path}/bob-{suffix}", headers=headers).status_code == 404
+
+def test_other_users_rows_cannot_be_changed(client, db, owners, auth_headers):
+    alice, _ = owners
+    headers = auth_headers(alice)
+    assert client.put("/api/cover-letters/bob-letter", json={"content": "Mine"}, headers=headers).status_code == 404
+    assert client.put("/api/linkedin/bob-message", json={"generated_message": "Mine"}, headers=headers).status_code == 404
+    assert client.put("/api/linkedin/bob-message/mark-sent", headers=headers).status_code == 404
+
+    db.expire_all()
+    assert db.get(CoverLetter, "bob-letter").content == "Dear Acme"
+    assert not db.get(LinkedInMessage, "bob-message").is_sent
+
+    response = client.put("/api/cover-letters/alice-letter", json={"content": "Updated"}, headers=headers)
+    assert response.json()["content"] == "Updated"
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.job_application import JobApplication
+from app.utils.pagination import PageParams, decode_cursor, decode_keyset, encode_cursor, encode_keyset, paginate
+from app.utils.security import generate_uuid
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 19, 8, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+
+    values = ["2026-10-19 08:30:15", 42, None]
+    assert decode_keyset(encode_keyset(values)) == values
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_keyset(["not a date", "abc"]), encode_keyset([1])])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+def test_pages_cover_every_row_once(db, user):
+    # Rows added in one commit share their server-default created_at
+    ids = [generate_uuid() for _ in range(7)]
+    db.add_all(JobApplication(id=id, user_id=user.id, job_title=id) for id in ids)
+    db.commit()
+
+    query = db.query(JobApplication).filter(JobApplication.user_id == user.id)
+    seen = []
+    cursor = None
+    while True:
+        page = paginate(query, JobApplication, PageParams(cursor=cursor, limit=3))
+        seen.extend(row.id for row in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(ids, reverse=True)
+
+def test_list_endpoint_pages_through_the_users_rows(client, db, make_user, auth_headers):
+    user, other = make_user("alice"), make_user("bob")
+    ids = [generate_uuid() for _ in range(3)]
+    db.add_all(JobApplication(id=id, user_id=user.id, job_title=id, company_name="Acme") for id in ids)
+    db.add(JobApplication(id=generate_uuid(), user_id=other.id, job_title="other", company_name="Acme"))
+    db.commit()
+
+    first = client.get("/api/job-applications", params={"limit": 2}, headers=auth_headers(user)).json()
+    second = client.get(
+        "/api/job-applications",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+        headers=auth_headers(user)
+    ).json()
+    assert [row["id"] for row in first["items"] + second["items"]] == sorted(ids, reverse=True)
+    assert second["next_cursor"] is None
+
+    response = client.get("/api/job-applications", params={"cursor": "garbage"}, headers=auth_headers(user))
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+from app.models.job_application import JobApplication
+from app.models.resume import Resume
+from app.services.bulk_persistence import replace_job_rows, replace_resume_rows
+from app.services.parsed_sections import store_job_application_sections, store_resume_sections
+
+PARSED_JOB = {"required_skills": ["Python"], "preferred_skills": ["Rust"], "responsibilities": ["Ship it"]}
+
+PARSED_RESUME = {
+    "summary": "Engineer",
+    "education": [{"institution": "MIT", "degree": "BSc"}],
+    "experience": [{"company": "Acme", "title": "Engineer"}],
+    "skills": [{"name": "Python"}],
+    "projects": [{"name": "Parser", "technologies": ["Python", "FastAPI"]}],
+}
+
+def forget_sections(db, model, id):
+    """
+    Drop the stored sections, as for rows parsed before they were stored
+    """
+    db.query(model).filter(model.id == id).update({model.parsed_sections: None})
+    db.commit()
+
+def test_job_application_sections_match_the_fallback(client, db, user, auth_headers):
+    job_application = JobApplication(
+        id="job", user_id=user.id, job_title="Engineer", company_name="Acme",
+        job_description="Python", parsed_job_details=PARSED_JOB
+    )
+    db.add(job_application)
+    db.flush()
+    replace_job_rows(db, "job", PARSED_JOB)
+    store_job_application_sections(db, job_application)
+    db.commit()
+
+    stored = client.get("/api/job-applications/job", headers=auth_headers(user)).json()
+    forget_sections(db, JobApplication, "job")
+    fallback = client.get("/api/job-applications/job", headers=auth_headers(user)).json()
+
+    assert stored == fallback
+    assert [requirement["requirement"] for requirement in stored["requirements"]] == ["Python", "Rust"]
+    # Timestamps are encoded like the parent's
+    assert ("+" in stored["created_at"]) == ("+" in stored["requirements"][0]["created_at"])
+
+def test_resume_sections_match_the_fallback(client, db, user, auth_headers):
+    resume = Resume(
+        id="resume", user_id=user.id, file_name="resume.pdf", file_type="pdf",
+        parsed_status="completed", parsed_content=PARSED_RESUME
+    )
+    db.add(resume)
+    db.flush()
+    replace_resume_rows(db, "resume", PARSED_RESUME)
+    store_resume_sections(db, resume)
+    db.commit()
+
+    stored = client.get("/api/resumes/resume/parsed", headers=auth_headers(user)).json()
+    forget_sections(db, Resume, "resume")
+    fallback = client.get("/api/resumes/resume/parsed", headers=auth_headers(user)).json()
+
+    assert stored == fallback
+    assert stored["projects"][0]["technologies"] == ["Python", "FastAPI"]
+    assert stored["summary"] == "Engineer"
+
+def test_unparsed_job_application_has_no_sections(client, db, user, auth_headers):
+    db.add(JobApplication(id="job", user_id=user.id, job_title="Engineer", company_name="Acme", job_description="x"))
+    db.commit()
+    detail = client.get("/api/job-applications/job", headers=auth_headers(user)).json()
+    assert (detail["requirements"], detail["responsibilities"]) == ([], [])
@@ -0,0 +1,39 @@
+from app.models.resume import Resume
+from app.routers.resumes import RESUME_LIST
+
+def add_resume(db, user):
+    db.add(Resume(
+        id="resume",
+        user_id=user.id,
+        file_name="resume.pdf",
+        file_type="pdf",
+        parsed_status="completed",
+        parsed_content={"skills": ["Python"]}
+    ))
+    db.commit()
+
+def test_summary_leaves_large_columns_unloaded(db, user):
+    add_resume(db, user)
+    db.expunge_all()
+
+    resume = RESUME_LIST.apply(db.query(Resume), []).one()
+    assert "parsed_content" not in resume.__dict__
+    assert "parsed_content" not in RESUME_LIST.serialize(resume, [])
+
+    db.expunge_all()
+    resume = RESUME_LIST.apply(db.query(Resume), ["parsed_content"]).one()
+    assert resume.__dict__["parsed_content"] == {"skills": ["Python"]}
+
+def test_list_endpoint_returns_requested_fields_only(client, db, user, auth_headers):
+    add_resume(db, user)
+
+    item, = client.get("/api/resumes", headers=auth_headers(user)).json()["items"]
+    assert item["file_name"] == "resume.pdf"
+    assert "parsed_content" not in item
+
+    response = client.get("/api/resumes", params={"fields": "parsed_content"}, headers=auth_headers(user))
+    item, = response.json()["items"]
+    assert item["parsed_content"] == {"skills": ["Python"]}
+
+    response = client.get("/api/resumes", params={"fields": "parsed_content,secret"}, headers=auth_headers(user))
+    assert response.status_code == 400
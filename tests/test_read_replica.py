@@ -0,0 +1,54 @@
+import pytest
+from starlette.requests import Request
+
+from app import database
+from app.database import RecentWriters, get_read_db
+
+def test_recent_writer_is_remembered_for_the_window():
+    writers = RecentWriters(60)
+    writers.mark("token-a")
+    assert writers.is_recent("token-a")
+    assert not writers.is_recent("token-b")
+
+    expired = RecentWriters(0)
+    expired.mark("token-a")
+    assert not expired.is_recent("token-a")
+
+def test_expired_writers_are_pruned(monkeypatch):
+    monkeypatch.setattr(database, "RECENT_WRITERS_PRUNE_SIZE", 2)
+    writers = RecentWriters(0)
+    for key in ("a", "b", "c"):
+        writers.mark(key)
+    writers.mark("d")
+    assert set(writers._until) == {"d"}
+
+def request_with_token(token):
+    return Request({"type": "http", "headers": [(b"authorization", token.encode())]})
+
+@pytest.fixture
+def replica(monkeypatch):
+    """
+    Pretend a replica is configured, with sessions that tell which factory made them
+    """
+    class Session:
+        def __init__(self, target):
+            self.target = target
+
+        def close(self):
+            pass
+
+    writers = RecentWriters(60)
+    monkeypatch.setattr(database, "READ_REPLICA", True)
+    monkeypatch.setattr(database, "recent_writers", writers)
+    monkeypatch.setattr(database, "SessionLocal", lambda: Session("primary"))
+    monkeypatch.setattr(database, "ReadSessionLocal", lambda: Session("replica"))
+    return writers
+
+def read_target(token):
+    return next(get_read_db(request_with_token(token))).target
+
+def test_reads_go_to_the_primary_after_a_write(replica):
+    assert read_target("Bearer a") == "replica"
+    replica.mark("Bearer a")
+    assert read_target("Bearer a") == "primary"
+    assert read_target("Bearer b") == "replica"
@@ -0,0 +1,46 @@
+import asyncio
+import io
+
+import pytest
+
+from app.models.resume import Resume
+from app.models.task_queue import QueuedTask, TaskStatus
+from app.services.resume_parser import ResumeParser, UnreadableResumeError
+from app.services.storage import store_blob
+from app.services.task_handlers import PARSE_RESUME, TASK_FAILURE_HANDLERS, TASK_HANDLERS, TASK_CONCURRENCY
+from app.services.task_queue import TaskQueue, TaskWorkerPool
+from app.utils.security import generate_uuid
+
+def test_text_is_extracted_from_a_text_resume():
+    assert ResumeParser.extract_text(io.BytesIO("Jane Doe\nPython\n".encode()), "txt") == "Jane Doe\nPython\n"
+
+@pytest.mark.parametrize("file_type, content", [
+    ("pdf", b"%PDF-1.4 truncated"),
+    ("docx", b"PK\x03\x04 truncated"),
+    ("doc", b"\xd0\xcf\x11\xe0"),
+])
+def test_unreadable_files_are_reported(file_type, content):
+    with pytest.raises(UnreadableResumeError):
+        ResumeParser.extract_text(io.BytesIO(content), file_type)
+
+def test_corrupt_resume_fails_on_its_first_attempt(db, user):
+    file_key, file_size = store_blob(db, io.BytesIO(b"%PDF-1.4 truncated"))
+    resume = Resume(
+        id=generate_uuid(), user_id=user.id, file_name="resume.pdf", file_key=file_key,
+        file_size=file_size, file_type="pdf", parsed_status="pending"
+    )
+    db.add(resume)
+    task = TaskQueue.enqueue(db, PARSE_RESUME, {"resume_id": resume.id})
+    db.commit()
+    task_id = task.id
+
+    task = TaskQueue.claim(db, PARSE_RESUME, "worker-1", 60)
+    pool = TaskWorkerPool(TASK_HANDLERS, TASK_CONCURRENCY, TASK_FAILURE_HANDLERS)
+    asyncio.run(pool._execute(task, "worker-1"))
+
+    db.expire_all()
+    task = db.get(QueuedTask, task_id)
+    assert task.status == TaskStatus.DEAD
+    assert task.attempts == 1
+    assert "Error extracting text from PDF" in task.last_error
+    assert db.get(Resume, resume.id).parsed_status == "failed"
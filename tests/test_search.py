@@ -0,0 +1,76 @@
+from sqlalchemy import text
+
+from app.models.cover_letter import CoverLetter
+from app.models.job_application import JobApplication
+from app.utils.pagination import PageParams
+from app.services.search import search
+
+def add_application(db, user, id, job_title, **kwargs):
+    db.add(JobApplication(id=id, user_id=user.id, job_title=job_title, company_name="Acme", **kwargs))
+    db.commit()
+
+def found(db, user, query, **kwargs):
+    return [(item["kind"], item["id"]) for item in search(db, user.id, query, PageParams(cursor=None, limit=20), **kwargs)["items"]]
+
+def test_users_only_find_their_own_documents(client, db, make_user, auth_headers):
+    alice, bob = make_user("alice"), make_user("bob")
+    add_application(db, alice, "alices", "Python developer")
+    add_application(db, bob, "bobs", "Python developer")
+    db.add(CoverLetter(id="bobs-letter", job_application_id="bobs", user_id=bob.id, content="I love Python"))
+    db.commit()
+
+    assert found(db, alice, "python") == [("job_application", "alices")]
+    assert sorted(found(db, bob, "python")) == [("cover_letter", "bobs-letter"), ("job_application", "bobs")]
+
+    response = client.get("/api/search", params={"q": "python developer"}, headers=auth_headers(alice))
+    item, = response.json()["items"]
+    assert item["id"] == "alices"
+    assert "<mark>Python</mark>" in item["snippet"]
+
+def test_index_follows_updates_and_deletes(db, user):
+    add_application(db, user, "job", "Python developer")
+    db.query(JobApplication).filter(JobApplication.id == "job").update({JobApplication.job_title: "Rust developer"})
+    db.commit()
+    assert found(db, user, "python") == []
+    assert found(db, user, "rust") == [("job_application", "job")]
+
+    db.query(JobApplication).filter(JobApplication.id == "job").delete()
+    db.commit()
+    assert found(db, user, "rust") == []
+
+def test_results_survive_renumbered_rows(db, user):
+    for id, job_title in (("first", "Baker"), ("second", "Plumber"), ("third", "Welder")):
+        add_application(db, user, id, job_title)
+    db.query(JobApplication).filter(JobApplication.id == "first").delete()
+    db.commit()
+
+    # What a VACUUM may do, and a table rebuild does
+    db.execute(text("UPDATE job_applications SET rowid = rowid + 100"))
+    db.commit()
+
+    assert found(db, user, "plumber") == [("job_application", "second")]
+    assert found(db, user, "welder") == [("job_application", "third")]
+    assert found(db, user, "baker") == []
+
+def test_search_filters_by_kind_and_pages(db, user):
+    for i in range(3):
+        add_application(db, user, f"job-{i}", "Python developer")
+    db.add(CoverLetter(id="letter", job_application_id="job-0", user_id=user.id, content="Python"))
+    db.commit()
+
+    assert found(db, user, "python", kinds=["cover_letter"]) == [("cover_letter", "letter")]
+
+    seen, cursor = [], None
+    while True:
+        page = search(db, user.id, "python", PageParams(cursor=cursor, limit=2))
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == ["job-0", "job-1", "job-2", "letter"]
+
+def test_stopwords_and_operators_are_ignored(db, user):
+    add_application(db, user, "job", "Python developer")
+    assert found(db, user, "the python") == [("job_application", "job")]
+    assert found(db, user, "the") == []
+    assert found(db, user, 'python OR "rust') == []
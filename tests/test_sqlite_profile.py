@@ -0,0 +1,54 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import SessionLocal, configure_sqlite_connection
+from app.models.event import UserEvent
+from app.services.write_queue import WriteQueue
+def test_production_pragmas(tmp_path):
+    connection = sqlite3.connect(tmp_path / "profile.db")
+    configure_sqlite_connection(connection)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert connection.execute("PRAGMA synchronous").fetchone() == (1,)
+    connection.execute("CREATE TABLE IF NOT EXISTS t (x)")
+    connection.execute("INSERT INTO t VALUES (1)")
+    connection.commit()
+
+    reader = sqlite3.connect(tmp_path / "profile.db")
+    configure_sqlite_connection(reader, read_only=True)
+    assert reader.execute("SELECT count(*) FROM t").fetchone() == (1,)
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("INSERT INTO t VALUES (2)")
+
+def add_event(db, user_id, event_type):
+    db.add(UserEvent(user_id=user_id, event_type=event_type, data={}))
+    db.commit()
+    return event_type
+
+def fail(db):
+    raise ValueError("write failed")
+
+@pytest.mark.parametrize("started", [False, True])
+def test_write_queue_applies_writes_in_order(db, user, started):
+    queue = WriteQueue(SessionLocal)
+
+    async def run():
+        if started:
+            await queue.start()
+        try:
+            results = await asyncio.gather(*(queue.run(add_event, user.id, f"event-{i}") for i in range(5)))
+            with pytest.raises(ValueError):
+                await queue.run(fail)
+            # The writer keeps going after a failed write
+            results.append(await queue.run(add_event, user.id, "after"))
+            return results
+        finally:
+            await queue.stop()
+
+    expected = [f"event-{i}" for i in range(5)] + ["after"]
+    assert asyncio.run(run()) == expected
+    if started:
+        assert [event.event_type for event in db.query(UserEvent).order_by(UserEvent.id)] == expected
+    else:
+        assert db.query(UserEvent).count() == len(expected)
@@ -0,0 +1,97 @@
+import io
+
+from app.models.blob import StoredBlob
+from app.models.resume import Resume
+from app.models.task_queue import QueuedTask
+from app.services.storage import delete_unreferenced_blobs, release_blobs, storage, store_blob
+from app.services.task_handlers import PARSE_RESUME, SWEEP_BLOBS
+from app.services.task_queue import TaskQueue
+
+def ref_count(db, key):
+    db.expire_all()
+    blob = db.get(StoredBlob, key)
+    return blob.ref_count if blob is not None else None
+
+def test_storing_the_same_content_adds_references(db):
+    key, size = store_blob(db, io.BytesIO(b"same resume"))
+    db.commit()
+    assert size == len(b"same resume")
+    assert ref_count(db, key) == 1
+
+    second_key, _ = store_blob(db, io.BytesIO(b"same resume"))
+    db.commit()
+    assert second_key == key
+    assert ref_count(db, key) == 2
+    with storage.open(key) as file:
+        assert file.read() == b"same resume"
+
+def test_blob_is_deleted_once_its_last_reference_is_released(db):
+    key, _ = store_blob(db, io.BytesIO(b"shared"))
+    store_blob(db, io.BytesIO(b"shared"))
+    db.commit()
+
+    release_blobs(db, [key])
+    db.commit()
+    assert delete_unreferenced_blobs(db, [key]) == []
+    assert ref_count(db, key) == 1
+    assert storage.exists(key)
+
+    release_blobs(db, [key])
+    db.commit()
+    assert delete_unreferenced_blobs(db, [key]) == [key]
+    assert ref_count(db, key) is None
+    assert not storage.exists(key)
+
+def test_release_counts_repeated_keys(db):
+    key, _ = store_blob(db, io.BytesIO(b"twice"))
+    store_blob(db, io.BytesIO(b"twice"))
+    db.commit()
+
+    release_blobs(db, [key, key])
+    db.commit()
+    assert ref_count(db, key) == 0
+
+def test_blob_referenced_again_before_the_sweep_is_kept(db):
+    key, _ = store_blob(db, io.BytesIO(b"uploaded again"))
+    db.commit()
+    release_blobs(db, [key])
+    db.commit()
+
+    store_blob(db, io.BytesIO(b"uploaded again"))
+    db.commit()
+    assert delete_unreferenced_blobs(db, [key]) == []
+    assert ref_count(db, key) == 1
+    assert storage.exists(key)
+
+def test_swept_file_is_written_again_by_a_new_upload(db):
+    key, _ = store_blob(db, io.BytesIO(b"swept"))
+    db.commit()
+    # The row survived, but its file is gone
+    storage.delete(key)
+
+    store_blob(db, io.BytesIO(b"swept"))
+    db.commit()
+    assert storage.exists(key)
+
+def test_failed_upload_queues_its_file_for_a_sweep(client, db, user, auth_headers, monkeypatch):
+    enqueue = TaskQueue.enqueue
+    def failing_enqueue(db, task_type, payload, **kwargs):
+        if task_type == PARSE_RESUME:
+            raise RuntimeError("queue unavailable")
+        return enqueue(db, task_type, payload, **kwargs)
+    monkeypatch.setattr(TaskQueue, "enqueue", failing_enqueue)
+
+    response = client.post(
+        "/api/resumes",
+        files={"file": ("resume.txt", b"Jane Doe\nPython developer\n", "text/plain")},
+        headers=auth_headers(user)
+    )
+    assert response.status_code == 400
+    assert db.query(Resume).count() == 0
+
+    key = db.query(StoredBlob.key).scalar()
+    assert ref_count(db, key) == 0
+    sweep = db.query(QueuedTask).filter(QueuedTask.task_type == SWEEP_BLOBS).one()
+    assert sweep.payload == {"keys": [key]}
+    assert delete_unreferenced_blobs(db, sweep.payload["keys"]) == [key]
+    assert not storage.exists(key)
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.models.task_queue import QueuedTask, TaskStatus
+from app.services.task_queue import PermanentTaskError, TaskQueue, TaskWorkerPool
+
+def enqueue(db, **kwargs):
+    task = TaskQueue.enqueue(db, "test", {"value": 1}, **kwargs)
+    db.commit()
+    return task.id
+
+def test_claim_leases_a_task_to_one_worker(db):
+    task_id = enqueue(db)
+
+    task = TaskQueue.claim(db, "test", "worker-1", 60)
+    assert task.id == task_id
+    assert task.status == TaskStatus.RUNNING
+    assert task.locked_by == "worker-1"
+    assert task.attempts == 1
+
+    assert TaskQueue.claim(db, "test", "worker-2", 60) is None
+    assert TaskQueue.claim(db, "other", "worker-2", 60) is None
+
+def test_claim_waits_for_run_after(db):
+    enqueue(db, run_after=datetime(2999, 1, 1, tzinfo=timezone.utc))
+    assert TaskQueue.claim(db, "test", "worker-1", 60) is None
+
+def test_expired_lease_is_claimed_again(db):
+    task_id = enqueue(db)
+    TaskQueue.claim(db, "test", "worker-1", -1)
+
+    task = TaskQueue.claim(db, "test", "worker-2", 60)
+    assert task.id == task_id
+    assert task.locked_by == "worker-2"
+    assert task.attempts == 2
+
+    # The first worker has lost the task
+    assert not TaskQueue.extend_lease(db, task_id, "worker-1", 60)
+    assert TaskQueue.extend_lease(db, task_id, "worker-2", 60)
+
+def test_complete_removes_the_task(db):
+    task_id = enqueue(db)
+    TaskQueue.claim(db, "test", "worker-1", 60)
+
+    TaskQueue.complete(db, task_id, "worker-1")
+    assert db.get(QueuedTask, task_id) is None
+
+def test_failed_task_is_retried_after_a_backoff(db):
+    task_id = enqueue(db, max_attempts=2)
+    TaskQueue.claim(db, "test", "worker-1", 60)
+
+    assert not TaskQueue.fail(db, task_id, "worker-1", "boom")
+    task = db.get(QueuedTask, task_id)
+    assert task.status == TaskStatus.PENDING
+    assert task.locked_by is None
+    assert task.last_error == "boom"
+    # Not runnable until the backoff has passed
+    assert TaskQueue.claim(db, "test", "worker-1", 60) is None
+
+def test_task_is_dead_lettered_after_its_last_attempt(db):
+    task_id = enqueue(db, max_attempts=1)
+    TaskQueue.claim(db, "test", "worker-1", 60)
+
+    assert TaskQueue.fail(db, task_id, "worker-1", "boom")
+    assert db.get(QueuedTask, task_id).status == TaskStatus.DEAD
+    assert TaskQueue.claim(db, "test", "worker-1", 60) is None
+
+def test_fail_by_a_worker_without_the_lease_is_ignored(db):
+    task_id = enqueue(db)
+    TaskQueue.claim(db, "test", "worker-1", 60)
+
+    assert not TaskQueue.fail(db, task_id, "worker-2", "boom")
+    assert db.get(QueuedTask, task_id).status == TaskStatus.RUNNING
+
+def test_attempt_is_cancelled_when_its_lease_is_lost(db, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_LEASE_SECONDS", 0.03)
+    task_id = enqueue(db)
+    task = TaskQueue.claim(db, "test", "worker-1", 60)
+    # Another worker claims the task after the lease of worker-1 expired
+    db.query(QueuedTask).filter(QueuedTask.id == task_id).update({QueuedTask.locked_by: "worker-2"})
+    db.commit()
+
+    cancelled = []
+    async def handler(payload):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(payload)
+            raise
+
+    pool = TaskWorkerPool({"test": handler}, {"test": 1})
+    asyncio.run(asyncio.wait_for(pool._execute(task, "worker-1"), timeout=5))
+
+    assert cancelled == [{"value": 1}]
+    db.expire_all()
+    task = db.get(QueuedTask, task_id)
+    assert task.status == TaskStatus.RUNNING
+    assert task.locked_by == "worker-2"
+
+def test_task_that_cannot_be_retried_is_dead_lettered_at_once(db):
+    task_id = enqueue(db, max_attempts=5)
+    TaskQueue.claim(db, "test", "worker-1", 60)
+
+    assert TaskQueue.fail(db, task_id, "worker-1", "corrupt file", retry=False)
+    assert db.get(QueuedTask, task_id).status == TaskStatus.DEAD
+
+def test_permanent_error_skips_the_retries(db):
+    task_id = enqueue(db, max_attempts=5)
+    task = TaskQueue.claim(db, "test", "worker-1", 60)
+
+    async def handler(payload):
+        raise PermanentTaskError("corrupt file")
+
+    failed = []
+    async def failure_handler(payload):
+        failed.append(payload)
+
+    pool = TaskWorkerPool({"test": handler}, {"test": 1}, {"test": failure_handler})
+    asyncio.run(pool._execute(task, "worker-1"))
+
+    db.expire_all()
+    task = db.get(QueuedTask, task_id)
+    assert task.status == TaskStatus.DEAD
+    assert task.attempts == 1
+    assert task.last_error == "corrupt file"
+    assert failed == [{"value": 1}]
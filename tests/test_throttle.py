@@ -0,0 +1,65 @@
+import pytest
+
+from app.utils import throttle
+from app.utils.throttle import AttemptLimiter
+
+PASSWORD = "secret-password"
+
+def test_limiter_rejects_attempts_over_the_limit():
+    limiter = AttemptLimiter(2, 60)
+    assert limiter.hit("key") is None
+    assert limiter.hit("key") is None
+    assert 0 < limiter.hit("key") <= 60
+    assert limiter.hit("other") is None
+
+def test_attempts_leave_the_window():
+    limiter = AttemptLimiter(1, 0)
+    assert limiter.hit("key") is None
+    assert limiter.hit("key") is None
+
+def test_undo_and_reset():
+    limiter = AttemptLimiter(2, 60)
+    limiter.hit("key")
+    limiter.hit("key")
+    limiter.undo("key")
+    assert limiter.hit("key") is None
+    assert limiter.hit("key") is not None
+
+    limiter.reset("key")
+    assert limiter.hit("key") is None
+    # Nothing to take back for an unknown key
+    limiter.undo("unknown")
+
+@pytest.fixture
+def limiters(monkeypatch):
+    """
+    Fresh login limiters: 3 attempts per account and 4 per IP
+    """
+    account, ip = AttemptLimiter(3, 60), AttemptLimiter(4, 60)
+    monkeypatch.setattr("app.routers.auth.account_login_limiter", account)
+    monkeypatch.setattr("app.routers.auth.ip_login_limiter", ip)
+    return account, ip
+
+@pytest.fixture
+def accounts(client):
+    for username in ("alice", "bob"):
+        client.post("/api/users", json={"email": f"{username}@example.com", "username": username, "password": PASSWORD})
+
+def login(client, username, password=PASSWORD):
+    return client.post("/api/auth/login", json={"email": f"{username}@example.com", "password": password}).status_code
+
+def test_successful_logins_do_not_count(client, accounts, limiters):
+    assert [login(client, "alice") for _ in range(6)] == [200] * 6
+
+def test_account_is_locked_after_failures(client, accounts, limiters):
+    assert [login(client, "alice", "wrong") for _ in range(3)] == [401] * 3
+    assert login(client, "alice") == 429
+    # Other accounts on the same IP are not affected
+    assert login(client, "bob") == 200
+
+def test_success_clears_the_account_but_not_the_ip(client, accounts, limiters):
+    assert [login(client, "alice", "wrong") for _ in range(2)] == [401] * 2
+    assert login(client, "alice") == 200
+    assert [login(client, "bob", "wrong") for _ in range(2)] == [401] * 2
+    # Four failures from this IP, whatever logged in between them
+    assert login(client, "alice") == 429
@@ -0,0 +1,71 @@
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.models.blob import StoredBlob
+from app.models.resume import Resume
+from app.utils.file_handlers import copy_file, detect_file_type
+
+PDF = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+def docx_bytes(parts=("word/document.xml",)):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        for part in parts:
+            archive.writestr(part, "<document/>")
+    return buffer.getvalue()
+
+def test_accepts_files_whose_content_matches_their_extension():
+    assert detect_file_type("resume.PDF", io.BytesIO(PDF)) == "pdf"
+    assert detect_file_type("resume.txt", io.BytesIO(b"Jane Doe\nPython developer\n")) == "txt"
+    assert detect_file_type("resume.docx", io.BytesIO(docx_bytes())) == "docx"
+
+@pytest.mark.parametrize("filename, content", [
+    ("resume.exe", PDF),
+    ("resume", PDF),
+    ("resume.pdf", b"Jane Doe\nPython developer\n"),
+    ("resume.pdf", b""),
+    ("resume.docx", docx_bytes(parts=("xl/workbook.xml",))),
+    ("resume.txt", PDF + b"\x00\x01\x02"),
+])
+def test_rejects_files_that_cannot_be_parsed(filename, content):
+    with pytest.raises(HTTPException) as error:
+        detect_file_type(filename, io.BytesIO(content))
+    assert error.value.status_code == 400
+
+def test_validation_leaves_the_stream_at_the_start():
+    file = io.BytesIO(docx_bytes())
+    detect_file_type("resume.docx", file)
+    assert file.tell() == 0
+
+def test_copy_stops_at_the_size_limit():
+    destination = io.BytesIO()
+    assert copy_file(io.BytesIO(b"x" * 10), destination, 10) == 10
+
+    with pytest.raises(HTTPException) as error:
+        copy_file(io.BytesIO(b"x" * 11), io.BytesIO(), 10)
+    assert error.value.status_code == 413
+
+def blob_files():
+    return {
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(os.path.join(settings.UPLOAD_DIR, "blobs"))
+        for name in names
+    }
+
+def test_rejected_upload_stores_nothing(client, db, user, auth_headers):
+    files_before = blob_files()
+    response = client.post(
+        "/api/resumes",
+        files={"file": ("resume.pdf", b"not really a PDF", "application/pdf")},
+        headers=auth_headers(user)
+    )
+    assert response.status_code == 400
+    assert db.query(Resume).count() == 0
+    assert db.query(StoredBlob).count() == 0
+    assert blob_files() == files_before
@@ -0,0 +1,79 @@
+import asyncio
+
+from app.models.user import User
+from app.utils.user_cache import UserCache
+
+def make(username="jane", **kwargs):
+    return User(id="user-1", email=f"{username}@example.com", username=username, hashed_password="-", **kwargs)
+
+def load_counting(loads, user):
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return user
+    return load
+
+def test_hit_returns_a_detached_copy():
+    cache = UserCache(60, 10)
+    cache.set("jane", "token", make(first_name="Jane"))
+
+    first, second = cache.get("jane", "token"), cache.get("jane", "token")
+    assert first.first_name == "Jane"
+    assert first is not second
+    assert cache.get("jane", "other-token") is None
+
+def test_entries_expire():
+    cache = UserCache(0, 10)
+    cache.set("jane", "token", make())
+    assert cache.get("jane", "token") is None
+
+def test_invalidate_drops_every_token_of_the_user():
+    cache = UserCache(60, 10)
+    cache.set("jane", "token-1", make())
+    cache.set("jane", "token-2", make())
+    cache.set("john", "token-3", make("john"))
+
+    cache.invalidate("jane")
+    assert cache.get("jane", "token-1") is None
+    assert cache.get("jane", "token-2") is None
+    assert cache.get("john", "token-3") is not None
+
+def test_user_loaded_before_an_invalidation_is_not_cached():
+    cache = UserCache(60, 10)
+    invalidations = cache._invalidations
+    cache.invalidate("jane")
+    cache.set("jane", "token", make(), invalidations)
+    assert cache.get("jane", "token") is None
+
+def test_full_cache_drops_the_oldest_entry():
+    cache = UserCache(60, 2)
+    for token in ("a", "b", "c"):
+        cache.set("jane", token, make())
+    assert cache.get("jane", "a") is None
+    assert cache.get("jane", "c") is not None
+
+def test_concurrent_misses_load_once():
+    cache = UserCache(60, 10)
+    loads = []
+
+    async def run():
+        load = load_counting(loads, make())
+        return await asyncio.gather(*(cache.get_or_load("jane", "token", load) for _ in range(5)))
+
+    users = asyncio.run(run())
+    assert loads == [1]
+    assert all(user.username == "jane" for user in users)
+
+def test_disabled_cache_always_loads():
+    cache = UserCache(0, 10)
+    loads = []
+    load = load_counting(loads, make())
+    asyncio.run(cache.get_or_load("jane", "token", load))
+    asyncio.run(cache.get_or_load("jane", "token", load))
+    assert loads == [1, 1]
+
+def test_profile_update_is_seen_by_the_next_request(client, user, auth_headers):
+    headers = auth_headers(user)
+    assert client.get("/api/users/me", headers=headers).json()["first_name"] is None
+    client.put("/api/users/me", json={"first_name": "Jane"}, headers=headers)
+    assert client.get("/api/users/me", headers=headers).json()["first_name"] == "Jane"